@@ -0,0 +1,69 @@
+"""Compare per-ticker pandas analytics with the vectorized analytics core.
+
+The pandas variant mirrors the original dashboard: ``pct_change`` per ticker
+for the correlation and again for the volatility chart, plus a Python loop
+for the best/worst performer:
+
+    python bench_analytics.py --tickers 4 100 500 --bars 504
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from shared.analytics import compute_analytics
+from shared.prices import synthetic_history
+
+
+def per_ticker(histories):
+    returns = pd.DataFrame({t: h["Close"].pct_change().dropna() for t, h in histories.items()})
+    corr = returns.corr()
+    vols = {t: h["Close"].pct_change().rolling(window=30).std() * np.sqrt(252) for t, h in histories.items()}
+    best, best_change = None, float("-inf")
+    for ticker, hist in histories.items():
+        change = (hist["Close"].iloc[-1] - hist["Close"].iloc[-2]) / hist["Close"].iloc[-2]
+        if change > best_change:
+            best, best_change = ticker, change
+    return corr, vols, best
+
+
+def timed(fn, *args, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tickers", type=int, nargs="+", default=[4, 100, 500])
+    parser.add_argument("--bars", type=int, default=504)
+    args = parser.parse_args()
+
+    for n in args.tickers:
+        histories = {f"T{i:04d}": synthetic_history(f"T{i:04d}", args.bars) for i in range(n)}
+        pandas_s = timed(per_ticker, histories)
+        vectorized_s = timed(compute_analytics, histories)
+        print(
+            json.dumps(
+                {
+                    "tickers": n,
+                    "bars": args.bars,
+                    "pandas_s": round(pandas_s, 4),
+                    "vectorized_s": round(vectorized_s, 4),
+                    "speedup": round(pandas_s / vectorized_s, 2),
+                }
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""Article store: incremental ingestion and sentiment queries over a year of news.
+
+Feeds a fresh ``ArticleStore`` a year of synthetic articles one refresh at a
+time. Every refresh re-sends the previous one's articles, as overlapping
+feed pages do, so half of each batch must be deduplicated without being
+scored again. On some days every article leans positive or negative, so
+the event study has news days to find. It then times the sentiment queries
+the dashboard runs, read from the incremental aggregates, against the same
+series grouped from the raw articles (and checks they agree), and the event
+study joining them with a year of returns:
+
+    python bench_article_store.py --days 365 --per-day 300 --tickers 100
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from bench_entities import articles, symbol_table
+from shared.analytics import compute_analytics, event_study
+from shared.article_store import ALL_NEWS, ArticleStore
+from shared.entities import EntityLinker
+from shared.prices import synthetic_history
+
+# Stand-in for TextBlob, so the bench times the store rather than the scorer
+LEXICON = {"rally": 0.5, "beat": 0.6, "record": 0.4, "growth": 0.3, "strong": 0.4, "raised": 0.3,
+           "slump": -0.5, "miss": -0.6, "losses": -0.5, "cut": -0.3, "weak": -0.4, "fall": -0.3}
+TONES = {
+    "Positive": [word for word, score in LEXICON.items() if score > 0],
+    "Negative": [word for word, score in LEXICON.items() if score < 0],
+}
+
+
+class CountingScorer:
+    def __init__(self):
+        self.scored = 0
+
+    def __call__(self, texts):
+        self.scored += len(texts)
+        scores = []
+        for text in texts:
+            hits = [LEXICON[word] for word in text.lower().split() if word in LEXICON]
+            scores.append(sum(hits) / len(hits) if hits else 0.0)
+        return scores
+
+
+def lean(text, tone, rng):
+    """``text`` with its lexicon words of the other tone swapped for words of ``tone``."""
+    other = TONES["Negative" if tone == "Positive" else "Positive"]
+    return " ".join(rng.choice(TONES[tone]) if word in other else word for word in text.split(" "))
+
+
+def refreshes(table, days, per_day, end, seed=0):
+    """One articles frame per day of the year, published over that day, oldest day first."""
+    rng = random.Random(seed)
+    for day in range(days):
+        start = end - pd.Timedelta(days=days - day)
+        # The filler mixes both tones; about one day in five is clearly good or bad news
+        tone = rng.choice(["Positive", "Negative", None, None, None, None, None, None, None, None])
+        texts = articles(table, per_day, seed=day)
+        if tone is not None:
+            texts = [lean(text, tone, rng) for text in texts]
+        yield pd.DataFrame({
+            "source": [f"Feed {rng.randrange(3)}" for _ in texts],
+            "title": [text[:80] for text in texts],
+            "link": [f"https://example.com/{day}/{i}" for i in range(per_day)],
+            "published": [(start + pd.Timedelta(seconds=rng.randrange(86400))).isoformat() for _ in texts],
+            "summary": [text[80:] for text in texts],
+        })
+
+
+def timed(fn, *args, repeat=5, **kwargs):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(*args, **kwargs)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def grouped_from_articles(store, ticker, size):
+    """The per-bucket series computed from the raw rows instead of the aggregates."""
+    if ticker == ALL_NEWS:
+        query = "SELECT published / ? * ? AS bucket, COUNT(*), AVG(score) FROM articles GROUP BY bucket"
+        params = [size, size]
+    else:
+        query = (
+            "SELECT m.published / ? * ? AS bucket, COUNT(*), AVG(a.score) FROM mentions m "
+            "JOIN articles a ON a.id = m.article WHERE m.ticker = ? GROUP BY bucket"
+        )
+        params = [size, size, ticker]
+    return store._db.execute(query, params).fetchall()
+
+
+def same_series(frame, rows):
+    """Whether ``sentiment`` buckets, counts and means match the ones grouped from the articles."""
+    naive = pd.DataFrame(rows, columns=["bucket", "articles", "score"]).sort_values("bucket")
+    buckets = (frame["time"] - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(seconds=1)
+    return (
+        len(naive) == len(frame)
+        and np.array_equal(buckets.to_numpy(), naive["bucket"].to_numpy())
+        and np.array_equal(frame["articles"].to_numpy(), naive["articles"].to_numpy())
+        and np.allclose(frame["score"].to_numpy(), naive["score"].to_numpy())
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--per-day", type=int, default=300)
+    parser.add_argument("--tickers", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    table = symbol_table(args.tickers)
+    linker = EntityLinker(table)
+    scorer = CountingScorer()
+    end = pd.Timestamp.now(tz="UTC").floor("D")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ArticleStore(Path(tmp) / "articles.sqlite")
+
+        started = time.perf_counter()
+        previous = None
+        for batch in refreshes(table, args.days, args.per_day, end):
+            refresh = batch if previous is None else pd.concat([previous, batch], ignore_index=True)
+            store.add(refresh, scorer, linker.link)
+            previous = batch
+        ingest_s = time.perf_counter() - started
+        stored = len(store)
+        print(json.dumps({
+            "stage": "ingest", "refreshes": args.days, "articles_sent": args.days * args.per_day * 2 - args.per_day,
+            "stored": stored, "scored": scorer.scored, "seconds": round(ingest_s, 3),
+            "articles_per_s": round(stored / ingest_s), "db_mb": round(store.path.stat().st_size / 1e6, 2),
+        }), flush=True)
+
+        duplicate_s, added = timed(store.add, previous, scorer, linker.link, repeat=args.repeat)
+        print(json.dumps({"stage": "duplicate_refresh", "articles": len(previous), "added": added,
+                          "seconds": round(duplicate_s, 5)}), flush=True)
+
+        ticker = table["Symbol"].iloc[0]
+        for name, freq, tickers in (
+            ("daily_one_ticker", "D", [ticker]),
+            ("daily_all_news", "D", [ALL_NEWS]),
+            ("daily_all_tickers", "D", [*table["Symbol"], ALL_NEWS]),
+            ("hourly_one_ticker", "H", [ticker]),
+        ):
+            seconds, frame = timed(store.sentiment, freq, tickers, repeat=args.repeat)
+            record = {"stage": "query", "query": name, "rows": len(frame), "seconds": round(seconds, 5)}
+            if len(tickers) == 1:
+                size = 86400 if freq == "D" else 3600
+                naive_s, naive = timed(grouped_from_articles, store, tickers[0], size, repeat=args.repeat)
+                record.update(from_articles_s=round(naive_s, 5), matches=same_series(frame, naive))
+            print(json.dumps(record), flush=True)
+            assert record.get("matches", True), f"{name}: aggregates differ from the articles"
+
+        bars = args.days * 252 // 365
+        analytics = compute_analytics({t: synthetic_history(t, bars) for t in table["Symbol"]})
+        daily = store.sentiment("D", analytics.tickers)
+        seconds, study = timed(event_study, analytics, daily, repeat=args.repeat)
+        print(json.dumps({"stage": "event_study", "tickers": len(analytics.tickers), "bars": bars,
+                          "news_days": len(daily), "events": study.events, "seconds": round(seconds, 5)}), flush=True)
+        assert all(study.events.values()), "the event study found no positive or no negative news days"
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
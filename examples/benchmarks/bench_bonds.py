@@ -0,0 +1,92 @@
+"""Bond analytics over large books: vectorized engine vs a per-bond scalar solver.
+
+The baseline solves each bond's yield in a Python loop over its own cash
+flows, as a per-row ``apply`` would; the engine solves every bond at once:
+
+    python bench_bonds.py --bonds 1000 10000 50000
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from shared.bonds import YieldCurve, bond_analytics, rate_shocks
+
+SETTLEMENT = pd.Timestamp("2025-01-02")
+CURVE = YieldCurve((5.0, 10.0), (4.1, 4.5))
+
+
+def synthetic_bonds(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    days = rng.integers(30, 30 * 365, rows)
+    price = rng.uniform(80, 115, rows).round(3)
+    face = rng.integers(1, 500, rows) * 1_000.0
+    return pd.DataFrame(
+        {
+            "Symbol": pd.Categorical([f"CUSIP{i:06d}" for i in range(rows)]),
+            "Quantity": face,
+            "Close_Price": price,
+            "Market_Value": face * price / 100,
+            "Coupon": rng.choice(np.arange(0, 8.25, 0.125), rows),
+            "Maturity": SETTLEMENT + pd.to_timedelta(days, unit="D"),
+        }
+    )
+
+
+def scalar_yield(coupon, years, price, frequency=2):
+    """One bond at a time, the way a per-row implementation would."""
+    count = int(np.ceil(years * frequency - 1e-9))
+    first = years * frequency - (count - 1)
+    times = [first + k for k in range(count)]
+    flows = [coupon * 100 / frequency] * count
+    flows[-1] += 100
+    target = price + coupon * 100 / frequency * (1 - first)
+    y = coupon or 0.04
+    for _ in range(50):
+        base = 1 + y / frequency
+        value = sum(f * base ** -t for f, t in zip(flows, times))
+        slope = -sum(f * t * base ** (-t - 1) for f, t in zip(flows, times)) / frequency
+        step = (value - target) / slope
+        y -= step
+        if abs(step) < 1e-10:
+            break
+    return y * 100
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bonds", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    parser.add_argument("--baseline-limit", type=int, default=10_000, help="skip the loop above this many bonds")
+    args = parser.parse_args()
+
+    for rows in args.bonds:
+        positions = synthetic_bonds(rows)
+        started = time.perf_counter()
+        analytics = bond_analytics(positions, CURVE, settlement=SETTLEMENT)
+        engine = time.perf_counter() - started
+        started = time.perf_counter()
+        rate_shocks(positions, analytics, CURVE)
+        shocks = time.perf_counter() - started
+
+        result = {"bonds": rows, "analytics_s": round(engine, 4), "rate_shocks_s": round(shocks, 4)}
+        if rows <= args.baseline_limit:
+            years = analytics["years"].to_numpy()
+            started = time.perf_counter()
+            baseline = [
+                scalar_yield(c / 100, t, p)
+                for c, t, p in zip(positions["Coupon"], years, positions["Close_Price"])
+            ]
+            result["per_bond_s"] = round(time.perf_counter() - started, 4)
+            result["speedup"] = round(result["per_bond_s"] / engine, 1)
+            assert np.allclose(baseline, analytics["yield_pct"], atol=1e-6)
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,362 @@
+"""Offline benchmark suite for both example dashboards.
+
+Generates N tickers x M bars of OHLCV, K RSS articles and a book of P
+positions and serves them through local stand-ins: a directory of price CSV
+files (``FINAGENT_PRICE_SOURCE``), the feed server (``FINAGENT_RSS_FEEDS``)
+and a positions file (``FINAGENT_PORTFOLIO``). It then times
+
+* each pipeline stage in isolation, through the shared modules the
+  dashboards call, and
+* each dashboard end to end under Streamlit's ``AppTest`` harness: a cold
+  run with empty caches and a warm rerun.
+
+Every measurement is printed as a JSON line. ``--output`` also writes all of
+them, with the commit and the parameters, to one JSON file; ``--baseline``
+compares against such a file and exits with status 1 on regressions:
+
+    python bench_dashboards.py --tickers 4 50 --bars 126 504 --output before.json
+    python bench_dashboards.py --tickers 4 50 --bars 126 504 --baseline before.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import feedparser
+import pandas as pd
+
+EXAMPLES_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(EXAMPLES_DIR))
+from bench_portfolio import synthetic_book
+from feed_server import serve_feeds, synthetic_feed
+from shared.analytics import compute_analytics
+from shared.bar_store import BarStore
+from shared.feeds import FeedIngester
+from shared.portfolio import PortfolioLoader
+from shared.prices import PERIOD_BARS, CsvPriceSource, synthetic_history
+from shared.sentiment import SentimentEngine
+from shared.streaming_stats import IncrementalMarketStats
+from shared.tables import page_slice
+
+NEWS_DASHBOARD = EXAMPLES_DIR / "news-sentiment" / "dashboard.py"
+PORTFOLIO_DASHBOARD = EXAMPLES_DIR / "extract-and-analyze-portfolio" / "dashboard.py"
+# The news dashboard's ticker input starts with these; later tickers are generated
+DEFAULT_TICKERS = ["AAPL", "MSFT", "GOOGL", "TSLA"]
+# Periods offered by the news dashboard's selectbox
+DASHBOARD_PERIODS = ["1mo", "3mo", "6mo", "1y", "2y"]
+FEED_COUNT = 3
+# Timings below this are noise for regression checks
+MIN_DELTA_S = 0.005
+
+
+# Synthetic inputs
+
+
+def ticker_names(n):
+    return (DEFAULT_TICKERS + [f"T{i:04d}" for i in range(n)])[:n]
+
+
+def period_for(bars):
+    """The shortest dashboard period covering ``bars`` bars (capped at the longest)."""
+    for period in DASHBOARD_PERIODS:
+        if PERIOD_BARS[period] >= bars:
+            return period
+    return DASHBOARD_PERIODS[-1]
+
+
+def write_price_dir(directory, tickers, bars):
+    """One ``<TICKER>.csv`` of ``bars`` bars per ticker, readable by ``CsvPriceSource``."""
+    directory.mkdir(parents=True, exist_ok=True)
+    for ticker in tickers:
+        synthetic_history(ticker, bars).to_csv(directory / f"{ticker}.csv")
+    return directory
+
+
+def synthetic_articles(articles):
+    """``articles`` parsed RSS items in the shape ``FeedIngester`` returns."""
+    feed = feedparser.parse(synthetic_feed("Fixture", articles))
+    return pd.DataFrame(
+        {
+            "source": "Fixture",
+            "title": [entry.title for entry in feed.entries],
+            "link": [entry.link for entry in feed.entries],
+            "published": [entry.published for entry in feed.entries],
+            "summary": [entry.summary for entry in feed.entries],
+        }
+    )
+
+
+def write_book(path, positions):
+    synthetic_book(positions).to_csv(path, index=False)
+    return path
+
+
+# Timing
+
+
+def measure(run, setup=None, repeat=3):
+    """Best and median wall time of ``run(state)`` with a fresh ``setup()`` state per round."""
+    times = []
+    for _ in range(repeat):
+        state = setup() if setup is not None else None
+        started = time.perf_counter()
+        run(state)
+        times.append(time.perf_counter() - started)
+    return {"seconds": round(min(times), 5), "median_s": round(statistics.median(times), 5)}
+
+
+def emit(results, record):
+    results.append(record)
+    print(json.dumps(record), flush=True)
+
+
+# Isolated stages; each mirrors one block of a dashboard
+
+
+def portfolio_kpis(positions_df):
+    """The portfolio dashboard's KPI block and the allocation it charts."""
+    totals = positions_df[["Market_Value", "Cost_Basis", "Unrealized_PL", "MTD_PL", "YTD_PL"]].sum()
+    returns = totals[["Unrealized_PL", "MTD_PL", "YTD_PL"]] / totals["Cost_Basis"] * 100
+    by_type = positions_df.groupby("Type", observed=True)["Market_Value"].sum()
+    return totals, returns, by_type
+
+
+def bench_price_stages(results, tickers, bars, price_dir, work_dir, repeat):
+    period = period_for(bars)
+    source = CsvPriceSource(price_dir)
+    params = {"dashboard": "news", "tickers": len(tickers), "bars": bars}
+    stores = iter(range(repeat * 2))
+
+    def fresh_store():
+        return BarStore(root=work_dir / f"bars-{next(stores)}", source=source)
+
+    emit(results, {**params, "stage": "fetch_stock_data", "mode": "cold",
+                   **measure(lambda store: store.get(tickers, period), fresh_store, repeat)})
+    warm_store = fresh_store()
+    warm_store.get(tickers, period)
+    emit(results, {**params, "stage": "fetch_stock_data", "mode": "warm",
+                   **measure(lambda _: warm_store.get(tickers, period), repeat=repeat)})
+
+    histories = {ticker: synthetic_history(ticker, bars) for ticker in tickers}
+    # As the dashboard runs it: volatility and correlation come from the streaming stats
+    emit(results, {**params, "stage": "analytics", "mode": "cold",
+                   **measure(lambda _: compute_analytics(histories, risk=False), repeat=repeat)})
+
+    analytics = compute_analytics(histories, risk=False)
+
+    def correlation_volatility(stats):
+        stats.update(analytics.dates, analytics.closes)
+        stats.volatility_frame()
+        stats.correlation_frame()
+
+    emit(results, {**params, "stage": "correlation_volatility", "mode": "cold",
+                   **measure(correlation_volatility, lambda: IncrementalMarketStats(list(analytics.tickers)), repeat)})
+    warm_stats = IncrementalMarketStats(list(analytics.tickers))
+    correlation_volatility(warm_stats)
+    emit(results, {**params, "stage": "correlation_volatility", "mode": "warm",
+                   **measure(lambda _: correlation_volatility(warm_stats), repeat=repeat)})
+
+
+def bench_news_stages(results, articles, feed_urls, work_dir, repeat):
+    params = {"dashboard": "news", "articles": articles}
+    states = iter(range(repeat * 2))
+
+    def fresh_ingester():
+        return FeedIngester(feed_urls, state_path=work_dir / f"feeds-{next(states)}.json")
+
+    emit(results, {**params, "stage": "fetch_financial_news", "mode": "cold",
+                   **measure(lambda ingester: ingester.fetch(), fresh_ingester, repeat)})
+    warm_ingester = fresh_ingester()
+    warm_ingester.fetch()
+    emit(results, {**params, "stage": "fetch_financial_news", "mode": "warm",
+                   **measure(lambda _: warm_ingester.fetch(), repeat=repeat)})
+
+    news_df = synthetic_articles(articles)
+    emit(results, {**params, "stage": "sentiment", "mode": "cold",
+                   **measure(lambda engine: engine.score_articles(news_df), SentimentEngine, repeat)})
+    warm_engine = SentimentEngine()
+    warm_engine.score_articles(news_df)
+    emit(results, {**params, "stage": "sentiment", "mode": "warm",
+                   **measure(lambda _: warm_engine.score_articles(news_df), repeat=repeat)})
+
+
+def bench_portfolio_stages(results, positions, book_path, repeat):
+    params = {"dashboard": "portfolio", "positions": positions}
+    emit(results, {**params, "stage": "load_portfolio", "mode": "cold",
+                   **measure(lambda loader: loader.positions(book_path), PortfolioLoader, repeat)})
+    positions_df = PortfolioLoader().positions(book_path)
+    emit(results, {**params, "stage": "kpis", "mode": "cold",
+                   **measure(lambda _: portfolio_kpis(positions_df), repeat=repeat)})
+    emit(results, {**params, "stage": "positions_page", "mode": "cold",
+                   **measure(lambda _: page_slice(positions_df, 1, 100, "Market_Value", True), repeat=repeat)})
+
+
+# End to end
+
+
+# st.error boxes drawn for styling (worst performer, bearish sentiment), not failures
+# (Streamlit moves their leading emoji into the box's icon)
+STYLING_ERRORS = ("Worst Performer:", "Overall Market Sentiment:")
+
+
+def run_app(script, configure, work_dir, timeout):
+    """Cold and warm ``AppTest`` runs of ``script`` after ``configure(at)`` set its widgets.
+
+    An untimed first run builds the widget tree and pays the one-off imports;
+    the cold run then starts from empty Streamlit caches and an empty cache
+    directory.
+    """
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(script), default_timeout=timeout)
+    at.run()
+    configure(at)
+    os.environ["FINAGENT_CACHE_DIR"] = tempfile.mkdtemp(dir=work_dir, prefix="cache-")
+    st.cache_data.clear()
+    st.cache_resource.clear()
+
+    timings = {}
+    for mode in ("cold", "warm"):
+        started = time.perf_counter()
+        at.run()
+        timings[mode] = {
+            "seconds": round(time.perf_counter() - started, 5),
+            "exceptions": len(at.exception),
+            "errors": sum(not box.value.lstrip("📉 ").startswith(STYLING_ERRORS) for box in at.error),
+        }
+    return timings
+
+
+def bench_news_app(results, tickers, bars, articles, work_dir, timeout):
+    period = period_for(bars)
+
+    def configure(at):
+        at.text_input[0].set_value(",".join(tickers))
+        at.selectbox[0].set_value(period)
+
+    timings = run_app(NEWS_DASHBOARD, configure, work_dir, timeout)
+    params = {"dashboard": "news", "tickers": len(tickers), "bars": min(bars, PERIOD_BARS[period]),
+              "articles": articles}
+    for mode, timing in timings.items():
+        emit(results, {**params, "stage": "end_to_end", "mode": mode, **timing})
+
+
+def bench_portfolio_app(results, positions, work_dir, timeout):
+    timings = run_app(PORTFOLIO_DASHBOARD, lambda at: None, work_dir, timeout)
+    for mode, timing in timings.items():
+        emit(results, {"dashboard": "portfolio", "positions": positions, "stage": "end_to_end",
+                       "mode": mode, **timing})
+
+
+# Results
+
+
+def result_key(record):
+    return tuple(
+        (name, record[name])
+        for name in ("dashboard", "stage", "mode", "tickers", "bars", "articles", "positions")
+        if name in record
+    )
+
+
+def compare(results, baseline_path, tolerance):
+    """Print regressions against ``baseline_path``; returns how many there are."""
+    baseline = {result_key(r): r for r in json.loads(Path(baseline_path).read_text())["results"]}
+    regressions = 0
+    for record in results:
+        before = baseline.get(result_key(record))
+        if before is None:
+            continue
+        ratio = record["seconds"] / before["seconds"] if before["seconds"] else float("inf")
+        if ratio > 1 + tolerance and record["seconds"] - before["seconds"] > MIN_DELTA_S:
+            regressions += 1
+            print(json.dumps({"regression": dict(result_key(record)), "before_s": before["seconds"],
+                              "after_s": record["seconds"], "ratio": round(ratio, 2)}))
+    return regressions
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=EXAMPLES_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tickers", type=int, nargs="+", default=[4, 20])
+    parser.add_argument("--bars", type=int, nargs="+", default=[126, 504])
+    parser.add_argument("--articles", type=int, nargs="+", default=[60, 300])
+    parser.add_argument("--positions", type=int, nargs="+", default=[100, 10_000])
+    parser.add_argument("--repeat", type=int, default=3, help="rounds per isolated stage; the best is reported")
+    parser.add_argument("--no-app", action="store_true", help="skip the end-to-end AppTest runs")
+    parser.add_argument("--timeout", type=float, default=300, help="seconds allowed per AppTest run")
+    parser.add_argument("--output", help="write all results to this JSON file")
+    parser.add_argument("--baseline", help="results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before a regression")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        work_dir = Path(tmp)
+        os.environ["FINAGENT_CACHE_DIR"] = str(work_dir / "cache")
+        for n in args.tickers:
+            for bars in args.bars:
+                tickers = ticker_names(n)
+                price_dir = write_price_dir(work_dir / f"prices-{n}x{bars}", tickers, bars)
+                bench_price_stages(results, tickers, bars, price_dir, work_dir / f"stores-{n}x{bars}", args.repeat)
+
+        servers = []
+        try:
+            feed_sets = {}
+            for k in args.articles:
+                per_feed = -(-k // FEED_COUNT)
+                server, urls = serve_feeds({f"Feed {k}-{i}": per_feed for i in range(FEED_COUNT)})
+                servers.append(server)
+                feed_sets[k] = urls
+                bench_news_stages(results, k, urls, work_dir, args.repeat)
+
+            book_paths = {p: write_book(work_dir / f"book-{p}.csv", p) for p in args.positions}
+            for p, path in book_paths.items():
+                bench_portfolio_stages(results, p, path, args.repeat)
+
+            if not args.no_app:
+                articles = max(args.articles)
+                os.environ["FINAGENT_RSS_FEEDS"] = json.dumps(feed_sets[articles])
+                for n in args.tickers:
+                    for bars in args.bars:
+                        os.environ["FINAGENT_PRICE_SOURCE"] = str(work_dir / f"prices-{n}x{bars}")
+                        bench_news_app(results, ticker_names(n), bars, articles, work_dir, args.timeout)
+                os.environ["FINAGENT_PRICE_SOURCE"] = "synthetic"
+                for p, path in book_paths.items():
+                    os.environ["FINAGENT_PORTFOLIO"] = str(path)
+                    bench_portfolio_app(results, p, work_dir, args.timeout)
+        finally:
+            for server in servers:
+                server.shutdown()
+
+    if args.output:
+        meta = {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "args": {k: v for k, v in vars(args).items() if k not in ("output", "baseline")},
+        }
+        Path(args.output).write_text(json.dumps({"meta": meta, "results": results}, indent=2))
+    if args.baseline and compare(results, args.baseline, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Plotly payload size and serialization time with and without downsampling.
+
+One line chart of ``--symbols`` price series with ``--bars`` points each is
+built at full resolution and downsampled to ``--max-points`` per trace:
+
+    python bench_downsample.py --bars 1000 10000 100000 --symbols 4
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from shared.downsample import DEFAULT_MAX_POINTS, downsample, figure_payload
+
+
+def build(dates, closes, max_points):
+    fig = go.Figure()
+    for j in range(closes.shape[1]):
+        x, y = downsample(dates, closes[:, j], max_points)
+        fig.add_trace(go.Scatter(x=x, y=y, mode="lines", name=f"T{j}"))
+    return fig
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bars", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--symbols", type=int, default=4)
+    parser.add_argument("--max-points", type=int, default=DEFAULT_MAX_POINTS)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    for bars in args.bars:
+        dates = pd.date_range("2000-01-01", periods=bars, freq="min")
+        closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.001, (bars, args.symbols)), axis=0))
+
+        started = time.perf_counter()
+        full_bytes, full_s = figure_payload(build(dates, closes, None))
+        full_total = time.perf_counter() - started
+        started = time.perf_counter()
+        sampled_bytes, sampled_s = figure_payload(build(dates, closes, args.max_points))
+        sampled_total = time.perf_counter() - started
+
+        print(
+            json.dumps(
+                {
+                    "bars": bars,
+                    "symbols": args.symbols,
+                    "max_points": args.max_points,
+                    "full_kb": round(full_bytes / 1024, 1),
+                    "downsampled_kb": round(sampled_bytes / 1024, 1),
+                    "full_serialize_ms": round(full_s * 1000, 1),
+                    "downsampled_serialize_ms": round(sampled_s * 1000, 1),
+                    "full_total_ms": round(full_total * 1000, 1),
+                    "downsampled_total_ms": round(sampled_total * 1000, 1),
+                }
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Ticker entity linking: one Aho-Corasick pass vs a regex per symbol.
+
+Generates a symbol table of made-up companies (symbol, name, one alias) and
+articles of filler words with a few mentions each, then times building the
+``EntityLinker`` and linking the articles, against the naive approach of
+searching every article for every symbol's word-bounded regex. The linker's
+time should grow with the text length only; the naive scan's with text
+length times symbols (it is skipped above ``--naive-limit`` symbol-article
+pairs):
+
+    python bench_entities.py --symbols 100 1000 10000 --articles 1000 10000
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from feed_server import WORDS
+from shared.entities import EntityLinker
+
+SYLLABLES = "ba co de fi gu ka lo mi nu pe ra si to vu xe zo".split()
+
+
+def symbol_table(n: int, seed: int = 0) -> pd.DataFrame:
+    """``n`` companies with distinct four-letter symbols, two-syllable names and a "Group" alias."""
+    rng = random.Random(seed)
+    symbols = set()
+    while len(symbols) < n:
+        symbols.add("".join(rng.choices("ABCDEFGHIJKLMNOPQRSTUVWXYZ", k=4)))
+    rows = []
+    for i, symbol in enumerate(sorted(symbols)):
+        name = "".join(rng.choices(SYLLABLES, k=2)).capitalize() + f"{i:05d}"
+        rows.append((symbol, f"{name} Inc.", f"{name} Group"))
+    return pd.DataFrame(rows, columns=["Symbol", "Name", "Aliases"])
+
+
+def articles(table: pd.DataFrame, n: int, mentions: int = 3, seed: int = 0) -> list[str]:
+    """``n`` 60-word texts, each naming ``mentions`` random companies by symbol, cashtag or name."""
+    rng = random.Random(seed)
+    rows = list(table.itertuples(index=False))
+    texts = []
+    for _ in range(n):
+        words = rng.choices(WORDS, k=60)
+        for symbol, name, alias in rng.sample(rows, min(mentions, len(rows))):
+            words.insert(rng.randrange(len(words)), rng.choice([symbol, f"${symbol}", name, alias]))
+        texts.append(" ".join(words))
+    return texts
+
+
+def naive_link(table: pd.DataFrame, texts: list[str]) -> list[set[str]]:
+    """Every symbol's patterns as one word-bounded regex, searched in every text."""
+    regexes = [
+        (symbol, re.compile(rf"(?<!\w)(?:\$?{re.escape(symbol)}|{re.escape(name)}|{re.escape(alias)})(?!\w)"))
+        for symbol, name, alias in table.itertuples(index=False)
+    ]
+    return [{symbol for symbol, regex in regexes if regex.search(text)} for text in texts]
+
+
+def timed(fn, *args, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--symbols", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--articles", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--naive-limit", type=int, default=1_000_000, help="Most symbols x articles to scan naively")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    for n_symbols in args.symbols:
+        table = symbol_table(n_symbols)
+        build_s, linker = timed(EntityLinker, table, repeat=args.repeat)
+        for n_articles in args.articles:
+            texts = articles(table, n_articles)
+            chars = sum(map(len, texts))
+            link_s, linked = timed(linker.link, texts, repeat=args.repeat)
+            record = {
+                "symbols": n_symbols, "articles": n_articles, "patterns": linker.matcher.patterns,
+                "build_s": round(build_s, 4), "link_s": round(link_s, 4),
+                "mchars_per_s": round(chars / link_s / 1e6, 2),
+                "links": sum(map(len, linked)),
+            }
+            if n_symbols * n_articles <= args.naive_limit:
+                naive_s, expected = timed(naive_link, table, texts, repeat=1)
+                record.update(naive_s=round(naive_s, 4), speedup=round(naive_s / link_s, 1), matches_naive=linked == expected)
+            print(json.dumps(record), flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Time RSS ingestion against the local feed stand-in.
+
+Compares the original sequential ``feedparser.parse`` loop with the
+concurrent, conditional-GET ingester on a cold and a warm (all 304) run:
+
+    python bench_feeds.py --feeds 3 --articles 50 --delay 0.2
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import feedparser
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from feed_server import serve_feeds
+from shared.feeds import FeedIngester
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--feeds", type=int, default=3)
+    parser.add_argument("--articles", type=int, default=50)
+    parser.add_argument("--delay", type=float, default=0.2)
+    args = parser.parse_args()
+
+    server, urls = serve_feeds({f"Feed {i}": args.articles for i in range(args.feeds)}, delay=args.delay)
+    try:
+        started = time.perf_counter()
+        for url in urls.values():
+            feedparser.parse(url)
+        sequential = time.perf_counter() - started
+
+        with tempfile.TemporaryDirectory() as tmp:
+            ingester = FeedIngester(urls, state_path=Path(tmp) / "state.json")
+            cold = ingester.fetch()
+            warm = ingester.fetch()
+
+        print(
+            json.dumps(
+                {
+                    "feeds": args.feeds,
+                    "articles": len(cold.articles),
+                    "sequential_s": round(sequential, 4),
+                    "concurrent_cold_s": round(cold.elapsed, 4),
+                    "concurrent_warm_s": round(warm.elapsed, 4),
+                    "not_modified": len(warm.not_modified),
+                }
+            )
+        )
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Upstream requests and latency with and without the shared market-data daemon.
+
+``--clients`` concurrent clients (standing in for Streamlit sessions and
+notebook kernels) each load the same ``--tickers`` from a fake upstream with
+``--latency`` seconds per request. Directly, every client fetches every
+ticker; through the daemon, the first request fills its bar store and the
+rest are served from it over the Unix socket. A client store filled
+through the daemon must also keep refreshing, from the direct fallback, once
+the daemon stops:
+
+    python bench_market_data.py --clients 1 4 16 --tickers 20 --latency 0.2
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from shared.bar_store import BarStore
+from shared.market_data import CountingSource, DaemonPriceSource, MarketDataClient, MarketDataServer
+from shared.prices import SyntheticPriceSource, load_prices
+
+
+def run_clients(clients, load):
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        list(pool.map(lambda _: load(), range(clients)))
+    return time.perf_counter() - started
+
+
+def daemon_down(tickers, period):
+    """Fill a client store from the daemon, stop the daemon and refresh from the fallback."""
+    # Zoned bars, as yfinance returns them
+    upstream = SyntheticPriceSource(tz="America/New_York")
+    with tempfile.TemporaryDirectory() as tmp:
+        server = MarketDataServer(os.path.join(tmp, "md.sock"), source=upstream, store_root=os.path.join(tmp, "bars"))
+        server.start()
+        source = DaemonPriceSource(MarketDataClient(server.socket_path, timeout=5), fallback=upstream)
+        store = BarStore(root=os.path.join(tmp, "client"), source=source, ttl=0)
+        before = store.get(tickers, period)
+        server.shutdown()
+        server.server_close()
+        # Every ticker is stale at ttl=0, so this merges fallback tails into the daemon's bars
+        after = store.get(tickers, period)
+    expected = {ticker: upstream.history(ticker, period) for ticker in tickers}
+    return {
+        "stage": "daemon_down",
+        "tickers": len(tickers),
+        "errors": len(before.errors) + len(after.errors),
+        "same_tz": all(after.histories[t].index.tz == expected[t].index.tz for t in tickers),
+        "same_bars": all(after.histories[t].equals(expected[t]) for t in tickers),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--tickers", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--period", default="1y")
+    args = parser.parse_args()
+    tickers = [f"T{i:03d}" for i in range(args.tickers)]
+
+    for clients in args.clients:
+        direct = CountingSource(SyntheticPriceSource(latency=args.latency))
+        direct_s = run_clients(clients, lambda: load_prices(tickers, args.period, direct))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            server = MarketDataServer(
+                os.path.join(tmp, "md.sock"),
+                source=SyntheticPriceSource(latency=args.latency),
+                store_root=os.path.join(tmp, "bars"),
+            )
+            server.start()
+            client = MarketDataClient(server.socket_path)
+            cold_s = run_clients(1, lambda: client.history(tickers, args.period))
+            warm_s = run_clients(clients, lambda: client.history(tickers, args.period))
+            daemon_requests = client.stats()["upstream_requests"]
+            server.shutdown()
+            server.server_close()
+
+        print(
+            json.dumps(
+                {
+                    "clients": clients,
+                    "tickers": args.tickers,
+                    "direct_upstream_requests": direct.requests,
+                    "daemon_upstream_requests": daemon_requests,
+                    "direct_s": round(direct_s, 3),
+                    "daemon_cold_s": round(cold_s, 3),
+                    "daemon_warm_s": round(warm_s, 3),
+                }
+            )
+        )
+
+    down = daemon_down(tickers, args.period)
+    print(json.dumps(down))
+    assert down["errors"] == 0 and down["same_bars"], "refresh after the daemon stopped lost bars"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Memory and serialization of per-ticker frames vs the compact ``PricePanel``.
+
+The frames variant is what the news dashboard used to hold: one OHLCV
+DataFrame with its own DatetimeIndex per ticker, aligned with ``pd.concat``
+for every analytics pass. The panel keeps one date index and a Close and a
+Volume block for the whole universe, in float64 or float32. For each it
+reports the bytes held, the time to pickle and unpickle it (what any cache
+or process boundary pays) and the pickled size, plus the time to align the
+closes for analytics and to compute them (frames are converted to a panel
+first):
+
+    python bench_panel.py --tickers 50 500 --bars 504 2520
+"""
+
+import argparse
+import json
+import pickle
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from shared.analytics import compute_analytics
+from shared.panel import PANEL_FIELDS, PricePanel
+from shared.prices import synthetic_history
+
+
+def concat_align(histories):
+    """The previous alignment: outer-join the Close and Volume of every frame."""
+    closes = pd.concat({t: h["Close"] for t, h in histories.items()}, axis=1).sort_index()
+    volumes = pd.concat({t: h["Volume"] for t, h in histories.items()}, axis=1).reindex_like(closes)
+    return closes.to_numpy(dtype=np.float64), volumes.to_numpy(dtype=np.float64)
+
+
+def frames_nbytes(histories):
+    return sum(int(h.memory_usage(index=True, deep=True).sum()) for h in histories.values())
+
+
+def timed(fn, *args, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def serialization(obj, repeat):
+    pickle_s, payload = timed(pickle.dumps, obj, pickle.HIGHEST_PROTOCOL, repeat=repeat)
+    unpickle_s, _ = timed(pickle.loads, payload, repeat=repeat)
+    return {"pickle_s": round(pickle_s, 5), "unpickle_s": round(unpickle_s, 5), "pickled_mb": round(len(payload) / 1e6, 3)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tickers", type=int, nargs="+", default=[50, 500])
+    parser.add_argument("--bars", type=int, nargs="+", default=[504, 2520])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    for n in args.tickers:
+        for bars in args.bars:
+            histories = {f"T{i:04d}": synthetic_history(f"T{i:04d}", bars) for i in range(n)}
+            align_s, _ = timed(concat_align, histories, repeat=args.repeat)
+            variants = {"frames": (histories, frames_nbytes(histories), align_s)}
+            for name, dtype in (("panel_f64", np.float64), ("panel_f32", np.float32)):
+                build_s, panel = timed(PricePanel.from_histories, histories, PANEL_FIELDS, dtype, repeat=args.repeat)
+                variants[name] = (panel, panel.nbytes, build_s)
+
+            for name, (obj, nbytes, align_s) in variants.items():
+                record = {"tickers": n, "bars": bars, "variant": name, "memory_mb": round(nbytes / 1e6, 3),
+                          "align_s": round(align_s, 5), **serialization(obj, args.repeat),
+                          "analytics_s": round(timed(compute_analytics, obj, repeat=args.repeat)[0], 5)}
+                print(json.dumps(record), flush=True)
+
+
+if __name__ == "__main__":
+    main()
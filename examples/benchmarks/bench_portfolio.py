@@ -0,0 +1,104 @@
+"""Load and aggregate portfolio books of growing size.
+
+A synthetic book in the shape of ``data/example_portfolio.csv`` is written
+as CSV, Parquet and Arrow IPC. The baseline reads the CSV untyped and cleans
+the amount columns afterwards (as a dict/str-based loader would); the typed
+loader parses straight into categoricals and floats. ``warm`` is a repeat
+load of an unchanged file from the loader's cache:
+
+    python bench_portfolio.py --rows 1000 10000 100000
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from shared.portfolio import POSITIONS, PortfolioLoader, read_table
+
+ASSET_CLASSES = ["US Equity", "International Equity", "Emerging Markets", "Global Bonds", "Treasuries", "Gold", "Cash"]
+
+
+def synthetic_book(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    units = rng.integers(1, 1_000, rows).astype(float)
+    price = rng.uniform(5, 500, rows).round(2)
+    market_value = (units * price).round(2)
+    cost_basis = (market_value * rng.uniform(0.7, 1.3, rows)).round(2)
+    return pd.DataFrame(
+        {
+            "asset_class": rng.choice(ASSET_CLASSES, rows),
+            "ticker": [f"T{i % 5000:04d}" for i in range(rows)],
+            "name": [f"Position {i}" for i in range(rows)],
+            "region": "US",
+            "currency": "USD",
+            "units": units,
+            "price": price,
+            "market_value": market_value,
+            "cost_basis": cost_basis,
+            "unrealized_pl": market_value - cost_basis,
+            "weight": [f"{w:.1%}" for w in market_value / market_value.sum()],
+            "notes": "",
+        }
+    )
+
+
+def untyped(path):
+    df = pd.read_csv(path, dtype=str)
+    for column in ("units", "price", "market_value", "cost_basis", "unrealized_pl"):
+        df[column] = df[column].apply(lambda x: float(str(x).replace("$", "").replace(",", "")))
+    return df.rename(columns={"asset_class": "Type", "market_value": "Market_Value", "unrealized_pl": "Unrealized_PL"})
+
+
+def aggregate(df):
+    total = df["Market_Value"].sum()
+    by_type = df.groupby("Type", observed=True)[["Market_Value", "Unrealized_PL"]].sum()
+    return total, by_type
+
+
+def timed(fn, *args, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            book = synthetic_book(rows)
+            paths = {fmt: Path(tmp) / f"book_{rows}.{fmt}" for fmt in ("csv", "parquet", "arrow")}
+            book.to_csv(paths["csv"], index=False)
+            typed_book = read_table(paths["csv"], POSITIONS)
+            typed_book.to_parquet(paths["parquet"])
+            typed_book.to_feather(paths["arrow"])
+
+            baseline_s, baseline = timed(untyped, paths["csv"])
+            record = {"rows": rows, "untyped_csv_s": round(baseline_s, 4)}
+            for fmt, path in paths.items():
+                record[f"typed_{fmt}_s"] = round(timed(read_table, path, POSITIONS)[0], 4)
+
+            loader = PortfolioLoader()
+            loader.positions(paths["csv"])
+            record["warm_s"] = round(timed(loader.positions, paths["csv"])[0], 6)
+            record["aggregate_untyped_s"] = round(timed(aggregate, baseline)[0], 5)
+            record["aggregate_typed_s"] = round(timed(aggregate, typed_book)[0], 5)
+            record["untyped_mb"] = round(baseline.memory_usage(deep=True).sum() / 1e6, 2)
+            record["typed_mb"] = round(typed_book.memory_usage(deep=True).sum() / 1e6, 2)
+            print(json.dumps(record))
+
+
+if __name__ == "__main__":
+    main()
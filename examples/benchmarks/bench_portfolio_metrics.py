@@ -0,0 +1,99 @@
+"""KPI and risk metrics for many portfolios: per-book pandas vs one segmented pass.
+
+The baseline loops over the books and computes each metric with scalar
+pandas operations, as the dashboard did for its single book; the engine
+computes all books from one long table:
+
+    python bench_portfolio_metrics.py --portfolios 100 10000 --positions 1000000
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from shared.portfolio_metrics import portfolio_metrics
+
+SYMBOLS = ["US10Y", "US5Y", "US2Y", "MUNI", "CORP", "AAPL", "MSFT", "GOOGL"]
+TYPES = ["GOVT BOND", "CORP BOND", "MUNI BOND", "STOCK"]
+
+
+def synthetic_positions(portfolios, rows, seed=0):
+    rng = np.random.default_rng(seed)
+    market_value = rng.uniform(100, 100_000, rows)
+    cost_basis = market_value * rng.uniform(0.8, 1.2, rows)
+    return pd.DataFrame(
+        {
+            "portfolio_id": rng.integers(0, portfolios, rows),
+            "Symbol": pd.Categorical(rng.choice(SYMBOLS, rows)),
+            "Type": pd.Categorical(rng.choice(TYPES, rows)),
+            "Market_Value": market_value,
+            "Cost_Basis": cost_basis,
+            "Unrealized_PL": market_value - cost_basis,
+            "MTD_PL": rng.normal(0, 100, rows),
+            "YTD_PL": rng.normal(0, 1_000, rows),
+        }
+    )
+
+
+def per_book(positions):
+    """The dashboard's original scalar computations, one book at a time."""
+    out = {}
+    for portfolio_id, book in positions.groupby("portfolio_id", sort=False):
+        total = book["Market_Value"].sum()
+        cost = book["Cost_Basis"].sum()
+        out[portfolio_id] = {
+            "market_value": total,
+            "total_return_pct": book["Unrealized_PL"].sum() / cost * 100,
+            "mtd_return_pct": book["MTD_PL"].sum() / cost * 100,
+            "ytd_return_pct": book["YTD_PL"].sum() / cost * 100,
+            "weight_std": np.std(book["Market_Value"] / total),
+            "largest_weight_pct": book["Market_Value"].max() / total * 100,
+            "govt_allocation_pct": book[book["Type"] == "GOVT BOND"]["Market_Value"].sum() / total * 100,
+            "us10y_pct": book[book["Symbol"] == "US10Y"]["Market_Value"].sum() / total * 100,
+            "best_ytd_symbol": book.loc[book["YTD_PL"].idxmax(), "Symbol"],
+        }
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--portfolios", type=int, nargs="+", default=[100, 1_000, 10_000])
+    parser.add_argument("--positions", type=int, default=1_000_000)
+    parser.add_argument("--baseline-limit", type=int, default=1_000, help="skip the loop above this many portfolios")
+    args = parser.parse_args()
+
+    for portfolios in args.portfolios:
+        positions = synthetic_positions(portfolios, args.positions)
+        started = time.perf_counter()
+        metrics = portfolio_metrics(positions)
+        engine = time.perf_counter() - started
+
+        result = {"portfolios": portfolios, "positions": args.positions, "engine_s": round(engine, 4)}
+        if portfolios <= args.baseline_limit:
+            started = time.perf_counter()
+            baseline = per_book(positions)
+            result["per_book_s"] = round(time.perf_counter() - started, 4)
+            result["speedup"] = round(result["per_book_s"] / engine, 1)
+            check = pd.DataFrame.from_dict(baseline, orient="index").sort_index()
+            assert np.allclose(check["weight_std"], metrics["weight_std"])
+        print(json.dumps(result))
+
+    # A position without a portfolio is an input error, not a portfolio of its own
+    unassigned = synthetic_positions(2, 3).astype({"portfolio_id": "Int64"})
+    unassigned.loc[0, "portfolio_id"] = pd.NA
+    try:
+        portfolio_metrics(unassigned)
+    except ValueError as e:
+        print(json.dumps({"stage": "missing_id", "error": str(e)}))
+    else:
+        raise AssertionError("a position without a portfolio_id was accepted")
+
+
+if __name__ == "__main__":
+    main()
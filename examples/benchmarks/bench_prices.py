@@ -0,0 +1,55 @@
+"""Compare the sequential per-ticker loop with the concurrent price loader.
+
+Runs fully offline against ``SyntheticPriceSource``, whose ``latency``
+stands in for the network round trip of one ``Ticker.history`` call:
+
+    python bench_prices.py --tickers 10 50 --latency 0.2
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from shared.prices import SyntheticPriceSource, load_prices
+
+
+def sequential(tickers, period, source):
+    """The original dashboard loop: one request after another."""
+    return {ticker: source.history(ticker, period) for ticker in tickers}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tickers", type=int, nargs="+", default=[4, 20, 60])
+    parser.add_argument("--latency", type=float, default=0.1)
+    parser.add_argument("--period", default="6mo")
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    source = SyntheticPriceSource(latency=args.latency)
+    results = []
+    for n in args.tickers:
+        tickers = [f"T{i:04d}" for i in range(n)]
+
+        started = time.perf_counter()
+        sequential(tickers, args.period, source)
+        seq = time.perf_counter() - started
+
+        loaded = load_prices(tickers, args.period, source=source, max_workers=args.workers)
+        results.append(
+            {
+                "tickers": n,
+                "sequential_s": round(seq, 4),
+                "concurrent_s": round(loaded.elapsed, 4),
+                "tickers_per_s": round(n / loaded.elapsed, 1),
+                "speedup": round(seq / loaded.elapsed, 2),
+            }
+        )
+        print(json.dumps(results[-1]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Throughput of the batch HTML report renderer.
+
+Writes ``--books`` synthetic books of ``--positions`` rows each and renders
+them with ``shared.reports.run_batch`` for every worker count, reporting
+reports per minute:
+
+    python bench_reports.py --books 40 --positions 200 --workers 1 2 4
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from bench_portfolio import synthetic_book
+from shared.reports import discover_books, run_batch
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--books", type=int, default=40)
+    parser.add_argument("--positions", type=int, default=200)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--max-memory-mb", type=int, default=1024)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        books_dir = Path(tmp) / "books"
+        books_dir.mkdir()
+        for i in range(args.books):
+            synthetic_book(args.positions, seed=i).to_csv(books_dir / f"client-{i:04d}.csv", index=False)
+        books = discover_books([books_dir])
+
+        for workers in args.workers:
+            manifest = run_batch(books, Path(tmp) / f"out-{workers}", workers, args.max_memory_mb)
+            reports = [r for r in manifest["reports"] if r["status"] == "ok"]
+            print(
+                json.dumps(
+                    {
+                        "books": args.books,
+                        "positions": args.positions,
+                        "workers": workers,
+                        "failed": manifest["failed"],
+                        "wall_s": manifest["wall_seconds"],
+                        "reports_per_minute": manifest["reports_per_minute"],
+                        "report_kb": round(sum(r["bytes"] for r in reports) / max(len(reports), 1) / 1024, 1),
+                    }
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Many sessions missing their caches at once: direct upstream calls vs the shared scheduler.
+
+Every session asks for the same tickers at the same moment, as happens when
+the TTL expires while several users have the dashboard open. The upstream
+answers after ``--latency`` seconds and throttles with HTTP 429 beyond
+``--upstream-rate`` requests per second:
+
+    python bench_scheduler.py --sessions 10 --tickers 4 20
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+import urllib.error
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from shared.prices import YAHOO_HOST
+from shared.scheduler import FetchScheduler, HostLimit
+
+
+class ThrottledUpstream:
+    """Answers after ``latency``; more than ``rate`` requests per second (beyond ``burst``) get a 429."""
+
+    def __init__(self, latency, rate, burst):
+        self.latency = latency
+        self.rate = rate
+        self.burst = burst
+        self.calls = 0
+        self.throttled = 0
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def history(self, ticker):
+        with self._lock:
+            self.calls += 1
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens < 1:
+                self.throttled += 1
+                raise urllib.error.HTTPError(YAHOO_HOST, 429, "Too Many Requests", {"Retry-After": "1"}, None)
+            self._tokens -= 1
+        time.sleep(self.latency)
+        return ticker
+
+
+def run_sessions(sessions, tickers, fetch):
+    """Every session fetches every ticker on its own threads, all starting together."""
+    errors = []
+    barrier = threading.Barrier(sessions * len(tickers))
+
+    def one(ticker):
+        barrier.wait()
+        try:
+            fetch(ticker)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=one, args=(t,)) for _ in range(sessions) for t in tickers]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - started, len(errors)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--tickers", type=int, nargs="+", default=[4, 20])
+    parser.add_argument("--latency", type=float, default=0.2, help="upstream response time in seconds")
+    parser.add_argument("--upstream-rate", type=float, default=5.0, help="requests per second before 429s")
+    parser.add_argument("--upstream-burst", type=int, default=10)
+    args = parser.parse_args()
+
+    for n in args.tickers:
+        tickers = [f"T{i:03d}" for i in range(n)]
+        params = {"sessions": args.sessions, "tickers": n}
+
+        upstream = ThrottledUpstream(args.latency, args.upstream_rate, args.upstream_burst)
+        seconds, errors = run_sessions(args.sessions, tickers, upstream.history)
+        print(json.dumps({**params, "mode": "direct", "seconds": round(seconds, 3), "errors": errors,
+                          "upstream_calls": upstream.calls, "throttled": upstream.throttled}))
+
+        upstream = ThrottledUpstream(args.latency, args.upstream_rate, args.upstream_burst)
+        # Stay under the upstream's limit, with some room for clock skew
+        limit = HostLimit(rate=args.upstream_rate * 0.8, burst=args.upstream_burst, concurrency=4)
+        scheduler = FetchScheduler(limits={YAHOO_HOST: limit})
+        seconds, errors = run_sessions(
+            args.sessions, tickers,
+            lambda ticker: scheduler.call(("history", ticker), YAHOO_HOST, upstream.history, ticker),
+        )
+        stats = scheduler.stats()
+        print(json.dumps({**params, "mode": "scheduled", "seconds": round(seconds, 3), "errors": errors,
+                          "upstream_calls": upstream.calls, "throttled": upstream.throttled,
+                          "coalescing_ratio": round(stats["coalescing_ratio"], 3),
+                          "retries": stats["retries"],
+                          "queue_wait_s": round(stats["queue_wait_seconds"], 3),
+                          "max_queue_wait_s": round(stats["max_queue_wait_seconds"], 3)}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""Cold-start profile of both dashboards: imports and time to first render.
+
+Each dashboard runs once per round in a fresh interpreter under
+``python -X importtime``, the way the first session after a server start
+runs it: Streamlit is already loaded, the dashboard's own imports are not.
+For every dashboard it reports
+
+* ``time_to_first_render_s``: from the start of the script run to the first
+  element sent to the browser, and ``seconds`` for the whole run
+* ``imports_s``: cumulative import time of the modules loaded during the run,
+  with the slowest ones in ``top_imports``
+* ``heavy_before_first_render``: which of ``HEAVY_MODULES`` were already
+  loaded when the first element went out; this should stay empty
+
+Prices are synthetic and the feeds are served locally, so the run is
+offline. ``--output`` and ``--baseline`` work as in ``bench_dashboards.py``;
+a heavy module that newly loads before the first render is a regression too:
+
+    python bench_startup.py --output before.json
+    python bench_startup.py --baseline before.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Only the standard library up here: the profiled interpreter imports this file too
+EXAMPLES_DIR = Path(__file__).resolve().parent.parent
+DASHBOARDS = {
+    "news": EXAMPLES_DIR / "news-sentiment" / "dashboard.py",
+    "portfolio": EXAMPLES_DIR / "extract-and-analyze-portfolio" / "dashboard.py",
+}
+FEED_COUNT = 3
+# Modules a dashboard must not need before its first element is on the page
+HEAVY_MODULES = ("pandas", "numpy", "pyarrow", "plotly.express", "yfinance", "textblob", "feedparser")
+# Written to stderr between the harness's own imports and the script run
+RUN_MARK = "-- finagent startup run --"
+RESULT_PREFIX = "finagent-startup "
+# Timings below this are noise for regression checks
+MIN_DELTA_S = 0.02
+
+
+def child(script, timeout):
+    """Run ``script`` once under ``AppTest`` and print its startup record; runs in the profiled interpreter."""
+    from streamlit.runtime.scriptrunner_utils.script_run_context import ScriptRunContext
+    from streamlit.testing.v1 import AppTest
+
+    first_render = {}
+    enqueue = ScriptRunContext.enqueue
+
+    def timed_enqueue(self, msg):
+        if not first_render and msg.WhichOneof("type") == "delta":
+            first_render["at"] = time.perf_counter()
+            first_render["heavy"] = [name for name in HEAVY_MODULES if name in sys.modules]
+        return enqueue(self, msg)
+
+    ScriptRunContext.enqueue = timed_enqueue
+    at = AppTest.from_file(str(script), default_timeout=timeout)
+    print(RUN_MARK, file=sys.stderr, flush=True)
+    started = time.perf_counter()
+    at.run()
+    record = {
+        "time_to_first_render_s": round(first_render["at"] - started, 5) if first_render else None,
+        "seconds": round(time.perf_counter() - started, 5),
+        "heavy_before_first_render": first_render.get("heavy", []),
+        "exceptions": len(at.exception),
+    }
+    print(RESULT_PREFIX + json.dumps(record), flush=True)
+
+
+def parse_importtime(stderr):
+    """Cumulative seconds of every top-level import after ``RUN_MARK``, slowest first."""
+    _, _, after = stderr.partition(RUN_MARK)
+    imports = {}
+    for line in after.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        if not cumulative.strip().isdigit() or len(name) - len(name.lstrip()) != 1:
+            continue  # The header line, or a module imported by another one
+        imports[name.strip()] = imports.get(name.strip(), 0) + int(cumulative) / 1e6
+    return sorted(imports.items(), key=lambda item: item[1], reverse=True)
+
+
+def profile(name, script, env, timeout, top):
+    """One cold run of ``script`` in a fresh interpreter."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", __file__, "--child", str(script), "--timeout", str(timeout)],
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=timeout + 60,
+    )
+    lines = [line for line in proc.stdout.splitlines() if line.startswith(RESULT_PREFIX)]
+    if proc.returncode or not lines:
+        raise RuntimeError(f"{name} dashboard failed to start:\n{proc.stderr[-2000:]}")
+    imports = parse_importtime(proc.stderr)
+    return {
+        **json.loads(lines[-1][len(RESULT_PREFIX):]),
+        "imports_s": round(sum(seconds for _, seconds in imports), 5),
+        "modules": len(imports),
+        "top_imports": [[module, round(seconds, 5)] for module, seconds in imports[:top]],
+    }
+
+
+def compare(results, baseline_path, tolerance):
+    """Print regressions against ``baseline_path``; returns how many there are."""
+    baseline = {r["dashboard"]: r for r in json.loads(Path(baseline_path).read_text())["results"]}
+    regressions = 0
+    for record in results:
+        before = baseline.get(record["dashboard"])
+        if before is None:
+            continue
+        for metric in ("time_to_first_render_s", "imports_s"):
+            old, new = before.get(metric), record.get(metric)
+            if old is None or new is None:
+                continue
+            ratio = new / old if old else float("inf")
+            if ratio > 1 + tolerance and new - old > MIN_DELTA_S:
+                regressions += 1
+                print(json.dumps({"regression": record["dashboard"], "metric": metric, "before_s": old,
+                                  "after_s": new, "ratio": round(ratio, 2)}))
+        added = sorted(set(record["heavy_before_first_render"]) - set(before.get("heavy_before_first_render", [])))
+        if added:
+            regressions += 1
+            print(json.dumps({"regression": record["dashboard"], "heavy_before_first_render": added}))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dashboards", nargs="+", choices=list(DASHBOARDS), default=list(DASHBOARDS))
+    parser.add_argument("--repeat", type=int, default=3, help="cold runs per dashboard; the fastest is reported")
+    parser.add_argument("--top", type=int, default=10, help="slowest imports listed per dashboard")
+    parser.add_argument("--timeout", type=float, default=120, help="seconds allowed per run")
+    parser.add_argument("--output", help="write all results to this JSON file")
+    parser.add_argument("--baseline", help="results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before a regression")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        return child(args.child, args.timeout)
+
+    from bench_dashboards import git_commit
+    from feed_server import serve_feeds
+
+    results = []
+    server, urls = serve_feeds({f"Feed {i}": 20 for i in range(FEED_COUNT)})
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            env = {
+                **os.environ,
+                "FINAGENT_PRICE_SOURCE": "synthetic",
+                "FINAGENT_RSS_FEEDS": json.dumps(urls),
+                "FINAGENT_INSTRUMENT": "",
+            }
+            for name in args.dashboards:
+                runs = []
+                for i in range(args.repeat):
+                    # Empty caches every round: a cold start finds nothing on disk either
+                    env["FINAGENT_CACHE_DIR"] = str(Path(tmp) / f"cache-{name}-{i}")
+                    runs.append(profile(name, DASHBOARDS[name], env, args.timeout, args.top))
+                best = min(runs, key=lambda r: r["time_to_first_render_s"] or float("inf"))
+                record = {"dashboard": name, "stage": "cold_start", "runs": len(runs), **best}
+                record["imports_s"] = min(r["imports_s"] for r in runs)
+                results.append(record)
+                print(json.dumps(record), flush=True)
+    finally:
+        server.shutdown()
+
+    if args.output:
+        meta = {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "args": {k: v for k, v in vars(args).items() if k not in ("output", "baseline", "child")},
+        }
+        Path(args.output).write_text(json.dumps({"meta": meta, "results": results}, indent=2))
+    if args.baseline and compare(results, args.baseline, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
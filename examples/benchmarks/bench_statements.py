@@ -0,0 +1,133 @@
+"""Statement PDF extraction: serial vs page-parallel, cold vs cached.
+
+Builds a statement of ``--copies`` times the sample account statement's
+pages, then times ``shared.statements.extract_tables`` on it with a cold
+cache for every worker count, a cached re-run, and an ``extract_book``
+hit. Reports pages per second, the parent's peak memory, and a worker's
+peak memory after one page range against one that extracts them all
+(what replacing the pool bounds). The sample statement's book is also
+checked against the dashboard's hand-extracted ``positions.csv`` and
+``cash_flow.csv``:
+
+    python bench_statements.py --copies 50 --workers 1 2 4
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from shared.statements import DEFAULT_PAGES_PER_TASK, _extract_range, extract_book, extract_tables, statement_book
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "extract-and-analyze-portfolio" / "data"
+STATEMENT = Path(__file__).resolve().parents[2] / "data" / "account_statement.pdf"
+
+
+def repeated_statement(source: Path, copies: int, target: Path) -> int:
+    """Write ``copies`` concatenated copies of ``source`` to ``target`` and return the page count."""
+    from pypdf import PdfReader, PdfWriter
+
+    reader = PdfReader(source)
+    writer = PdfWriter()
+    for _ in range(copies):
+        for page in reader.pages:
+            writer.add_page(page)
+    with open(target, "wb") as f:
+        writer.write(f)
+    return copies * len(reader.pages)
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss survives exec, so spawned workers would report the parent's peak; VmHWM does not
+    status = Path("/proc/self/status")
+    if status.exists():
+        for line in status.read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return round(int(line.split()[1]) / 1024, 1)
+    # KiB on Linux
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def range_peak_rss_mb(path: str, start: int, stop: int) -> float:
+    """Peak memory of a fresh worker process after extracting one page range."""
+    _extract_range(path, start, stop)
+    return peak_rss_mb()
+
+
+def check_sample(statement: Path) -> dict:
+    """Whether the sample statement's book matches the dashboard's CSV files."""
+    import pandas as pd
+
+    positions, cash_flows = statement_book(extract_tables(statement, workers=1, use_cache=False))
+    expected = pd.read_csv(DATA_DIR / "positions.csv")
+    # The statement words two descriptions differently
+    columns = [c for c in expected.columns if c in positions.columns and c != "Description"]
+    positions = positions.set_index("Symbol").loc[expected["Symbol"], [c for c in columns if c != "Symbol"]]
+    expected = expected.set_index("Symbol")[positions.columns]
+    cash_expected = pd.read_csv(DATA_DIR / "cash_flow.csv")
+    return {
+        "positions": len(positions),
+        "positions_match": bool(((positions == expected) | (positions.isna() & expected.isna())).all().all()),
+        "cash_flows_match": cash_flows.reset_index(drop=True).equals(cash_expected.astype(cash_flows.dtypes)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--statement", type=Path, default=STATEMENT)
+    parser.add_argument("--copies", type=int, default=50)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--pages-per-task", type=int, default=DEFAULT_PAGES_PER_TASK)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["FINAGENT_CACHE_DIR"] = str(Path(tmp) / "cache")
+        print(json.dumps({"stage": "sample", **check_sample(args.statement)}), flush=True)
+
+        statement = Path(tmp) / "statement.pdf"
+        pages = repeated_statement(args.statement, args.copies, statement)
+        for workers in args.workers:
+            shutil.rmtree(Path(tmp) / "cache", ignore_errors=True)
+            started = time.perf_counter()
+            tables = extract_tables(statement, workers, args.pages_per_task)
+            seconds = time.perf_counter() - started
+            print(json.dumps({
+                "stage": "cold", "pages": pages, "workers": workers, "tables": len(tables),
+                "seconds": round(seconds, 3), "pages_per_s": round(pages / seconds, 1),
+                "parent_rss_mb": peak_rss_mb(),
+            }), flush=True)
+
+        # One process per range, so each figure is a single range's footprint
+        ranges = [(start, min(start + args.pages_per_task, pages)) for start in range(0, pages, args.pages_per_task)]
+        starts, stops = zip(*ranges)
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+            first = pool.submit(range_peak_rss_mb, str(statement), *ranges[0]).result()
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+            worker_mb = list(pool.map(range_peak_rss_mb, [str(statement)] * len(ranges), starts, stops))
+        print(json.dumps({"stage": "worker_memory", "ranges": len(ranges), "pages_per_task": args.pages_per_task,
+                          "one_range_rss_mb": first, "all_ranges_rss_mb": worker_mb[-1]}), flush=True)
+
+        started = time.perf_counter()
+        cached = extract_tables(statement, args.workers[-1], args.pages_per_task)
+        cached_s = time.perf_counter() - started
+        print(json.dumps({"stage": "cached", "pages": pages, "seconds": round(cached_s, 4),
+                          "same_tables": cached == tables}), flush=True)
+
+        extract_book(statement, args.workers[-1], args.pages_per_task)
+        started = time.perf_counter()
+        book = extract_book(statement)
+        hit_s = time.perf_counter() - started
+        print(json.dumps({"stage": "book_hit", "seconds": round(hit_s, 4),
+                          "files": sorted(p.name for p in book.glob("*.parquet"))}), flush=True)
+
+
+if __name__ == "__main__":
+    main()
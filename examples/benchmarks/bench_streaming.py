@@ -0,0 +1,72 @@
+"""Per-bar cost of streaming statistics versus a pandas recompute.
+
+For each universe size, a history of ``--bars`` minute returns is loaded,
+then one more bar arrives. The pandas path recomputes
+``returns.rolling(30).std()`` and ``returns.corr()`` over the full history,
+as the dashboard does; the streaming path pushes the bar into the rolling
+volatility engine and the expanding correlation engine:
+
+    python bench_streaming.py --symbols 100 500 2000 --bars 390
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from shared.streaming_stats import StreamingStats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--symbols", type=int, nargs="+", default=[100, 500, 2000])
+    parser.add_argument("--bars", type=int, default=390)
+    parser.add_argument("--window", type=int, default=30)
+    parser.add_argument("--updates", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    for n in args.symbols:
+        history = rng.normal(0, 0.001, (args.bars, n))
+        new_bars = rng.normal(0, 0.001, (args.updates, n))
+
+        vol = StreamingStats(n, window=args.window, pairs=False, annualization=252 * 390)
+        corr = StreamingStats(n, pairs=True, annualization=252 * 390)
+        for row in history:
+            vol.push(row)
+            corr.push(row)
+
+        started = time.perf_counter()
+        for row in new_bars:
+            vol.push(row)
+            corr.push(row)
+            vol.snapshot()
+            corr.snapshot()
+        streaming = (time.perf_counter() - started) / args.updates
+
+        returns = pd.DataFrame(np.vstack([history, new_bars[:1]]))
+        started = time.perf_counter()
+        returns.rolling(window=args.window).std()
+        returns.corr()
+        recompute = time.perf_counter() - started
+
+        print(
+            json.dumps(
+                {
+                    "symbols": n,
+                    "bars": args.bars,
+                    "streaming_ms_per_bar": round(streaming * 1000, 3),
+                    "pandas_recompute_ms": round(recompute * 1000, 3),
+                    "speedup": round(recompute / streaming, 1),
+                }
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
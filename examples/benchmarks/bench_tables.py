@@ -0,0 +1,77 @@
+"""Positions table payload: per-cell string formatting vs numeric columns vs one page.
+
+``formatted`` mirrors the original table: six amount columns formatted with
+``apply(lambda x: f"${x:,.2f}")`` before reaching ``st.dataframe``.
+``numeric`` ships the typed frame whole (formatting is column config), and
+``page`` sorts the full frame server-side and ships one page:
+
+    python bench_tables.py --rows 1000 10000 100000 --page-size 100
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from streamlit.dataframe_util import convert_pandas_df_to_arrow_bytes
+
+from bench_portfolio import synthetic_book
+from shared.portfolio import POSITIONS, read_table
+from shared.tables import page_slice
+
+AMOUNTS = {"Market_Value": "${:,.2f}", "Cost_Basis": "${:,.2f}", "Unrealized_PL": "${:+,.2f}", "MTD_PL": "${:+,.2f}", "YTD_PL": "${:+,.2f}", "Close_Price": "{:.2f}"}
+
+
+def formatted(df):
+    display_df = df.copy()
+    for column, fmt in AMOUNTS.items():
+        display_df[column] = display_df[column].apply(lambda x: fmt.format(x))
+    return convert_pandas_df_to_arrow_bytes(display_df)
+
+
+def numeric(df):
+    return convert_pandas_df_to_arrow_bytes(df)
+
+
+def page(df, page_size):
+    return convert_pandas_df_to_arrow_bytes(page_slice(df, 1, page_size, "Market_Value", descending=True))
+
+
+def timed(fn, *args, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--page-size", type=int, default=100)
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "book.csv"
+            synthetic_book(rows).to_csv(path, index=False)
+            df = read_table(path, POSITIONS)
+
+        record = {"rows": rows}
+        for name, fn, fn_args in (
+            ("formatted", formatted, (df,)),
+            ("numeric", numeric, (df,)),
+            ("page", page, (df, args.page_size)),
+        ):
+            seconds, payload = timed(fn, *fn_args)
+            record[f"{name}_ms"] = round(seconds * 1000, 2)
+            record[f"{name}_kb"] = round(len(payload) / 1024, 1)
+        print(json.dumps(record))
+
+
+if __name__ == "__main__":
+    main()
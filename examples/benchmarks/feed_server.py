@@ -0,0 +1,80 @@
+"""Local HTTP stand-in for the RSS feeds.
+
+Serves generated RSS documents with ``ETag`` and ``Last-Modified`` headers and
+answers conditional requests with ``304 Not Modified``, so the feed ingester
+can be exercised and timed without network access:
+
+    server, feeds = serve_feeds({"Fixture": 20})
+    FeedIngester(feeds).fetch()
+    server.shutdown()
+"""
+
+import hashlib
+import random
+import threading
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+WORDS = (
+    "stocks rally slump earnings beat miss guidance raised cut record growth losses "
+    "inflation cools rises fed rates bonds yields surge fall strong weak outlook"
+).split()
+
+
+def synthetic_feed(name: str, articles: int, seed: int = 0) -> bytes:
+    """Build an RSS 2.0 document with ``articles`` random items."""
+    rng = random.Random(f"{name}-{seed}")
+    items = []
+    for i in range(articles):
+        title = " ".join(rng.choices(WORDS, k=8)).capitalize()
+        summary = " ".join(rng.choices(WORDS, k=40)).capitalize()
+        items.append(
+            f"<item><title>{title}</title>"
+            f"<link>https://example.com/{name}/{seed}/{i}</link>"
+            f"<pubDate>{formatdate(1_700_000_000 + i * 60)}</pubDate>"
+            f"<description>{summary}</description></item>"
+        )
+    return (
+        '<?xml version="1.0"?><rss version="2.0"><channel>'
+        f"<title>{name}</title>{''.join(items)}</channel></rss>"
+    ).encode()
+
+
+def serve_feeds(feeds: dict[str, int], delay: float = 0.0, port: int = 0):
+    """Serve one synthetic feed per name; returns the server and a name -> URL map.
+
+    ``delay`` is added to every full (200) response to simulate a slow upstream.
+    """
+    documents = {f"/{name.replace(' ', '-')}.xml": synthetic_feed(name, n) for name, n in feeds.items()}
+    validators = {path: hashlib.md5(body).hexdigest() for path, body in documents.items()}
+    last_modified = formatdate(usegmt=True)
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = documents.get(self.path)
+            if body is None:
+                self.send_error(404)
+                return
+            etag = f'"{validators[self.path]}"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.end_headers()
+                return
+            if delay:
+                threading.Event().wait(delay)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/rss+xml")
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", last_modified)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, bound = server.server_address
+    urls = {name: f"http://{host}:{bound}/{name.replace(' ', '-')}.xml" for name in feeds}
+    return server, urls
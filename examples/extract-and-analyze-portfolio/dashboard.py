@@ -1,11 +1,20 @@
+import os
+import sys
+from pathlib import Path
+
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import numpy as np
-from datetime import datetime
-import yfinance as yf
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from shared.instrumentation import debug_panel_enabled, instrumented, span, start_run
+from shared.portfolio_charts import (
+    build_allocation_figure,
+    build_cashflow_figure,
+    build_performance_figure,
+    build_types_figure,
+)
+
+# Per-section timings of this rerun; a no-op unless FINAGENT_INSTRUMENT is set
+run = start_run("portfolio")
 
 # Page configuration
 st.set_page_config(
@@ -15,33 +24,27 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Indicator service shared by all sessions; refreshes in the background every 5 minutes
+@st.cache_resource
+def get_indicator_service():
+    return IndicatorService(interval=300).start()
+
+# Built figures shared by all sessions; reused while their input data is unchanged
+@st.cache_resource
+def get_figure_cache():
+    return FigureCache()
+
 # Function to get current market data for risk analysis
-@st.cache_data(ttl=3600)  # Cache for 1 hour
 def get_market_indicators():
-    """Fetch key market indicators for risk analysis"""
-    try:
-        # Get key market indicators
-        tickers = ['^TNX', '^FVX', 'DXY', '^VIX', 'TLT', 'IEF']  # 10Y, 5Y, Dollar, VIX, Long bonds, Mid bonds
-        data = yf.download(tickers, period='5d', progress=False)
-        
-        if 'Close' in data.columns:
-            latest_data = data['Close'].iloc[-1] if len(data) > 0 else None
-            prev_data = data['Close'].iloc[-2] if len(data) > 1 else None
-            
-            return {
-                '10Y_Treasury': {'current': latest_data['^TNX'] if latest_data is not None else 4.5, 'prev': prev_data['^TNX'] if prev_data is not None else 4.4},
-                '5Y_Treasury': {'current': latest_data['^FVX'] if latest_data is not None else 4.2, 'prev': prev_data['^FVX'] if prev_data is not None else 4.1},
-                'VIX': {'current': latest_data['^VIX'] if latest_data is not None else 16.5, 'prev': prev_data['^VIX'] if prev_data is not None else 15.8},
-                'DXY': {'current': latest_data['DXY'] if latest_data is not None else 104.2, 'prev': prev_data['DXY'] if prev_data is not None else 103.8}
-            }
-    except:
-        # Fallback data if API fails
-        return {
-            '10Y_Treasury': {'current': 4.5, 'prev': 4.4},
-            '5Y_Treasury': {'current': 4.2, 'prev': 4.1}, 
-            'VIX': {'current': 16.5, 'prev': 15.8},
-            'DXY': {'current': 104.2, 'prev': 103.8}
-        }
+    """Latest key market indicators; never waits on the network"""
+    return get_indicator_service().snapshot()
+
+def indicator_note(indicator):
+    """Caption with the as-of date and whether the value is live, stale or a placeholder"""
+    if indicator.status == FALLBACK:
+        return "⚠️ placeholder value, no market data yet"
+    as_of = indicator.as_of.strftime('%Y-%m-%d') if indicator.as_of is not None else "unknown date"
+    return f"{'🟢 live' if indicator.status == LIVE else '🟠 stale'} · as of {as_of}"
 
 # Custom CSS for professional styling
 st.markdown("""
@@ -119,53 +122,88 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
-# Data preparation based on extracted PDF data
-@st.cache_data
+# The data layer loads pandas and pyarrow; imported below the header so the
+# page starts drawing before they load
+import pandas as pd
+from shared.bonds import book_duration, bond_analytics, rate_shocks, treasury_curve
+from shared.figure_cache import FigureCache
+from shared.indicators import FALLBACK, LIVE, IndicatorService
+from shared.portfolio import CASH_FLOWS, PortfolioLoader, PortfolioSchemaError, ending_cash, with_bond_terms
+from shared.portfolio_metrics import book_metrics
+from shared.statements import StatementError, extract_book
+from shared.tables import PAGE_SIZES, PAGE_THRESHOLD, page_count, page_slice
+
+# Data extracted from the IB statement; FINAGENT_PORTFOLIO and FINAGENT_CASH_FLOWS
+# point at another book (CSV, Parquet or Arrow IPC), FINAGENT_STATEMENT at a statement PDF.
+# The statement has no coupons or maturities: the sample book's bond terms are made up,
+# and FINAGENT_BOND_TERMS supplies real ones for any book
+DATA_DIR = Path(__file__).resolve().parent / "data"
+ILLUSTRATIVE_BOND_TERMS = DATA_DIR / "illustrative_bond_terms.csv"
+
+# Typed portfolio tables shared by all sessions; files are re-parsed only when changed
+@st.cache_resource
+def get_portfolio_loader():
+    return PortfolioLoader()
+
+@instrumented("load_portfolio")
 def load_portfolio_data():
-    # Portfolio positions data
-    positions_data = {
-        'Symbol': ['US10Y', 'US5Y', 'CORPBND_A', 'MUNI_XY'],
-        'Description': [
-            'U.S. Treasury 10 Year Note',
-            'U.S. Treasury 5 Year Note', 
-            'AAA Corporate Bond',
-            'Tax-Exempt Municipal Bond'
-        ],
-        'Type': ['GOVT BOND', 'GOVT BOND', 'CORPORATE', 'MUNICIPAL'],
-        'Quantity': [20000, 15000, 10000, 5000],
-        'Cost_Basis': [19682.00, 15007.50, 10245.00, 5238.50],
-        'Close_Price': [98.78, 100.16, 102.39, 104.81],
-        'Market_Value': [19756.00, 15024.00, 10239.00, 5240.50],
-        'Unrealized_PL': [74.00, 16.50, -6.00, 2.00],
-        'MTD_PL': [1220.00, 95.00, -65.00, 25.00],
-        'YTD_PL': [2615.00, 320.00, 140.00, 95.00]
-    }
-    
-    positions_df = pd.DataFrame(positions_data)
-    
-    # Cash flow data
-    cash_flow_data = {
-        'Description': ['Starting Cash', 'Commissions', 'Deposits', 'Dividends/Interest', 'Trades (Purchase)', 'Trades (Sales)'],
-        'MTD': [3215.50, -14.00, 0.00, 295.70, -10000.00, 0.00],
-        'YTD': [2050.00, -72.00, 10000.00, 1987.40, -18900.00, 8000.00]
-    }
-    
-    cash_flow_df = pd.DataFrame(cash_flow_data)
+    loader = get_portfolio_loader()
+    positions_path = os.environ.get("FINAGENT_PORTFOLIO")
+    cash_flow_path = os.environ.get("FINAGENT_CASH_FLOWS")
+    statement_path = os.environ.get("FINAGENT_STATEMENT")
+    bond_terms_path = os.environ.get("FINAGENT_BOND_TERMS")
+
+    try:
+        if not positions_path and statement_path:
+            # Parsed once per statement content, then read from the extraction cache
+            with span("extract_statement"):
+                book_dir = extract_book(statement_path)
+            positions_path = book_dir / "positions.parquet"
+            cash_flow_path = cash_flow_path or book_dir / "cash_flow.parquet"
+        elif not positions_path:
+            positions_path = DATA_DIR / "positions.csv"
+            cash_flow_path = cash_flow_path or DATA_DIR / "cash_flow.csv"
+            bond_terms_path = bond_terms_path or ILLUSTRATIVE_BOND_TERMS
+
+        positions_df = loader.positions(positions_path)
+        if bond_terms_path:
+            positions_df = with_bond_terms(positions_df, loader.bond_terms(bond_terms_path))
+        if cash_flow_path:
+            cash_flow_df = loader.cash_flows(cash_flow_path)
+        else:
+            cash_flow_df = pd.DataFrame(columns=list(CASH_FLOWS.dtypes)).astype(CASH_FLOWS.dtypes)
+    except (OSError, PortfolioSchemaError, StatementError) as e:
+        st.error(f"Error loading portfolio: {e}")
+        st.stop()
     
     return positions_df, cash_flow_df
 
 positions_df, cash_flow_df = load_portfolio_data()
-market_data = get_market_indicators()
-
-# Calculate key metrics
-total_market_value = positions_df['Market_Value'].sum()
-total_cost_basis = positions_df['Cost_Basis'].sum()
-total_unrealized_pl = positions_df['Unrealized_PL'].sum()
-total_mtd_pl = positions_df['MTD_PL'].sum()
-total_ytd_pl = positions_df['YTD_PL'].sum()
-total_return_pct = (total_unrealized_pl / total_cost_basis) * 100
-mtd_return_pct = (total_mtd_pl / total_cost_basis) * 100
-ytd_return_pct = (total_ytd_pl / total_cost_basis) * 100
+cash_balance = ending_cash(cash_flow_df)
+with span("market_indicators"):
+    market_data = get_market_indicators()
+
+# Calculate key and risk metrics; the same engine computes them for many books at once
+with span("kpis"):
+    metrics = book_metrics(positions_df)
+total_market_value = metrics['market_value']
+total_cost_basis = metrics['cost_basis']
+total_unrealized_pl = metrics['unrealized_pl']
+total_mtd_pl = metrics['mtd_pl']
+total_ytd_pl = metrics['ytd_pl']
+total_return_pct = metrics['total_return_pct']
+mtd_return_pct = metrics['mtd_return_pct']
+ytd_return_pct = metrics['ytd_return_pct']
+
+# Yield, duration, convexity and DV01 of every bond, on the Treasury curve of the indicators above
+with span("bond_analytics"):
+    curve = treasury_curve(market_data)
+    bonds = bond_analytics(positions_df, curve)
+    duration = book_duration(bonds)
+    shocks = rate_shocks(positions_df, bonds, curve)
+is_us10y = (positions_df['Symbol'] == 'US10Y').to_numpy()
+us10y_value = positions_df['Market_Value'][is_us10y].sum()
+us10y_dv01_share = bonds['dv01'][is_us10y].sum() / duration['dv01'] * 100 if duration['dv01'] else 0.0
 
 # KPI Row
 st.markdown('<div class="kpi-container">', unsafe_allow_html=True)
@@ -201,10 +239,9 @@ with col4:
     )
 
 with col5:
-    ending_cash = 3487.20
     st.metric(
         label="Cash Balance",
-        value=f"${ending_cash:,.2f}",
+        value=f"${cash_balance:,.2f}" if cash_balance is not None else "n/a",
         delta=None
     )
 
@@ -220,24 +257,30 @@ with market_col1:
     st.markdown("### Key Indicators")
     
     # Display market indicators with trend arrows
-    tnx_change = market_data['10Y_Treasury']['current'] - market_data['10Y_Treasury']['prev']
+    if market_data.status == FALLBACK:
+        st.warning("Market data is unavailable; indicators marked as placeholders are not real values.")
+    
+    tnx_change = market_data['10Y_Treasury'].change
     tnx_color = "🟢" if tnx_change < 0 else "🔴"  # Green if rates falling (good for bonds)
-    st.markdown(f"**10Y Treasury**: {market_data['10Y_Treasury']['current']:.2f}% {tnx_color}")
+    st.markdown(f"**10Y Treasury**: {market_data['10Y_Treasury'].current:.2f}% {tnx_color}")
+    st.caption(indicator_note(market_data['10Y_Treasury']))
     
-    fvx_change = market_data['5Y_Treasury']['current'] - market_data['5Y_Treasury']['prev'] 
+    fvx_change = market_data['5Y_Treasury'].change
     fvx_color = "🟢" if fvx_change < 0 else "🔴"
-    st.markdown(f"**5Y Treasury**: {market_data['5Y_Treasury']['current']:.2f}% {fvx_color}")
+    st.markdown(f"**5Y Treasury**: {market_data['5Y_Treasury'].current:.2f}% {fvx_color}")
+    st.caption(indicator_note(market_data['5Y_Treasury']))
     
-    vix_change = market_data['VIX']['current'] - market_data['VIX']['prev']
+    vix_change = market_data['VIX'].change
     vix_color = "🔴" if vix_change > 0 else "🟢"  # Red if volatility rising
-    st.markdown(f"**VIX (Volatility)**: {market_data['VIX']['current']:.1f} {vix_color}")
+    st.markdown(f"**VIX (Volatility)**: {market_data['VIX'].current:.1f} {vix_color}")
+    st.caption(indicator_note(market_data['VIX']))
 
 with market_col2:
     st.markdown("### Market Assessment")
     
     # Generate market outlook based on indicators
-    avg_yield = (market_data['10Y_Treasury']['current'] + market_data['5Y_Treasury']['current']) / 2
-    vix_level = market_data['VIX']['current']
+    avg_yield = (market_data['10Y_Treasury'].current + market_data['5Y_Treasury'].current) / 2
+    vix_level = market_data['VIX'].current
     
     if avg_yield > 4.5:
         rate_outlook = "📈 **Higher Rate Environment**: Yields remain elevated, presenting reinvestment opportunities"
@@ -274,134 +317,38 @@ with market_col3:
 st.markdown('</div>', unsafe_allow_html=True)
 
 # Charts grid (2x2 layout)
+figures = get_figure_cache()
 col1, col2 = st.columns(2)
 
 # Chart 1: Portfolio Allocation by Market Value
 with col1:
-    fig_allocation = px.pie(
-        positions_df,
-        values='Market_Value',
-        names='Symbol',
-        title="Portfolio Allocation by Market Value",
-        color_discrete_sequence=px.colors.qualitative.Set3,
-        height=400
-    )
-    fig_allocation.update_traces(
-        textposition='inside',
-        textinfo='percent+label',
-        hovertemplate='<b>%{label}</b><br>Value: $%{value:,.2f}<br>Percentage: %{percent}<extra></extra>'
-    )
-    fig_allocation.update_layout(
-        showlegend=True,
-        font_size=12,
-        title_font_size=16,
-        margin=dict(t=40, b=0, l=0, r=0)
-    )
-    st.plotly_chart(fig_allocation, use_container_width=True)
+    with span("figure:allocation"):
+        fig_allocation = figures.get("allocation", build_allocation_figure, positions_df)
+    with span("render:allocation"):
+        st.plotly_chart(fig_allocation, use_container_width=True)
 
 # Chart 2: P&L Performance Comparison
 with col2:
-    pl_comparison = pd.DataFrame({
-        'Symbol': positions_df['Symbol'],
-        'MTD P&L': positions_df['MTD_PL'],
-        'YTD P&L': positions_df['YTD_PL'],
-        'Unrealized P&L': positions_df['Unrealized_PL']
-    })
-    
-    fig_performance = go.Figure()
-    
-    fig_performance.add_trace(go.Bar(
-        name='MTD P&L',
-        x=pl_comparison['Symbol'],
-        y=pl_comparison['MTD P&L'],
-        marker_color='lightblue',
-        hovertemplate='<b>%{x}</b><br>MTD P&L: $%{y:,.2f}<extra></extra>'
-    ))
-    
-    fig_performance.add_trace(go.Bar(
-        name='YTD P&L',
-        x=pl_comparison['Symbol'],
-        y=pl_comparison['YTD P&L'],
-        marker_color='darkblue',
-        hovertemplate='<b>%{x}</b><br>YTD P&L: $%{y:,.2f}<extra></extra>'
-    ))
-    
-    fig_performance.update_layout(
-        title="P&L Performance Comparison",
-        xaxis_title="Securities",
-        yaxis_title="P&L ($)",
-        barmode='group',
-        height=400,
-        font_size=12,
-        title_font_size=16,
-        margin=dict(t=40, b=0, l=0, r=0)
-    )
-    
-    st.plotly_chart(fig_performance, use_container_width=True)
+    with span("figure:performance"):
+        fig_performance = figures.get("performance", build_performance_figure, positions_df)
+    with span("render:performance"):
+        st.plotly_chart(fig_performance, use_container_width=True)
 
 col3, col4 = st.columns(2)
 
 # Chart 3: Bond Type Distribution
 with col3:
-    type_summary = positions_df.groupby('Type').agg({
-        'Market_Value': 'sum',
-        'Unrealized_PL': 'sum'
-    }).reset_index()
-    
-    fig_types = px.bar(
-        type_summary,
-        x='Type',
-        y='Market_Value',
-        title="Portfolio Value by Bond Type",
-        color='Unrealized_PL',
-        color_continuous_scale='RdYlGn',
-        height=400,
-        text='Market_Value'
-    )
-    
-    fig_types.update_traces(
-        texttemplate='$%{text:,.0f}',
-        textposition='outside',
-        hovertemplate='<b>%{x}</b><br>Market Value: $%{y:,.2f}<br>Unrealized P&L: $%{color:,.2f}<extra></extra>'
-    )
-    
-    fig_types.update_layout(
-        xaxis_title="Bond Type",
-        yaxis_title="Market Value ($)",
-        font_size=12,
-        title_font_size=16,
-        margin=dict(t=40, b=0, l=0, r=0)
-    )
-    
-    st.plotly_chart(fig_types, use_container_width=True)
+    with span("figure:types"):
+        fig_types = figures.get("types", build_types_figure, positions_df)
+    with span("render:types"):
+        st.plotly_chart(fig_types, use_container_width=True)
 
 # Chart 4: Cash Flow Analysis
 with col4:
-    # Prepare cash flow data for visualization
-    cash_flow_viz = cash_flow_df[cash_flow_df['Description'] != 'Starting Cash'].copy()
-    
-    fig_cashflow = go.Figure()
-    
-    fig_cashflow.add_trace(go.Bar(
-        name='MTD',
-        x=cash_flow_viz['Description'],
-        y=cash_flow_viz['MTD'],
-        marker_color=['red' if x < 0 else 'green' for x in cash_flow_viz['MTD']],
-        hovertemplate='<b>%{x}</b><br>MTD: $%{y:,.2f}<extra></extra>'
-    ))
-    
-    fig_cashflow.update_layout(
-        title="Month-to-Date Cash Flows",
-        xaxis_title="Category",
-        yaxis_title="Amount ($)",
-        height=400,
-        font_size=12,
-        title_font_size=16,
-        margin=dict(t=40, b=0, l=0, r=0),
-        xaxis={'tickangle': 45}
-    )
-    
-    st.plotly_chart(fig_cashflow, use_container_width=True)
+    with span("figure:cashflow"):
+        fig_cashflow = figures.get("cashflow", build_cashflow_figure, cash_flow_df)
+    with span("render:cashflow"):
+        st.plotly_chart(fig_cashflow, use_container_width=True)
 
 # Summary Section
 st.markdown('<div class="summary-section">', unsafe_allow_html=True)
@@ -414,26 +361,84 @@ with summary_col1:
     st.markdown(f"""
     - **Portfolio Size**: ${total_market_value:,.2f} across {len(positions_df)} bond positions
     - **Performance**: Current unrealized gain of ${total_unrealized_pl:,.2f} ({total_return_pct:+.2f}%)
-    - **Best Performer**: {positions_df.loc[positions_df['YTD_PL'].idxmax(), 'Symbol']} with ${positions_df['YTD_PL'].max():,.2f} YTD gain
-    - **Asset Mix**: Predominantly government bonds ({(positions_df[positions_df['Type'] == 'GOVT BOND']['Market_Value'].sum() / total_market_value * 100):.1f}%)
+    - **Best Performer**: {metrics['best_ytd_symbol']} with ${metrics['best_ytd_pl']:,.2f} YTD gain
+    - **Asset Mix**: Predominantly government bonds ({metrics['govt_allocation_pct']:.1f}%)
     """)
 
 with summary_col2:
     st.markdown("### Risk Analysis:")
     
-    # Calculate some basic risk metrics
-    weight_std = np.std(positions_df['Market_Value'] / total_market_value)
-    avg_duration_proxy = positions_df['Market_Value'].sum() / len(positions_df)  # Simple proxy
+    # Basic risk metrics
+    weight_std = metrics['weight_std']
+    if duration['bonds']:
+        rate_exposure = (
+            f"Modified duration {duration['modified_duration']:.2f} years, "
+            f"DV01 ${duration['dv01']:,.2f} per bp across {duration['bonds']:,.0f} bonds"
+        )
+    else:
+        rate_exposure = "No coupon and maturity terms in this book"
     
     st.markdown(f"""
-    - **Concentration Risk**: {"Moderate" if weight_std < 0.3 else "High"} (largest position: {(positions_df['Market_Value'].max() / total_market_value * 100):.1f}%)
-    - **Interest Rate Exposure**: Mixed duration with 5Y and 10Y treasuries
+    - **Concentration Risk**: {"Moderate" if weight_std < 0.3 else "High"} (largest position: {metrics['largest_weight_pct']:.1f}%)
+    - **Interest Rate Exposure**: {rate_exposure}
     - **Credit Quality**: High quality portfolio (AAA corporate, treasuries, munis)
-    - **Cash Position**: ${ending_cash:,.2f} available for new investments
+    - **Cash Position**: {f"${cash_balance:,.2f} available for new investments" if cash_balance is not None else "Not reported for this book"}
     """)
 
 st.markdown('</div>', unsafe_allow_html=True)
 
+# Rate shocks: every bond revalued under shifts of the Treasury curve
+st.subheader("📉 Interest Rate Sensitivity")
+
+if duration['bonds']:
+    rates_col1, rates_col2 = st.columns(2)
+    
+    with rates_col1:
+        st.markdown("### Rate Shock Scenarios")
+        st.caption(
+            f"Treasury curve: 5Y {curve.yield_at(5.0):.2f}%, 10Y {curve.yield_at(10.0):.2f}% · "
+            f"book yield {duration['yield_pct']:.2f}%, convexity {duration['convexity']:.1f}"
+        )
+        with span("render:rate_shocks") as shocks_span:
+            shocks_span.payload(shocks)
+            st.dataframe(
+                shocks,
+                column_config={
+                    'scenario': st.column_config.TextColumn('Scenario'),
+                    'shift_5y_bp': st.column_config.NumberColumn('5Y (bp)', format='%+d'),
+                    'shift_10y_bp': st.column_config.NumberColumn('10Y (bp)', format='%+d'),
+                    'pl': st.column_config.NumberColumn('P&L', format='$%+,.2f'),
+                    'pl_pct': st.column_config.NumberColumn('P&L %', format='%+.2f%%'),
+                    'pl_estimate': st.column_config.NumberColumn('Duration/Convexity Est.', format='$%+,.2f'),
+                },
+                hide_index=True,
+                use_container_width=True
+            )
+    
+    with rates_col2:
+        st.markdown("### Bond Analytics")
+        bond_table = pd.concat([positions_df[['Symbol']], bonds], axis=1).dropna(subset=['dv01'])
+        with span("render:bond_analytics") as bonds_span:
+            bonds_span.payload(bond_table)
+            st.dataframe(
+                bond_table.nlargest(PAGE_SIZES[0], 'dv01'),
+                column_order=['Symbol', 'years', 'yield_pct', 'spread_bp', 'modified_duration', 'convexity', 'dv01'],
+                column_config={
+                    'years': st.column_config.NumberColumn('Years', format='%.2f'),
+                    'yield_pct': st.column_config.NumberColumn('Yield', format='%.3f%%'),
+                    'spread_bp': st.column_config.NumberColumn('Spread (bp)', format='%+.1f'),
+                    'modified_duration': st.column_config.NumberColumn('Mod. Duration', format='%.2f'),
+                    'convexity': st.column_config.NumberColumn('Convexity', format='%.1f'),
+                    'dv01': st.column_config.NumberColumn('DV01', format='$%,.2f'),
+                },
+                hide_index=True,
+                use_container_width=True
+            )
+        if len(bond_table) > PAGE_SIZES[0]:
+            st.caption(f"Largest {PAGE_SIZES[0]} of {len(bond_table):,} bonds by DV01")
+else:
+    st.info("Add `Coupon` and `Maturity` columns to the positions file, or point `FINAGENT_BOND_TERMS` at a file of them, to analyse its bonds.")
+
 # Risk Reduction Recommendations
 st.markdown('<div class="risk-recommendations">', unsafe_allow_html=True)
 st.subheader("⚠️ Portfolio Risk Management & Recommendations")
@@ -443,38 +448,45 @@ risk_col1, risk_col2 = st.columns(2)
 with risk_col1:
     st.markdown("### 🛡️ Option 1: Duration Risk Mitigation")
     
-    # Calculate current portfolio duration risk
-    long_duration_exposure = (positions_df[positions_df['Symbol'] == 'US10Y']['Market_Value'].iloc[0] / total_market_value) * 100
-    
-    st.markdown('<div class="alert-box alert-info">', unsafe_allow_html=True)
-    st.markdown(f"""
-    **Current Exposure Analysis:**
-    - 10Y Treasury: {long_duration_exposure:.1f}% of portfolio
-    - High interest rate sensitivity
-    - Duration risk concentrated
-    
-    **Recommended Actions:**
-    1. **Reduce 10Y Treasury position** by 25-30% (≈$5,000)
-    2. **Increase short-term bonds** (1-3Y maturity)
-    3. **Add Treasury Bills** or money market funds
-    4. **Consider floating rate notes** for rate protection
-    
-    **Expected Benefits:**
-    - ✅ Lower interest rate sensitivity
-    - ✅ Reduced portfolio volatility
-    - ✅ Better protection in rising rate environment
-    - ✅ Maintained government credit quality
-    
-    **Implementation Cost:** ~$15-25 in transaction fees
-    **Risk Reduction:** High (duration risk ↓40-50%)
-    """)
-    st.markdown('</div>', unsafe_allow_html=True)
+    # Duration advice needs the bonds' terms, like the rate-shock section above
+    if duration['bonds']:
+        long_duration_exposure = metrics['us10y_pct']
+        # Moving 25-30% of the 10Y into bills (near-zero duration) removes that share of its DV01
+        dv01_cut = (0.25 * us10y_dv01_share, 0.30 * us10y_dv01_share)
+        risk_reduction = "High" if dv01_cut[1] >= 20 else "Medium" if dv01_cut[1] >= 10 else "Low"
+        up_100 = shocks.loc[shocks['shift_10y_bp'].eq(100) & shocks['shift_5y_bp'].eq(100), 'pl'].sum()
+    
+        st.markdown('<div class="alert-box alert-info">', unsafe_allow_html=True)
+        st.markdown(f"""
+        **Current Exposure Analysis:**
+        - 10Y Treasury: {long_duration_exposure:.1f}% of portfolio, {us10y_dv01_share:.1f}% of DV01
+        - Portfolio DV01: ${duration['dv01']:,.2f} per basis point
+        - +100bp parallel shift: ${up_100:+,.2f}
+    
+        **Recommended Actions:**
+        1. **Reduce 10Y Treasury position** by 25-30% (≈${0.25 * us10y_value:,.0f}-{0.30 * us10y_value:,.0f})
+        2. **Increase short-term bonds** (1-3Y maturity)
+        3. **Add Treasury Bills** or money market funds
+        4. **Consider floating rate notes** for rate protection
+    
+        **Expected Benefits:**
+        - ✅ Lower interest rate sensitivity
+        - ✅ Reduced portfolio volatility
+        - ✅ Better protection in rising rate environment
+        - ✅ Maintained government credit quality
+    
+        **Implementation Cost:** ~$15-25 in transaction fees
+        **Risk Reduction:** {risk_reduction} (DV01 ↓{dv01_cut[0]:.0f}-{dv01_cut[1]:.0f}%)
+        """)
+        st.markdown('</div>', unsafe_allow_html=True)
+    else:
+        st.info("Add the bonds' `Coupon` and `Maturity` to size a duration reduction from their DV01.")
 
 with risk_col2:
     st.markdown("### 🌐 Option 2: Diversification Enhancement")
     
     # Calculate current diversification
-    govt_allocation = (positions_df[positions_df['Type'] == 'GOVT BOND']['Market_Value'].sum() / total_market_value) * 100
+    govt_allocation = metrics['govt_allocation_pct']
     
     st.markdown('<div class="alert-box alert-warning">', unsafe_allow_html=True)
     st.markdown(f"""
@@ -512,9 +524,10 @@ st.markdown("### 📅 Recommended Implementation Timeline")
 timeline_col1, timeline_col2, timeline_col3 = st.columns(3)
 
 with timeline_col1:
-    st.markdown("""
+    duration_step = f"Reduce 10Y Treasury by ${0.25 * us10y_value:,.0f}" if duration['bonds'] else "Collect the bonds' coupons and maturities"
+    st.markdown(f"""
     **Phase 1: Immediate (1-2 weeks)**
-    - Reduce 10Y Treasury by $5,000
+    - {duration_step}
     - Add 2Y Treasury notes
     - Monitor market conditions
     """)
@@ -540,30 +553,59 @@ st.markdown('</div>', unsafe_allow_html=True)
 # Detailed positions table
 st.subheader("📋 Detailed Position Information")
 
-# Format the positions dataframe for display
-display_df = positions_df.copy()
-display_df['Market_Value'] = display_df['Market_Value'].apply(lambda x: f"${x:,.2f}")
-display_df['Cost_Basis'] = display_df['Cost_Basis'].apply(lambda x: f"${x:,.2f}")
-display_df['Unrealized_PL'] = display_df['Unrealized_PL'].apply(lambda x: f"${x:+,.2f}")
-display_df['MTD_PL'] = display_df['MTD_PL'].apply(lambda x: f"${x:+,.2f}")
-display_df['YTD_PL'] = display_df['YTD_PL'].apply(lambda x: f"${x:+,.2f}")
-display_df['Close_Price'] = display_df['Close_Price'].apply(lambda x: f"{x:.2f}")
-
-# Rename columns for display
-display_df = display_df.rename(columns={
-    'Market_Value': 'Market Value',
-    'Cost_Basis': 'Cost Basis',
-    'Close_Price': 'Close Price',
-    'Unrealized_PL': 'Unrealized P&L',
-    'MTD_PL': 'MTD P&L',
-    'YTD_PL': 'YTD P&L'
-})
-
-st.dataframe(
-    display_df[['Symbol', 'Description', 'Type', 'Quantity', 'Cost Basis', 'Close Price', 'Market Value', 'Unrealized P&L', 'MTD P&L', 'YTD P&L']],
-    use_container_width=True
-)
+# Columns stay numeric (and sortable); currency and sign formatting is display config
+POSITION_COLUMNS = ['Symbol', 'Description', 'Type', 'Quantity', 'Cost_Basis', 'Close_Price', 'Market_Value', 'Unrealized_PL', 'MTD_PL', 'YTD_PL']
+POSITION_COLUMN_CONFIG = {
+    'Cost_Basis': st.column_config.NumberColumn('Cost Basis', format='$%,.2f'),
+    'Close_Price': st.column_config.NumberColumn('Close Price', format='%.2f'),
+    'Market_Value': st.column_config.NumberColumn('Market Value', format='$%,.2f'),
+    'Unrealized_PL': st.column_config.NumberColumn('Unrealized P&L', format='$%+,.2f'),
+    'MTD_PL': st.column_config.NumberColumn('MTD P&L', format='$%+,.2f'),
+    'YTD_PL': st.column_config.NumberColumn('YTD P&L', format='$%+,.2f'),
+}
+
+table_df = positions_df
+if len(positions_df) > PAGE_THRESHOLD:
+    # Large books: sort the full frame here and send only the visible page
+    table_cols = st.columns(4)
+    with table_cols[0]:
+        sort_by = st.selectbox(
+            "Sort by", POSITION_COLUMNS, index=POSITION_COLUMNS.index('Market_Value'),
+            format_func=lambda c: POSITION_COLUMN_CONFIG.get(c, {}).get('label') or c
+        )
+    with table_cols[1]:
+        descending = st.toggle("Descending", value=True)
+    with table_cols[2]:
+        page_size = st.selectbox("Rows per page", PAGE_SIZES, index=1)
+    with table_cols[3]:
+        pages = page_count(len(positions_df), page_size)
+        page = st.number_input(f"Page (of {pages:,})", min_value=1, max_value=pages, value=1)
+    
+    table_df = page_slice(positions_df, page, page_size, sort_by, descending)
+    first_row = (page - 1) * page_size + 1
+    st.caption(f"Positions {first_row:,}–{first_row + len(table_df) - 1:,} of {len(positions_df):,}")
+
+with span("render:positions") as table_span:
+    table_span.payload(table_df)
+    st.dataframe(
+        table_df,
+        column_order=POSITION_COLUMNS,
+        column_config=POSITION_COLUMN_CONFIG,
+        hide_index=True,
+        use_container_width=True
+    )
 
 # Footer
 st.markdown("---")
-st.markdown("*Data extracted from Interactive Brokers Statement | Dashboard powered by Streamlit & Plotly*")
\ No newline at end of file
+st.markdown("*Data extracted from Interactive Brokers Statement | Dashboard powered by Streamlit & Plotly*")
+
+# Write this rerun's timings; FINAGENT_INSTRUMENT=panel also shows them on the page
+timings = run.finish()
+if timings and debug_panel_enabled():
+    with st.expander("⏱️ Rerun timings"):
+        rss_delta = timings['peak_rss_delta']
+        st.caption(
+            f"Rerun: {timings['seconds'] * 1000:,.0f} ms"
+            + (f" · peak RSS +{rss_delta / 1024 ** 2:,.1f} MB" if rss_delta is not None else "")
+        )
+        st.dataframe(run.frame(), hide_index=True, use_container_width=True)
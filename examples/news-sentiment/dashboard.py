@@ -1,15 +1,43 @@
+import math
+import os
+import sys
+import time
+from pathlib import Path
+
 import streamlit as st
-import pandas as pd
-import numpy as np
-import yfinance as yf
-import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
-import feedparser
-from textblob import TextBlob
-from datetime import datetime, timedelta
-import warnings
-warnings.filterwarnings('ignore')
+from datetime import datetime
+
+# Heavy modules (pandas, plotly, the data layer) are imported by the functions
+# that need them, so the header and the page skeleton draw before they load
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from shared.instrumentation import debug_panel_enabled, span, start_run
+from shared.news_charts import (
+    DEFAULT_MAX_POINTS,
+    build_correlation_figure,
+    build_event_study_figure,
+    build_price_figure,
+    build_sentiment_history_figure,
+    build_sentiment_figure,
+    build_volatility_figure,
+    build_volume_figure,
+)
+from shared.news_data import (
+    add_prices,
+    align_prices,
+    combine_news,
+    fetch_financial_news,
+    fetch_stock_data,
+    link_tickers,
+    score_news,
+    sentiment_history,
+    store_news,
+)
+from shared.progressive import LoadPipeline
+from shared.scheduler import get_scheduler
+
+# Per-section timings of this rerun; a no-op unless FINAGENT_INSTRUMENT is set
+run = start_run("news")
+page_started = time.perf_counter()
 
 # Configure page
 st.set_page_config(
@@ -62,226 +90,122 @@ st.sidebar.header("Dashboard Configuration")
 tickers = st.sidebar.text_input("Stock Tickers (comma-separated)", "AAPL,MSFT,GOOGL,TSLA").split(",")
 tickers = [ticker.strip().upper() for ticker in tickers if ticker.strip()]
 period = st.sidebar.selectbox("Time Period", ["1mo", "3mo", "6mo", "1y", "2y"], index=2)
+downsample_charts = st.sidebar.checkbox("Downsample long chart series", value=True)
+max_points = st.sidebar.slider(
+    "Max points per trace", 200, 5000, DEFAULT_MAX_POINTS, step=100, disabled=not downsample_charts
+)
+show_payload_stats = st.sidebar.checkbox("Show chart payload stats", value=False)
+chart_points = max_points if downsample_charts else None
 
-# Fetch financial news function
-@st.cache_data(ttl=300)  # Cache for 5 minutes
-def fetch_financial_news(max_articles=20):
-    """Fetch latest financial news from RSS feeds"""
-    RSS_FEEDS = {
-        "Seeking Alpha": "https://seekingalpha.com/feed.xml",
-        "MarketWatch": "https://feeds.content.dowjones.io/public/rss/mw_topstories",
-        "Yahoo Finance": "https://finance.yahoo.com/rss/"
-    }
-    
-    all_articles = []
-    for source_name, feed_url in RSS_FEEDS.items():
-        try:
-            feed = feedparser.parse(feed_url)
-            for entry in feed.entries[:max_articles//len(RSS_FEEDS)]:
-                article = {
-                    'source': source_name,
-                    'title': entry.get('title', 'No title'),
-                    'link': entry.get('link', ''),
-                    'published': entry.get('published', ''),
-                    'summary': entry.get('summary', 'No summary available')[:200] + "..."
-                }
-                all_articles.append(article)
-        except Exception as e:
-            st.sidebar.error(f"Error fetching from {source_name}: {str(e)}")
-    
-    return pd.DataFrame(all_articles)
+# Feed ingester shared by all sessions; keeps ETag/Last-Modified per feed and
+# serves feeds confirmed in the last 5 minutes without a request
+@st.cache_resource
+def get_feed_ingester():
+    from shared.feeds import FeedIngester
+    return FeedIngester(max_age=300)
 
-# Sentiment analysis function
-def analyze_sentiment(text):
-    """Analyze sentiment of text using TextBlob"""
-    blob = TextBlob(text)
-    sentiment_score = blob.sentiment.polarity
-    
-    if sentiment_score > 0.1:
-        return "Positive", sentiment_score, "🟢"
-    elif sentiment_score < -0.1:
-        return "Negative", sentiment_score, "🔴"
-    else:
-        return "Neutral", sentiment_score, "🟡"
-
-# Fetch stock data function
-@st.cache_data(ttl=300)
-def fetch_stock_data(tickers, period):
-    """Fetch stock data for given tickers"""
-    data = {}
-    for ticker in tickers:
-        try:
-            stock = yf.Ticker(ticker)
-            hist = stock.history(period=period, auto_adjust=True)
-            info = stock.info
-            data[ticker] = {
-                'history': hist,
-                'info': info,
-                'current_price': hist['Close'].iloc[-1] if not hist.empty else 0,
-                'prev_price': hist['Close'].iloc[-2] if len(hist) > 1 else 0
-            }
-        except Exception as e:
-            st.error(f"Error fetching data for {ticker}: {str(e)}")
-    return data
-
-# Fetch data
-with st.spinner("Loading financial data and news..."):
-    stock_data = fetch_stock_data(tickers, period)
-    news_df = fetch_financial_news()
+# Sentiment engine shared by all sessions; each article is scored only once
+@st.cache_resource
+def get_sentiment_engine():
+    from shared.sentiment import SentimentEngine
+    return SentimentEngine.persistent()
 
-# KPI Row
-st.subheader("📊 Key Performance Indicators")
-kpi_cols = st.columns(len(tickers))
+# Streaming volatility/correlation per ticker set; each rerun only feeds new bars,
+# and the correlation rolls over the selected period
+@st.cache_resource(max_entries=16)
+def get_streaming_stats(tickers, period):
+    from shared.prices import PERIOD_BARS
+    from shared.streaming_stats import IncrementalMarketStats
+    return IncrementalMarketStats(list(tickers), corr_window=PERIOD_BARS.get(period))
 
-for i, ticker in enumerate(tickers):
-    with kpi_cols[i]:
-        if ticker in stock_data and not stock_data[ticker]['history'].empty:
-            current = stock_data[ticker]['current_price']
-            previous = stock_data[ticker]['prev_price']
-            change = current - previous
-            change_pct = (change / previous * 100) if previous != 0 else 0
-            
-            trend_color = "positive-trend" if change >= 0 else "negative-trend"
-            trend_arrow = "↗️" if change >= 0 else "↘️"
-            
-            st.markdown(f"""
-            <div class="metric-card">
-                <h3>{ticker}</h3>
-                <h2>${current:.2f}</h2>
-                <p class="{trend_color}">
-                    {trend_arrow} {change:+.2f} ({change_pct:+.2f}%)
-                </p>
-            </div>
-            """, unsafe_allow_html=True)
-        else:
-            st.error(f"No data for {ticker}")
+# Bar store shared by all sessions; keeps the longest history on disk
+@st.cache_resource
+def get_bar_store():
+    from shared.bar_store import BarStore
+    return BarStore(ttl=300)
 
-st.markdown("---")
+# Company names, aliases and symbols articles are linked to tickers by;
+# FINAGENT_SYMBOLS points at another table with the same columns
+SYMBOLS_PATH = Path(__file__).resolve().parent / "data" / "symbols.csv"
 
-# Charts Grid
-st.subheader("📈 Financial Analysis Charts")
-chart_cols = st.columns(2)
+# Entity linker per ticker list, shared by all sessions; compiled once from the symbol table
+@st.cache_resource(max_entries=16)
+def get_entity_linker(tickers):
+    from shared.entities import EntityLinker, load_symbol_table
+    try:
+        symbols = load_symbol_table(os.environ.get("FINAGENT_SYMBOLS") or SYMBOLS_PATH)
+    except (OSError, ValueError) as e:
+        st.sidebar.warning(f"Symbol table unavailable, linking news by ticker symbol only: {e}")
+        symbols = None
+    return EntityLinker(symbols, tickers)
 
-# Chart 1: Stock Price Performance
-with chart_cols[0]:
-    st.markdown("**Stock Price Performance**")
-    fig1 = go.Figure()
-    
-    for ticker in tickers:
-        if ticker in stock_data and not stock_data[ticker]['history'].empty:
-            hist = stock_data[ticker]['history']
-            fig1.add_trace(go.Scatter(
-                x=hist.index,
-                y=hist['Close'],
-                mode='lines',
-                name=ticker,
-                line=dict(width=2)
-            ))
-    
-    fig1.update_layout(
-        height=400,
-        xaxis_title="Date",
-        yaxis_title="Price ($)",
-        hovermode='x unified',
-        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
-    )
-    st.plotly_chart(fig1, use_container_width=True)
+# Local history of every article seen, shared by all sessions and dashboards
+@st.cache_resource
+def get_article_store():
+    from shared.article_store import ArticleStore
+    return ArticleStore()
 
-# Chart 2: Volume Analysis
-with chart_cols[1]:
-    st.markdown("**Trading Volume Analysis**")
-    fig2 = make_subplots(specs=[[{"secondary_y": True}]])
-    
-    for ticker in tickers:
-        if ticker in stock_data and not stock_data[ticker]['history'].empty:
-            hist = stock_data[ticker]['history']
-            fig2.add_trace(
-                go.Bar(x=hist.index, y=hist['Volume'], name=f"{ticker} Volume", opacity=0.7),
-                secondary_y=False,
-            )
-    
-    fig2.update_layout(
-        height=400,
-        xaxis_title="Date",
-        hovermode='x unified'
-    )
-    fig2.update_yaxes(title_text="Volume", secondary_y=False)
-    st.plotly_chart(fig2, use_container_width=True)
+# Built figures shared by all sessions; reused while their input data is unchanged
+@st.cache_resource
+def get_figure_cache():
+    from shared.figure_cache import FigureCache
+    return FigureCache()
 
-# Chart 3: Returns Correlation Heatmap
-chart_cols2 = st.columns(2)
-with chart_cols2[0]:
-    st.markdown("**Returns Correlation Matrix**")
-    returns_data = {}
-    for ticker in tickers:
-        if ticker in stock_data and not stock_data[ticker]['history'].empty:
-            hist = stock_data[ticker]['history']
-            returns_data[ticker] = hist['Close'].pct_change().dropna()
-    
-    if returns_data:
-        returns_df = pd.DataFrame(returns_data)
-        corr_matrix = returns_df.corr()
-        
-        fig3 = px.imshow(
-            corr_matrix,
-            text_auto='.2f',
-            aspect="auto",
-            color_continuous_scale='RdBu_r',
-            title="Stock Returns Correlation"
+# Charts are redrawn as data arrives; every draw needs its own element key
+chart_draws = iter(range(1_000_000))
+
+def show_chart(name, fig, build_full=None):
+    """Render a chart; with payload stats on, compare it to the full-resolution figure"""
+    with span(f"render:{name}"):
+        st.plotly_chart(fig, use_container_width=True, key=f"{name}-{next(chart_draws)}")
+    if show_payload_stats and build_full is not None:
+        from shared.downsample import figure_payload
+        sent_bytes, sent_seconds = figure_payload(fig)
+        full_bytes, full_seconds = figure_payload(build_full())
+        st.caption(
+            f"Payload: {full_bytes / 1024:,.0f} KB → {sent_bytes / 1024:,.0f} KB · "
+            f"serialization: {full_seconds * 1000:.0f} ms → {sent_seconds * 1000:.0f} ms"
         )
-        fig3.update_layout(height=400)
-        st.plotly_chart(fig3, use_container_width=True)
 
-# Chart 4: Volatility Analysis
-with chart_cols2[1]:
-    st.markdown("**30-Day Rolling Volatility**")
-    fig4 = go.Figure()
+def show_kpi_card(ticker, analytics, errors, ticker_news, news_loading):
+    """KPI card of one ticker with the sentiment of the news mentioning it, or why it has no data"""
+    if ticker not in analytics.tickers:
+        st.error(f"No data for {ticker}")
+        if ticker in errors:
+            st.caption(errors[ticker])
+        return
+    j = analytics.tickers.index(ticker)
+    current = analytics.current[j]
+    change = analytics.change[j]
+    change_pct = analytics.change_pct[j] if math.isfinite(analytics.change_pct[j]) else 0.0
     
-    for ticker in tickers:
-        if ticker in stock_data and not stock_data[ticker]['history'].empty:
-            hist = stock_data[ticker]['history']
-            returns = hist['Close'].pct_change()
-            volatility = returns.rolling(window=30).std() * np.sqrt(252)  # Annualized
-            
-            fig4.add_trace(go.Scatter(
-                x=volatility.index,
-                y=volatility,
-                mode='lines',
-                name=f"{ticker} Volatility",
-                line=dict(width=2)
-            ))
-    
-    fig4.update_layout(
-        height=400,
-        xaxis_title="Date",
-        yaxis_title="Annualized Volatility",
-        hovermode='x unified'
-    )
-    st.plotly_chart(fig4, use_container_width=True)
-
-st.markdown("---")
-
-# News Sentiment Analysis Section
-st.subheader("📰 Financial News Sentiment Analysis")
-
-if not news_df.empty:
-    # Analyze sentiment for each article
-    sentiments = []
-    for _, article in news_df.iterrows():
-        text = f"{article['title']} {article['summary']}"
-        sentiment, score, emoji = analyze_sentiment(text)
-        sentiments.append({
-            'sentiment': sentiment,
-            'score': score,
-            'emoji': emoji,
-            'title': article['title'],
-            'source': article['source'],
-            'link': article['link']
-        })
+    trend_color = "positive-trend" if change >= 0 else "negative-trend"
+    trend_arrow = "↗️" if change >= 0 else "↘️"
     
-    sentiment_df = pd.DataFrame(sentiments)
+    if ticker_news is not None and ticker_news.at[ticker, 'articles']:
+        mentions = ticker_news.loc[ticker]
+        news_line = (
+            f"{mentions['emoji']} News: {mentions['sentiment']} ({mentions['score']:+.2f}) · "
+            f"{mentions['articles']} article{'s' if mentions['articles'] != 1 else ''}"
+        )
+    elif ticker_news is None and news_loading:
+        news_line = "📰 Waiting for news..."
+    else:
+        news_line = "📰 No recent news mentions"
     
-    # Sentiment summary
+    st.markdown(f"""
+    <div class="metric-card">
+        <h3>{ticker}</h3>
+        <h2>${current:.2f}</h2>
+        <p class="{trend_color}">
+            {trend_arrow} {change:+.2f} ({change_pct:+.2f}%)
+        </p>
+        <p>{news_line}</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+def show_news(sentiment_df, loading):
+    """Sentiment counts, distribution chart and the latest articles"""
     col1, col2, col3 = st.columns(3)
     
     positive_count = len(sentiment_df[sentiment_df['sentiment'] == 'Positive'])
@@ -297,28 +221,199 @@ if not news_df.empty:
     
     # Sentiment distribution chart
     sentiment_counts = sentiment_df['sentiment'].value_counts()
-    fig_sentiment = px.pie(
-        values=sentiment_counts.values,
-        names=sentiment_counts.index,
-        title="News Sentiment Distribution",
-        color_discrete_map={
-            'Positive': '#28a745',
-            'Negative': '#dc3545',
-            'Neutral': '#ffc107'
-        }
-    )
-    st.plotly_chart(fig_sentiment, use_container_width=True)
+    with span("figure:sentiment"):
+        fig_sentiment = figures.get("sentiment", build_sentiment_figure, sentiment_counts)
+    show_chart("sentiment", fig_sentiment)
     
     # Recent news with sentiment
     st.subheader("Recent Financial News")
+    # Always one caption line: a redraw with fewer elements would leave stale ones behind
+    if loading:
+        st.caption(f"⏳ Still loading: {', '.join(loading)}")
+    else:
+        st.caption(f"{len(sentiment_df)} articles from {sentiment_df['source'].nunique()} feeds")
     for _, row in sentiment_df.head(10).iterrows():
         with st.expander(f"{row['emoji']} {row['title']} - {row['source']}"):
             st.write(f"**Sentiment:** {row['sentiment']} (Score: {row['score']:.2f})")
             st.write(f"**Source:** {row['source']}")
             st.write(f"**Link:** {row['link']}")
 
+# Prices per ticker and news per feed load concurrently; every section starts
+# as a placeholder and is drawn as soon as its data arrives
+pipeline = LoadPipeline(started=page_started)
+for ticker in dict.fromkeys(tickers):
+    pipeline.submit("prices", ticker, fetch_stock_data, get_bar_store(), ticker, period)
+ingester = get_feed_ingester()
+pipeline.stream("news", fetch_financial_news, ingester, key=lambda update: update.name)
+
+# KPI Row
+st.subheader("📊 Key Performance Indicators")
+kpi_cols = st.columns(len(tickers))
+kpi_slots = {}
+for i, ticker in enumerate(tickers):
+    slot = kpi_cols[i].empty()
+    slot.caption(f"⏳ Loading {ticker}...")
+    kpi_slots.setdefault(ticker, []).append(slot)
+
+st.markdown("---")
+
+# Charts Grid
+st.subheader("📈 Financial Analysis Charts")
+figures = get_figure_cache()
+chart_cols = st.columns(2)
+chart_cols2 = st.columns(2)
+chart_slots = {}
+for col, (name, title) in zip(
+    [*chart_cols, *chart_cols2],
+    [
+        ("price", "Stock Price Performance"),
+        ("volume", "Trading Volume Analysis"),
+        ("correlation", "Returns Correlation Matrix"),
+        ("volatility", "30-Day Rolling Volatility"),
+    ],
+):
+    with col:
+        st.markdown(f"**{title}**")
+        chart_slots[name] = st.empty()
+        chart_slots[name].caption("⏳ Waiting for prices...")
+
+st.markdown("---")
+
+# News Sentiment Analysis Section
+st.subheader("📰 Financial News Sentiment Analysis")
+news_slot = st.empty()
+news_slot.caption("⏳ Loading news feeds...")
+
+prices = None  # PricePanel of the tickers in so far
+price_errors = {}
+news_frames = {}
+news_done = set()
+analytics = align_prices(prices, tickers)
+news_df = sentiment_df = combine_news(news_frames, ingester.feeds)
+ticker_news = None  # Sentiment of the articles mentioning each ticker
+priced = []  # Tickers whose price load has finished, so their card is drawn
+
+for batch in pipeline.batches():
+    arrived = []
+    news_changed = False
+    for arrival in batch:
+        if arrival.kind == "prices":
+            if arrival.error is not None:
+                price_errors[arrival.key] = str(arrival.error)
+            else:
+                prices = add_prices(prices, arrival.value.histories)
+                price_errors.update(arrival.value.errors)
+            arrived.append(arrival.key)
+        elif arrival.error is not None:
+            st.sidebar.error(f"Error fetching news: {arrival.error}")
+            news_done.update(ingester.feeds)
+        else:
+            update = arrival.value
+            news_done.add(update.name)
+            if update.error is not None:
+                st.sidebar.error(f"Error fetching from {update.name}: {update.error}")
+            else:
+                news_frames[update.name] = update.articles
+                news_changed = True
+    
+    cards = list(arrived)
+    if arrived:
+        priced += arrived
+        with span("analytics"):
+            analytics = align_prices(prices, tickers)
+        
+        # Chart 1: Stock Price Performance
+        with chart_slots["price"].container():
+            with span("figure:price"):
+                fig1 = figures.get("price", build_price_figure, analytics, chart_points)
+            show_chart("price", fig1, lambda: figures.get("price", build_price_figure, analytics, None))
+        
+        # Chart 2: Volume Analysis
+        with chart_slots["volume"].container():
+            with span("figure:volume"):
+                fig2 = figures.get("volume", build_volume_figure, analytics, chart_points)
+            show_chart("volume", fig2, lambda: figures.get("volume", build_volume_figure, analytics, None))
+        pipeline.first_content()
+    
+    if news_changed:
+        news_df = combine_news(news_frames, ingester.feeds)
+        if not news_df.empty:
+            # Analyze sentiment for all articles in one batch; scores are cached per article
+            with span("sentiment"):
+                sentiment_df = score_news(get_sentiment_engine(), news_df)
+            # Link the whole batch to the sidebar tickers in one pass
+            with span("entity_linking"):
+                ticker_news = link_tickers(get_entity_linker(tuple(dict.fromkeys(tickers))), news_df, sentiment_df)
+            cards = priced
+            with news_slot.container():
+                show_news(sentiment_df, [name for name in ingester.feeds if name not in news_done])
+            pipeline.first_content()
+    
+    # New prices, or new news sentiment for every card already drawn
+    news_loading = len(news_done) < len(ingester.feeds)
+    for ticker in cards:
+        for slot in kpi_slots[ticker]:
+            with slot.container():
+                show_kpi_card(ticker, analytics, price_errors, ticker_news, news_loading)
+
+if news_df.empty:
+    news_slot.warning("Unable to fetch financial news at this time.")
+    # Cards drawn while feeds were still loading stop waiting for news
+    for ticker in priced:
+        for slot in kpi_slots[ticker]:
+            with slot.container():
+                show_kpi_card(ticker, analytics, price_errors, ticker_news, news_loading=False)
+else:
+    # Keep every article in the local history; only the ones not stored yet are scored and linked
+    with span("article_store"):
+        store_news(get_article_store(), get_sentiment_engine(), get_entity_linker(tuple(dict.fromkeys(tickers))), news_df)
+
+# Correlation and volatility need every ticker
+with span("streaming_stats"):
+    streaming_stats = get_streaming_stats(tuple(analytics.tickers), period)
+    streaming_stats.update(analytics.dates, analytics.closes)
+
+# Chart 3: Returns Correlation Heatmap
+with chart_slots["correlation"].container():
+    if analytics.tickers:
+        with span("figure:correlation"):
+            fig3 = figures.get("correlation", build_correlation_figure, streaming_stats.correlation_frame())
+        show_chart("correlation", fig3)
+
+# Chart 4: Volatility Analysis
+with chart_slots["volatility"].container():
+    with span("figure:volatility"):
+        volatility_df = streaming_stats.volatility_frame(analytics.dates[0] if len(analytics.dates) else None)
+        fig4 = figures.get("volatility", build_volatility_figure, volatility_df, chart_points)
+    show_chart("volatility", fig4, lambda: figures.get("volatility", build_volatility_figure, volatility_df, None))
+
+# Sentiment History Section
+st.markdown("---")
+st.subheader("🗓️ News Sentiment History")
+with span("sentiment_history"):
+    daily_sentiment, study = sentiment_history(get_article_store(), analytics.tickers, analytics)
+
+if daily_sentiment.empty:
+    st.info("No stored news yet; the history grows with every refresh of the news feeds.")
 else:
-    st.warning("Unable to fetch financial news at this time.")
+    history_col1, history_col2 = st.columns(2)
+    
+    # Chart 5: Daily sentiment of every ticker and of all news
+    with history_col1:
+        st.markdown("**Daily News Sentiment**")
+        with span("figure:sentiment_history"):
+            fig5 = figures.get("sentiment_history", build_sentiment_history_figure, daily_sentiment)
+        show_chart("sentiment_history", fig5)
+    
+    # Chart 6: Event study of the returns around clearly positive or negative news days
+    with history_col2:
+        st.markdown("**Returns Around News Days**")
+        if sum(study.events.values()):
+            with span("figure:event_study"):
+                fig6 = figures.get("event_study", build_event_study_figure, study)
+            show_chart("event_study", fig6)
+        else:
+            st.caption("No clearly positive or negative news day within the price history yet.")
 
 # Summary Section
 st.markdown("---")
@@ -328,33 +423,17 @@ summary_col1, summary_col2 = st.columns(2)
 
 with summary_col1:
     st.markdown("**Market Performance Summary:**")
-    if stock_data:
-        best_performer = None
-        worst_performer = None
-        best_change = float('-inf')
-        worst_change = float('inf')
-        
-        for ticker in tickers:
-            if ticker in stock_data and not stock_data[ticker]['history'].empty:
-                current = stock_data[ticker]['current_price']
-                previous = stock_data[ticker]['prev_price']
-                if previous != 0:
-                    change_pct = (current - previous) / previous * 100
-                    if change_pct > best_change:
-                        best_change = change_pct
-                        best_performer = ticker
-                    if change_pct < worst_change:
-                        worst_change = change_pct
-                        worst_performer = ticker
+    ranking = analytics.ranking()
+    if ranking:
+        best_performer, best_change = ranking[0]
+        worst_performer, worst_change = ranking[-1]
         
-        if best_performer:
-            st.success(f"🏆 Best Performer: {best_performer} (+{best_change:.2f}%)")
-        if worst_performer:
-            st.error(f"📉 Worst Performer: {worst_performer} ({worst_change:.2f}%)")
+        st.success(f"🏆 Best Performer: {best_performer} (+{best_change:.2f}%)")
+        st.error(f"📉 Worst Performer: {worst_performer} ({worst_change:.2f}%)")
 
 with summary_col2:
     st.markdown("**News Sentiment Summary:**")
-    if not news_df.empty and 'sentiment' in sentiment_df.columns:
+    if not sentiment_df.empty:
         avg_sentiment = sentiment_df['score'].mean()
         sentiment_trend = "Positive" if avg_sentiment > 0.05 else "Negative" if avg_sentiment < -0.05 else "Neutral"
         
@@ -365,6 +444,19 @@ with summary_col2:
         else:
             st.info(f"📊 Overall Market Sentiment: {sentiment_trend} ({avg_sentiment:.2f})")
 
+# Time to first content next to the full load time of this rerun
+load_col1, load_col2 = st.sidebar.columns(2)
+ttfc = pipeline.time_to_first_content
+load_col1.metric("First content", f"{ttfc * 1000:,.0f} ms" if ttfc is not None else "–")
+load_col2.metric("Fully loaded", f"{pipeline.load_time * 1000:,.0f} ms")
+
+if show_payload_stats:
+    cache_stats = figures.stats()
+    st.sidebar.caption(
+        f"Figure cache: {cache_stats['hits']} hits · {cache_stats['misses']} misses · "
+        f"{cache_stats['bytes'] / 1024 ** 2:.1f} MB"
+    )
+
 # Footer
 st.markdown("---")
 st.markdown("""
@@ -373,3 +465,21 @@ st.markdown("""
     <p>Last updated: {}</p>
 </div>
 """.format(datetime.now().strftime("%Y-%m-%d %H:%M:%S")), unsafe_allow_html=True)
+
+# Write this rerun's timings; FINAGENT_INSTRUMENT=panel also shows them on the page
+timings = run.finish()
+if timings and debug_panel_enabled():
+    with st.expander("⏱️ Rerun timings"):
+        rss_delta = timings['peak_rss_delta']
+        st.caption(
+            f"Rerun: {timings['seconds'] * 1000:,.0f} ms"
+            + (f" · peak RSS +{rss_delta / 1024 ** 2:,.1f} MB" if rss_delta is not None else "")
+        )
+        st.dataframe(run.frame(), hide_index=True, use_container_width=True)
+        # Upstream fetches of every session in this process since it started
+        fetches = get_scheduler().stats()
+        st.caption(
+            f"Upstream fetches: {fetches['requests']:,} requested · {fetches['coalesced']:,} coalesced "
+            f"({fetches['coalescing_ratio']:.0%}) · {fetches['retries']:,} retries · "
+            f"{fetches['queue_wait_seconds']:,.2f}s queued"
+        )
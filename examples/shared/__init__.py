@@ -0,0 +1,5 @@
+"""Shared data and compute helpers for the example dashboards.
+
+The dashboards live in sibling directories and put ``examples/`` on
+``sys.path`` before importing from here.
+"""
@@ -0,0 +1,220 @@
+"""Vectorized market analytics over a date-by-ticker matrix.
+
+The closes of a ``PricePanel`` are one NumPy matrix; returns, rolling
+volatility, the correlation matrix and the 1-day change ranking are
+computed for every ticker at the same time instead of per-ticker pandas
+calls. Missing bars (e.g. different exchange calendars) stay NaN and are
+skipped the same way per-ticker ``pct_change``/``corr`` would skip them.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from .panel import PricePanel
+from .sentiment import NEGATIVE_THRESHOLD, POSITIVE_THRESHOLD
+
+TRADING_DAYS = 252
+
+
+@dataclass
+class MarketAnalytics:
+    """Aligned matrices (rows are ``dates``, columns are ``tickers``) and derived stats.
+
+    ``volatility`` and ``correlation`` are ``None`` when ``compute_analytics``
+    was asked to skip them.
+    """
+
+    dates: pd.DatetimeIndex
+    tickers: list[str]
+    closes: np.ndarray
+    volumes: np.ndarray
+    returns: np.ndarray
+    volatility: np.ndarray | None
+    correlation: np.ndarray | None
+    current: np.ndarray
+    previous: np.ndarray
+    change: np.ndarray
+    change_pct: np.ndarray
+
+    def frame(self, name: str) -> pd.DataFrame:
+        """One of the date-by-ticker matrices as a DataFrame."""
+        return pd.DataFrame(getattr(self, name), index=self.dates, columns=self.tickers)
+
+    def correlation_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.correlation, index=self.tickers, columns=self.tickers)
+
+    def ranking(self) -> list[tuple[str, float]]:
+        """Tickers with a valid 1-day change, best first."""
+        valid = np.flatnonzero(np.isfinite(self.change_pct))
+        order = valid[np.argsort(-self.change_pct[valid], kind="stable")]
+        return [(self.tickers[i], float(self.change_pct[i])) for i in order]
+
+
+def compute_analytics(
+    prices: PricePanel | dict[str, pd.DataFrame], window: int = 30, risk: bool = True
+) -> MarketAnalytics:
+    """Compute all dashboard analytics for a panel (or per-ticker histories) in vectorized passes.
+
+    With ``risk=False`` the rolling volatility and the N×N correlation matrix,
+    the only quadratic part, are skipped for callers that get them elsewhere.
+    """
+    panel = prices if isinstance(prices, PricePanel) else PricePanel.from_histories(prices)
+    closes = panel.block("Close")
+    valid = np.isfinite(closes)
+
+    filled = _ffill(closes)
+    returns = np.full_like(closes, np.nan)
+    # Return against the previous *valid* close, like pct_change on each ticker alone
+    returns[1:] = closes[1:] / filled[:-1] - 1
+    returns[~valid] = np.nan
+
+    current, previous = _last_two(closes, filled, valid)
+    change = current - previous
+    with np.errstate(divide="ignore", invalid="ignore"):
+        change_pct = np.where(previous != 0, change / previous * 100, np.nan)
+
+    return MarketAnalytics(
+        dates=panel.dates,
+        tickers=list(panel.tickers),
+        closes=closes,
+        volumes=panel.block("Volume"),
+        returns=returns,
+        volatility=rolling_std(returns, window) * np.sqrt(TRADING_DAYS) if risk else None,
+        correlation=pairwise_corr(returns) if risk else None,
+        current=current,
+        previous=previous,
+        change=change,
+        change_pct=change_pct,
+    )
+
+
+@dataclass
+class EventStudy:
+    """Mean cumulative return (%) of the tickers around days of clearly positive or negative news."""
+
+    offsets: np.ndarray
+    returns: dict[str, np.ndarray]
+    events: dict[str, int]
+
+    def frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.returns, index=pd.Index(self.offsets, name="offset"))
+
+
+def align_sentiment(analytics: MarketAnalytics, daily: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+    """Mean news score and article count per trading day, aligned with ``analytics.returns``.
+
+    ``daily`` has ``ticker``, ``time`` (UTC), ``articles`` and ``score``
+    columns, as ``ArticleStore.sentiment`` returns them. News of a day
+    without a bar (weekends, holidays) counts towards the next bar; tickers
+    and days outside the analytics are dropped. Days without news are NaN.
+    """
+    counts = np.zeros(analytics.closes.shape)
+    sums = np.zeros(analytics.closes.shape)
+    columns = {ticker: j for j, ticker in enumerate(analytics.tickers)}
+    daily = daily[daily["ticker"].isin(columns)]
+    if len(daily) and len(analytics.dates):
+        dates = analytics.dates.tz_localize(None) if analytics.dates.tz is not None else analytics.dates
+        days = pd.DatetimeIndex(daily["time"].dt.tz_convert(None)).normalize()
+        rows = dates.normalize().searchsorted(days)
+        keep = (rows < len(dates)) & (days >= dates[0].normalize())
+        cols = daily["ticker"].map(columns).to_numpy()
+        articles = daily["articles"].to_numpy(dtype=np.float64)
+        np.add.at(counts, (rows[keep], cols[keep]), articles[keep])
+        np.add.at(sums, (rows[keep], cols[keep]), (articles * daily["score"].to_numpy(dtype=np.float64))[keep])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scores = np.where(counts > 0, sums / counts, np.nan)
+    return scores, counts
+
+
+def event_study(analytics: MarketAnalytics, daily: pd.DataFrame, window: int = 5) -> EventStudy:
+    """Cumulative returns from ``window`` bars before to ``window`` bars after each news day.
+
+    A news day is a (ticker, trading day) whose mean score passes the
+    sentiment label thresholds. All windows are gathered from the returns
+    matrix in one indexing step; bars outside the history count as no return.
+    """
+    scores, _ = align_sentiment(analytics, daily)
+    offsets = np.arange(-window, window + 1)
+    padded = np.pad(analytics.returns, ((window, window), (0, 0)), constant_values=np.nan)
+    returns, events = {}, {}
+    for label, hits in (("Positive", scores > POSITIVE_THRESHOLD), ("Negative", scores < NEGATIVE_THRESHOLD)):
+        rows, cols = np.nonzero(hits)
+        windows = padded[rows[:, None] + window + offsets, cols[:, None]]
+        returns[label] = (
+            np.nancumsum(windows, axis=1).mean(axis=0) * 100 if len(rows) else np.full(len(offsets), np.nan)
+        )
+        events[label] = len(rows)
+    return EventStudy(offsets, returns, events)
+
+
+def rolling_std(values: np.ndarray, window: int) -> np.ndarray:
+    """Sample std over each column's trailing ``window`` valid observations.
+
+    Valid values are first moved to the top of their column, so a window spans
+    observations rather than calendar rows, as ``rolling`` on each ticker's
+    own series would; results are scattered back to their original rows.
+    """
+    out = np.full(values.shape, np.nan)
+    if len(values) < window:
+        return out
+    valid = np.isfinite(values)
+    order = np.argsort(~valid, axis=0, kind="stable")
+    compact = np.take_along_axis(values, order, axis=0)
+    compact_valid = np.take_along_axis(valid, order, axis=0)
+    # Centre each column first so the cumulative sums do not lose precision
+    centred = np.where(compact_valid, compact - np.nanmean(compact, axis=0, keepdims=True), 0.0)
+    zeros = np.zeros((1, values.shape[1]))
+    s1 = np.concatenate([zeros, np.cumsum(centred, axis=0)])
+    s2 = np.concatenate([zeros, np.cumsum(centred**2, axis=0)])
+    w1 = s1[window:] - s1[:-window]
+    w2 = s2[window:] - s2[:-window]
+    var = (w2 - w1**2 / window) / (window - 1)
+    std = np.full(values.shape, np.nan)
+    std[window - 1 :] = np.sqrt(np.maximum(var, 0))
+    std[~compact_valid] = np.nan
+    np.put_along_axis(out, order, std, axis=0)
+    return out
+
+
+def pairwise_corr(values: np.ndarray) -> np.ndarray:
+    """Pearson correlation of every column pair over rows where both are valid."""
+    mask = np.isfinite(values).astype(np.float64)
+    centred = np.where(mask > 0, values - np.nanmean(values, axis=0, keepdims=True), 0.0)
+    n = mask.T @ mask
+    sx = centred.T @ mask  # sum of x_i over rows where x_j is also valid
+    sxx = (centred**2).T @ mask
+    sxy = centred.T @ centred
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = sxy - sx * sx.T / n
+        var_x = sxx - sx**2 / n
+        corr = cov / np.sqrt(var_x * var_x.T)
+    corr[n < 2] = np.nan
+    return np.clip(corr, -1.0, 1.0)
+
+
+def _ffill(values: np.ndarray) -> np.ndarray:
+    valid = np.isfinite(values)
+    rows = np.where(valid, np.arange(len(values))[:, None], 0)
+    np.maximum.accumulate(rows, axis=0, out=rows)
+    filled = np.take_along_axis(values, rows, axis=0)
+    # Leading NaNs stay NaN: the row-0 value they point to is NaN itself
+    return filled
+
+
+def _last_two(
+    closes: np.ndarray, filled: np.ndarray, valid: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Last and second-to-last valid close of every column (0 when absent)."""
+    if closes.size == 0:
+        empty = np.zeros(closes.shape[1])
+        return empty, empty.copy()
+    cols = np.arange(closes.shape[1])
+    last_row = len(closes) - 1 - np.argmax(valid[::-1], axis=0)
+    current = np.where(valid.any(axis=0), closes[last_row, cols], 0.0)
+    prev_row = np.maximum(last_row - 1, 0)
+    previous = np.where(last_row > 0, filled[prev_row, cols], 0.0)
+    return current, np.nan_to_num(previous)
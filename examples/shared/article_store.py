@@ -0,0 +1,254 @@
+"""Append-only store of every news article the dashboards have seen.
+
+Feeds only carry their latest few dozen entries, so each refresh used to
+forget everything older. ``ArticleStore`` keeps them in one SQLite file
+below the cache directory:
+
+- ``articles``: one row per article, deduplicated by link and by a hash of
+  its title and summary, so a story syndicated by several feeds is stored
+  (and scored) once. Only articles not stored yet are scored.
+- ``mentions``: the tickers each article mentions, from an entity linker.
+- ``sentiment``: article count and score sum per ticker and hour or day,
+  updated in the same transaction as the insert. ``ALL_NEWS`` holds the
+  totals over every article, mentioning a ticker or not.
+
+Sentiment series are read from the aggregates, so a year of history is a
+few hundred indexed rows per ticker whatever the number of articles.
+Published times are stored as UTC epoch seconds; articles without a
+parseable date are filed at the time they were first seen.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Iterable
+
+import numpy as np
+import pandas as pd
+
+from .paths import cache_dir
+from .sentiment import article_text, content_key
+
+# Ticker under which the sentiment of all articles is aggregated
+ALL_NEWS = "*"
+# Aggregation buckets, in seconds
+FREQUENCIES = {"H": 3600, "D": 86400}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    link TEXT UNIQUE,
+    key TEXT NOT NULL UNIQUE,
+    source TEXT,
+    title TEXT,
+    summary TEXT,
+    published INTEGER NOT NULL,
+    score REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS articles_published ON articles (published);
+CREATE TABLE IF NOT EXISTS mentions (
+    ticker TEXT NOT NULL,
+    published INTEGER NOT NULL,
+    article INTEGER NOT NULL,
+    PRIMARY KEY (ticker, published, article)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS sentiment (
+    freq TEXT NOT NULL,
+    ticker TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    articles INTEGER NOT NULL,
+    score_sum REAL NOT NULL,
+    PRIMARY KEY (freq, ticker, bucket)
+) WITHOUT ROWID;
+"""
+
+_UPSERT = """
+INSERT INTO sentiment VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (freq, ticker, bucket) DO UPDATE SET
+    articles = articles + excluded.articles,
+    score_sum = score_sum + excluded.score_sum
+"""
+
+
+class ArticleStore:
+    """SQLite article history with incrementally maintained sentiment aggregates."""
+
+    def __init__(self, path: str | os.PathLike | None = None):
+        self.path = Path(path) if path else cache_dir("news") / "articles.sqlite"
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        # Readers in other processes (the other dashboards) do not block the writer
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+    def add(
+        self,
+        articles: pd.DataFrame,
+        score: Callable[[list[str]], np.ndarray],
+        link: Callable[[list[str]], list[set[str]]] | None = None,
+        now: float | None = None,
+    ) -> int:
+        """Store the articles not seen before and return how many there were.
+
+        ``score`` (e.g. ``SentimentEngine.score``) and ``link`` (e.g.
+        ``EntityLinker.link``) are only called with the new articles' texts.
+        """
+        if articles.empty:
+            return 0
+        now = time.time() if now is None else now
+        texts = article_text(articles["title"], articles["summary"])
+        links = articles["link"].fillna("").astype(str).str.strip()
+        batch = pd.DataFrame({
+            "link": links.where(links != "", None),
+            "key": [content_key(text) for text in texts],
+            "source": articles["source"].astype(str),
+            "title": articles["title"].astype(str),
+            "summary": articles["summary"].astype(str),
+            "published": _epoch_seconds(articles["published"], now),
+            "text": texts,
+        })
+        # Duplicates within the batch, by content and then by link
+        batch = batch.drop_duplicates("key")
+        batch = batch[batch["link"].isna() | ~batch["link"].duplicated()]
+
+        with self._lock:
+            known_keys = self._existing("key", batch["key"].tolist())
+            known_links = self._existing("link", batch["link"].dropna().tolist())
+            new = batch[~batch["key"].isin(known_keys) & ~batch["link"].isin(known_links)]
+            if new.empty:
+                return 0
+            new = new.assign(score=np.asarray(score(new["text"].tolist()), dtype=np.float64))
+            mentions = link(new["text"].tolist()) if link is not None else [set()] * len(new)
+
+            with self._db:
+                inserted = []
+                for row, symbols in zip(new.itertuples(index=False), mentions):
+                    # Another process may have stored it since the lookup; then it is not counted again
+                    stored = self._db.execute(
+                        "INSERT OR IGNORE INTO articles (link, key, source, title, summary, published, score) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?) RETURNING id",
+                        (row.link, row.key, row.source, row.title, row.summary, row.published, row.score),
+                    ).fetchone()
+                    if stored is not None:
+                        inserted.append((stored[0], row.published, row.score, symbols))
+                self._db.executemany(
+                    "INSERT OR IGNORE INTO mentions VALUES (?, ?, ?)",
+                    [(ticker, published, id_) for id_, published, _, symbols in inserted for ticker in symbols],
+                )
+                self._db.executemany(_UPSERT, _aggregate(inserted))
+        return len(inserted)
+
+    def sentiment(
+        self,
+        freq: str = "D",
+        tickers: Iterable[str] = (ALL_NEWS,),
+        start: pd.Timestamp | None = None,
+        end: pd.Timestamp | None = None,
+    ) -> pd.DataFrame:
+        """``ticker``, ``time`` (UTC bucket start), ``articles`` and mean ``score`` per bucket with news."""
+        size = FREQUENCIES[freq]
+        tickers = list(dict.fromkeys(tickers))
+        lower = _bound(start, 0) // size * size
+        upper = _bound(end, 2**62)
+        placeholders = ",".join("?" * len(tickers))
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT ticker, bucket, articles, score_sum FROM sentiment "
+                f"WHERE freq = ? AND ticker IN ({placeholders}) AND bucket BETWEEN ? AND ? "
+                "ORDER BY ticker, bucket",
+                [freq, *tickers, lower, upper],
+            ).fetchall()
+        frame = pd.DataFrame(rows, columns=["ticker", "bucket", "articles", "score_sum"])
+        return pd.DataFrame({
+            "ticker": frame["ticker"].astype(str),
+            "time": pd.to_datetime(frame["bucket"].astype(np.int64), unit="s", utc=True),
+            "articles": frame["articles"].astype(np.int64),
+            "score": (frame["score_sum"] / frame["articles"]).astype(np.float64),
+        })
+
+    def articles(
+        self,
+        ticker: str | None = None,
+        start: pd.Timestamp | None = None,
+        end: pd.Timestamp | None = None,
+        limit: int = 100,
+    ) -> pd.DataFrame:
+        """The latest stored articles, optionally only those mentioning ``ticker``, newest first."""
+        columns = "a.source, a.title, a.link, a.published, a.summary, a.score"
+        bounds = [_bound(start, 0), _bound(end, 2**62)]
+        if ticker is None:
+            query = f"SELECT {columns} FROM articles a WHERE a.published BETWEEN ? AND ?"
+        else:
+            query = (
+                f"SELECT {columns} FROM mentions m JOIN articles a ON a.id = m.article "
+                "WHERE m.ticker = ? AND m.published BETWEEN ? AND ?"
+            )
+            bounds.insert(0, ticker)
+        with self._lock:
+            rows = self._db.execute(f"{query} ORDER BY a.published DESC LIMIT ?", [*bounds, limit]).fetchall()
+        frame = pd.DataFrame(rows, columns=["source", "title", "link", "published", "summary", "score"])
+        frame["published"] = pd.to_datetime(frame["published"].astype(np.int64), unit="s", utc=True)
+        return frame
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def _existing(self, column: str, values: list[str]) -> set[str]:
+        found = set()
+        # Stay well below SQLite's bound-parameter limit
+        for i in range(0, len(values), 500):
+            chunk = values[i : i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            found.update(
+                value for (value,) in self._db.execute(
+                    f"SELECT {column} FROM articles WHERE {column} IN ({placeholders})", chunk
+                )
+            )
+        return found
+
+
+def _epoch_seconds(published: pd.Series, now: float) -> np.ndarray:
+    """RSS dates (RFC 822, ISO 8601, ...) as UTC epoch seconds; ``now`` where unparseable."""
+    parsed = pd.to_datetime(published, utc=True, errors="coerce", format="mixed")
+    seconds = (parsed - pd.Timestamp(0, tz="UTC")).dt.total_seconds()
+    return np.floor(seconds.fillna(now).to_numpy(dtype=np.float64)).astype(np.int64)
+
+
+def _aggregate(inserted: list[tuple[int, int, float, set[str]]]) -> list[tuple]:
+    """``sentiment`` upsert rows for the articles just inserted: one per frequency, ticker and bucket."""
+    if not inserted:
+        return []
+    rows = [(ALL_NEWS, published, score) for _, published, score, _ in inserted]
+    rows += [(ticker, published, score) for _, published, score, symbols in inserted for ticker in symbols]
+    frame = pd.DataFrame(rows, columns=["ticker", "published", "score"])
+    upserts = []
+    for freq, size in FREQUENCIES.items():
+        grouped = (
+            frame.assign(bucket=frame["published"] // size * size)
+            .groupby(["ticker", "bucket"])["score"]
+            .agg(["count", "sum"])
+        )
+        upserts += [
+            (freq, ticker, int(bucket), int(count), float(total))
+            for (ticker, bucket), count, total in zip(grouped.index, grouped["count"], grouped["sum"])
+        ]
+    return upserts
+
+
+def _bound(value, default: int) -> int:
+    """A timestamp bound as UTC epoch seconds; naive timestamps are taken as UTC."""
+    if value is None:
+        return default
+    stamp = pd.Timestamp(value)
+    if stamp.tzinfo is None:
+        stamp = stamp.tz_localize("UTC")
+    return int(stamp.timestamp())
@@ -0,0 +1,218 @@
+"""Persistent, incremental OHLCV store.
+
+Each ticker lives in its own Parquet file holding the longest history ever
+fetched for it. A period selection is a local slice of that file; once the
+TTL has expired only the bars after the last stored date are fetched and
+appended. Store metadata (span and refresh time) is kept in the Parquet
+schema metadata so every file is self-describing.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .instrumentation import HIT, MISS, annotate
+from .paths import cache_dir
+from .prices import (
+    DEFAULT_MAX_WORKERS,
+    PERIOD_BARS,
+    PriceLoadResult,
+    PriceSource,
+    get_price_source,
+    load_prices,
+)
+
+META_KEY = b"finagent"
+
+
+class BarStore:
+    """Per-ticker Parquet bar files in front of a ``PriceSource``."""
+
+    def __init__(
+        self,
+        root: str | os.PathLike | None = None,
+        source: PriceSource | None = None,
+        ttl: float = 300,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        max_cached: int = 256,
+    ):
+        self.root = Path(root) if root else cache_dir("bars")
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.source = source if source is not None else get_price_source()
+        self.ttl = ttl
+        self.max_workers = max_workers
+        self.max_cached = max(1, max_cached)
+        self._lock = threading.Lock()
+        # Both least recently used first, at most ``max_cached`` entries each
+        # ticker -> (file mtime, history, metadata); avoids re-reading unchanged files
+        self._memo: OrderedDict[str, tuple[int, pd.DataFrame, dict]] = OrderedDict()
+        # (ticker, period, anchor day) -> (file mtime, slice); a list request is assembled
+        # from these, and a new day starts new slices
+        self._slices: OrderedDict[tuple[str, str, pd.Timestamp], tuple[int, pd.DataFrame]] = OrderedDict()
+
+    def get(self, tickers: list[str], period: str) -> PriceLoadResult:
+        """Return ``period`` of history for each ticker, fetching only what is missing.
+
+        Fresh tickers are served from per-(ticker, period) slices; only the
+        missing and stale ones are fetched, concurrently, so adding a symbol
+        to a watchlist costs one fetch regardless of the list length.
+        """
+        started = time.perf_counter()
+        tickers = list(dict.fromkeys(tickers))
+        result = PriceLoadResult()
+        self._refresh(tickers, period, result)
+        with self._lock:
+            for ticker in tickers:
+                hist = self._slice(ticker, period)
+                if hist is not None:
+                    result.histories[ticker] = hist
+                    result.errors.pop(ticker, None)
+        result.elapsed = time.perf_counter() - started
+        return result
+
+    def refreshed_at(self, ticker: str) -> float | None:
+        """When ``ticker``'s bars were last fetched, as a Unix time; None if never."""
+        with self._lock:
+            _, meta = self._read(ticker)
+        return meta.get("refreshed_at")
+
+    def _refresh(self, tickers: list[str], period: str, result: PriceLoadResult) -> None:
+        wanted = PERIOD_BARS.get(period, PERIOD_BARS["10y"])
+        now = time.time()
+        missing, stale = [], {}
+        with self._lock:
+            for ticker in tickers:
+                hist, meta = self._read(ticker)
+                if hist is None or hist.empty or meta.get("span_bars", 0) < wanted:
+                    missing.append(ticker)
+                elif now - meta.get("refreshed_at", 0) > self.ttl:
+                    stale[ticker] = hist.index[-1]
+
+        annotate(MISS if missing or stale else HIT)
+
+        # Fetch without holding the lock, so sessions asking for other,
+        # already cached tickers are not blocked by the network
+        if missing:
+            loaded = load_prices(missing, period, source=self.source, max_workers=self.max_workers)
+            with self._lock:
+                for ticker, hist in loaded.histories.items():
+                    self._write(ticker, _merge(self._read(ticker)[0], hist), span_bars=wanted)
+            result.errors.update(loaded.errors)
+
+        if stale:
+            # One batched request from the oldest last bar; overlapping bars are
+            # replaced, so the last (possibly intraday) bar gets updated too
+            start = min(stale.values()).strftime("%Y-%m-%d")
+            loaded = load_prices(
+                list(stale), period, source=self.source, max_workers=self.max_workers, start=start
+            )
+            with self._lock:
+                for ticker, tail in loaded.histories.items():
+                    hist, meta = self._read(ticker)
+                    self._write(ticker, _merge(hist, tail), span_bars=meta.get("span_bars", wanted))
+            # Tickers whose refresh failed keep serving their stored bars and
+            # are retried on the next call
+
+    def _slice(self, ticker: str, period: str) -> pd.DataFrame | None:
+        hist, _ = self._read(ticker)
+        if hist is None or hist.empty:
+            return None
+        mtime = self._memo[ticker][0]
+        anchor = _anchor(hist)
+        key = (ticker, period, anchor)
+        cached = self._slices.get(key)
+        if cached and cached[0] == mtime:
+            self._slices.move_to_end(key)
+            return cached[1]
+        sliced = slice_period(hist, period, anchor)
+        _remember(self._slices, key, (mtime, sliced), self.max_cached)
+        return sliced
+
+    def _path(self, ticker: str) -> Path:
+        return self.root / f"{ticker.replace('/', '_')}.parquet"
+
+    def _read(self, ticker: str) -> tuple[pd.DataFrame | None, dict]:
+        path = self._path(ticker)
+        try:
+            mtime = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None, {}
+        memo = self._memo.get(ticker)
+        if memo and memo[0] == mtime:
+            self._memo.move_to_end(ticker)
+            return memo[1], memo[2]
+        table = pq.read_table(path)
+        meta = json.loads((table.schema.metadata or {}).get(META_KEY, b"{}"))
+        hist = table.to_pandas()
+        _remember(self._memo, ticker, (mtime, hist, meta), self.max_cached)
+        return hist, meta
+
+    def _write(self, ticker: str, hist: pd.DataFrame, span_bars: int) -> None:
+        _, old_meta = self._read(ticker)
+        meta = {
+            "span_bars": max(span_bars, old_meta.get("span_bars", 0)),
+            "refreshed_at": time.time(),
+        }
+        table = pa.Table.from_pandas(hist)
+        table = table.replace_schema_metadata(
+            {**(table.schema.metadata or {}), META_KEY: json.dumps(meta).encode()}
+        )
+        path = self._path(ticker)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        pq.write_table(table, tmp)
+        os.replace(tmp, path)
+        _remember(self._memo, ticker, (path.stat().st_mtime_ns, hist, meta), self.max_cached)
+
+
+def slice_period(hist: pd.DataFrame, period: str, anchor: pd.Timestamp | None = None) -> pd.DataFrame:
+    """Cut a yfinance-style period (``5d``, ``6mo``, ``2y``) off the end of ``hist``.
+
+    Calendar periods end at ``anchor``, today in the index's time zone by default.
+    """
+    if period.endswith("d") and period[:-1].isdigit():
+        return hist.tail(int(period[:-1]))
+    if period.endswith("mo") and period[:-2].isdigit():
+        offset = pd.DateOffset(months=int(period[:-2]))
+    elif period.endswith("y") and period[:-1].isdigit():
+        offset = pd.DateOffset(years=int(period[:-1]))
+    else:
+        return hist
+    anchor = _anchor(hist) if anchor is None else anchor
+    if hist.index.is_monotonic_increasing:
+        # A positional slice shares the stored history's memory instead of copying it
+        return hist.iloc[hist.index.searchsorted(anchor - offset) :]
+    return hist[hist.index >= anchor - offset]
+
+
+def _anchor(hist: pd.DataFrame) -> pd.Timestamp:
+    return pd.Timestamp.now(tz=getattr(hist.index, "tz", None)).normalize()
+
+
+def _remember(cache: OrderedDict, key, value, limit: int) -> None:
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > limit:
+        cache.popitem(last=False)
+
+
+def _merge(hist: pd.DataFrame | None, tail: pd.DataFrame) -> pd.DataFrame:
+    if hist is None or hist.empty:
+        return tail
+    # Sources may disagree on time zones (stores filled before the daemon sent
+    # them hold naive bars); the stored file's convention wins
+    tz = hist.index.tz
+    if tz is None and tail.index.tz is not None:
+        tail = tail.tz_localize(None)
+    elif tz is not None:
+        tail = tail.tz_convert(tz) if tail.index.tz is not None else tail.tz_localize(tz)
+    merged = pd.concat([hist, tail])
+    return merged[~merged.index.duplicated(keep="last")].sort_index()
@@ -0,0 +1,258 @@
+"""Vectorized fixed-income analytics for every bond position of a book.
+
+``bond_analytics`` takes the positions table (the ``POSITIONS`` schema, whose
+optional ``Coupon`` and ``Maturity`` columns carry the bond terms) and solves
+each bond's yield to maturity from its clean price, then derives Macaulay
+and modified duration, convexity and DV01 from the same cash flows.
+
+Cash flows are laid out as a (bonds x coupon periods) matrix, so the Newton
+iterations and the risk measures are a few array expressions over all bonds
+at once. Bonds are ordered by their number of remaining coupons and cut into
+chunks of bounded size, so a long bond pads only the chunk it lands in and
+memory stays flat however many bonds the book holds.
+
+Conventions: prices are quoted per 100 of face value and ``Quantity`` is the
+face amount; coupons are paid ``frequency`` times a year on a regular
+schedule ending at maturity; time is measured in years of 365.25 days;
+yields are bond-equivalent (compounded ``frequency`` times a year).
+
+``treasury_curve`` builds the yield curve from the 5Y and 10Y Treasury
+indicators (``^FVX`` and ``^TNX``) the dashboard already fetches. Curves are
+cached by their input values, so reruns between indicator refreshes reuse
+the same object. The curve gives each bond its spread over Treasuries, and
+``rate_shocks`` revalues the whole book under parallel and twisting shifts
+of it.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+FREQUENCY = 2
+DAYS_PER_YEAR = 365.25
+# Upper bound on the cells of one cash-flow matrix chunk (8 bytes each)
+MAX_CELLS = 1 << 21
+TOLERANCE = 1e-10
+MAX_ITERATIONS = 50
+
+# Indicator name -> tenor in years of the curve point it provides
+CURVE_POINTS = {"5Y_Treasury": 5.0, "10Y_Treasury": 10.0}
+
+# Scenario -> (5Y shift, 10Y shift) in basis points; shifts are interpolated along the curve
+DEFAULT_SHOCKS = {
+    "Parallel -100bp": (-100, -100),
+    "Parallel -50bp": (-50, -50),
+    "Parallel +50bp": (50, 50),
+    "Parallel +100bp": (100, 100),
+    "Parallel +200bp": (200, 200),
+    "Steepener (5Y -25bp, 10Y +25bp)": (-25, 25),
+    "Flattener (5Y +25bp, 10Y -25bp)": (25, -25),
+}
+
+
+@dataclass(frozen=True)
+class YieldCurve:
+    """Par yields in percent at a few tenors, linear in between and flat outside."""
+
+    tenors: tuple[float, ...]
+    yields: tuple[float, ...]
+
+    def yield_at(self, years) -> np.ndarray:
+        return np.interp(np.asarray(years, dtype=np.float64), self.tenors, self.yields)
+
+    def shift(self, years, shifts_bp: tuple[float, ...]) -> np.ndarray:
+        """Yield change in percent at ``years`` for a shift of ``shifts_bp`` at the curve's tenors."""
+        return np.interp(np.asarray(years, dtype=np.float64), self.tenors, shifts_bp) / 100
+
+
+@lru_cache(maxsize=64)
+def _curve(points: tuple[tuple[float, float], ...]) -> YieldCurve:
+    points = tuple(sorted(points))
+    return YieldCurve(tuple(t for t, _ in points), tuple(y for _, y in points))
+
+
+def treasury_curve(indicators) -> YieldCurve:
+    """The curve through the current 5Y and 10Y Treasury yields of an ``IndicatorSnapshot``."""
+    return _curve(tuple((tenor, float(indicators[name].current)) for name, tenor in CURVE_POINTS.items()))
+
+
+def bond_analytics(
+    positions: pd.DataFrame,
+    curve: YieldCurve | None = None,
+    settlement: pd.Timestamp | None = None,
+    frequency: int = FREQUENCY,
+) -> pd.DataFrame:
+    """Per-position bond measures, aligned with ``positions`` (NaN where not a bond):
+
+    - ``years``: time to maturity
+    - ``yield_pct``: yield to maturity from the clean ``Close_Price``
+    - ``curve_yield_pct`` / ``spread_bp``: the curve's yield at the same maturity
+      and the bond's spread over it (only with ``curve``)
+    - ``macaulay_duration`` and ``modified_duration`` in years, ``convexity``
+    - ``dirty_value``: face times the price including accrued interest
+    - ``dv01``: value change of the position for a 1bp fall in its yield
+    """
+    settlement = pd.Timestamp.today().normalize() if settlement is None else pd.Timestamp(settlement)
+    coupon = positions["Coupon"].to_numpy(dtype=np.float64, na_value=np.nan)
+    years = ((positions["Maturity"] - settlement).dt.days / DAYS_PER_YEAR).to_numpy(dtype=np.float64, na_value=np.nan)
+    price = positions["Close_Price"].to_numpy(dtype=np.float64, na_value=np.nan)
+    bond = np.isfinite(coupon) & (years > 0) & (price > 0)
+
+    n = len(positions)
+    out = {
+        name: np.full(n, np.nan)
+        for name in ("years", "yield_pct", "macaulay_duration", "modified_duration", "convexity", "dirty_price")
+    }
+    rows = np.flatnonzero(bond)
+    if len(rows):
+        measures = _solve(coupon[rows] / 100, years[rows], price[rows], frequency)
+        out["years"][rows] = years[rows]
+        for name, values in measures.items():
+            out[name][rows] = values
+
+    face = positions["Quantity"].to_numpy(dtype=np.float64, na_value=np.nan)
+    out["dirty_value"] = face * out.pop("dirty_price") / 100
+    out["dv01"] = out["modified_duration"] * out["dirty_value"] * 1e-4
+    if curve is not None:
+        out["curve_yield_pct"] = np.where(bond, curve.yield_at(years), np.nan)
+        out["spread_bp"] = (out["yield_pct"] - out["curve_yield_pct"]) * 100
+    return pd.DataFrame(out, index=positions.index)
+
+
+def book_duration(analytics: pd.DataFrame) -> pd.Series:
+    """Value-weighted duration, convexity and yield of the bonds in ``analytics``, and their DV01."""
+    bonds = analytics.dropna(subset=["dv01"])
+    value = bonds["dirty_value"].sum()
+
+    def weighted(column):
+        return float((bonds[column] * bonds["dirty_value"]).sum() / value) if value else np.nan
+
+    return pd.Series(
+        {
+            "bonds": len(bonds),
+            "dirty_value": value,
+            "dv01": bonds["dv01"].sum(),
+            "yield_pct": weighted("yield_pct"),
+            "macaulay_duration": weighted("macaulay_duration"),
+            "modified_duration": weighted("modified_duration"),
+            "convexity": weighted("convexity"),
+        }
+    )
+
+
+def rate_shocks(
+    positions: pd.DataFrame,
+    analytics: pd.DataFrame,
+    curve: YieldCurve,
+    shocks: dict[str, tuple[float, ...]] | None = None,
+    frequency: int = FREQUENCY,
+) -> pd.DataFrame:
+    """Book P&L under each curve shift in ``shocks``, one row per scenario.
+
+    Every bond is fully revalued at its yield plus the shift interpolated at
+    its maturity (``pl``); ``pl_estimate`` is the duration and convexity
+    approximation of the same move.
+    """
+    shocks = DEFAULT_SHOCKS if shocks is None else shocks
+    bonds = analytics.dropna(subset=["dv01"])
+    coupon = positions["Coupon"].to_numpy(dtype=np.float64)[analytics.index.get_indexer(bonds.index)] / 100
+    years = bonds["years"].to_numpy()
+    yields = bonds["yield_pct"].to_numpy() / 100
+    value = bonds["dirty_value"].to_numpy()
+    duration = bonds["modified_duration"].to_numpy()
+    convexity = bonds["convexity"].to_numpy()
+    total = value.sum()
+
+    shifts = np.array([curve.shift(years, shifts_bp) / 100 for shifts_bp in shocks.values()])
+    prices = _price(coupon, years, yields + np.vstack([np.zeros(len(years)), shifts]), frequency)
+    records = []
+    for (scenario, shifts_bp), shift, repriced in zip(shocks.items(), shifts, prices[1:]):
+        pl = float((value * (repriced / prices[0] - 1)).sum())
+        estimate = float((value * (-duration * shift + 0.5 * convexity * shift ** 2)).sum())
+        records.append(
+            {
+                "scenario": scenario,
+                **{f"shift_{int(t)}y_bp": s for t, s in zip(curve.tenors, shifts_bp)},
+                "pl": pl,
+                "pl_pct": pl / total * 100 if total else np.nan,
+                "pl_estimate": estimate,
+            }
+        )
+    return pd.DataFrame(records)
+
+
+def _chunks(periods: np.ndarray):
+    """Row indices in chunks whose padded cash-flow matrix stays below ``MAX_CELLS``."""
+    order = np.argsort(periods, kind="stable")
+    widths = periods[order]
+    start = 0
+    while start < len(order):
+        end = min(len(order), start + max(1, MAX_CELLS // widths[start]))
+        # Sorted widths: the last row of the chunk is its widest
+        end = min(end, start + max(1, MAX_CELLS // widths[end - 1]))
+        yield order[start:end], int(widths[end - 1])
+        start = end
+
+
+def _schedule(coupon, years, frequency, width):
+    """Cash flows per 100 face and their times in coupon periods, padded to ``width``."""
+    periods_left = years * frequency
+    count = np.ceil(periods_left - 1e-9).astype(np.int64)
+    # Time to the next coupon, in periods: (0, 1]
+    first = periods_left - (count - 1)
+    k = np.arange(width)
+    times = first[:, None] + k
+    flows = np.where(k < count[:, None], coupon[:, None] * 100 / frequency, 0.0)
+    flows[np.arange(len(count)), count - 1] += 100
+    accrued = coupon * 100 / frequency * (1 - first)
+    return flows, times, accrued
+
+
+def _price(coupon, years, yields, frequency):
+    """Dirty prices per 100 face, one row per row of ``yields`` (scenarios x bonds)."""
+    prices = np.empty(yields.shape)
+    for rows, width in _chunks(np.ceil(years * frequency - 1e-9).astype(np.int64)):
+        flows, times, _ = _schedule(coupon[rows], years[rows], frequency, width)
+        for scenario, scenario_yields in enumerate(yields[:, rows]):
+            base = 1 + scenario_yields / frequency
+            prices[scenario, rows] = (flows * base[:, None] ** -times).sum(axis=1)
+    return prices
+
+
+def _solve(coupon, years, clean_price, frequency):
+    """Yield, durations, convexity and dirty price of each bond, by Newton's method on the yield."""
+    out = {
+        name: np.empty(len(coupon))
+        for name in ("yield_pct", "macaulay_duration", "modified_duration", "convexity", "dirty_price")
+    }
+    for rows, width in _chunks(np.ceil(years * frequency - 1e-9).astype(np.int64)):
+        c, t, price = coupon[rows], years[rows], clean_price[rows]
+        flows, times, accrued = _schedule(c, t, frequency, width)
+        target = price + accrued
+        # The usual yield approximation is within a few basis points for ordinary bonds
+        y = (c * 100 + (100 - price) / t) / ((100 + price) / 2)
+        for _ in range(MAX_ITERATIONS):
+            base = 1 + y / frequency
+            discounted = flows * base[:, None] ** -times
+            value = discounted.sum(axis=1)
+            slope = -(discounted * times).sum(axis=1) / (frequency * base)
+            step = (value - target) / slope
+            # Keep 1 + y / frequency positive
+            y = np.maximum(y - step, 0.5 * (y - frequency))
+            if np.nanmax(np.abs(step)) < TOLERANCE:
+                break
+
+        base = 1 + y / frequency
+        discounted = flows * base[:, None] ** -times
+        value = discounted.sum(axis=1)
+        macaulay = (discounted * times).sum(axis=1) / value / frequency
+        out["yield_pct"][rows] = y * 100
+        out["macaulay_duration"][rows] = macaulay
+        out["modified_duration"][rows] = macaulay / base
+        out["convexity"][rows] = (discounted * times * (times + 1)).sum(axis=1) / value / (frequency * base) ** 2
+        out["dirty_price"][rows] = value
+    return out
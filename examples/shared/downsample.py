@@ -0,0 +1,92 @@
+"""Server-side downsampling of chart series.
+
+Long series are reduced to a per-trace point budget before they are turned
+into Plotly JSON. Lines use Largest-Triangle-Three-Buckets (LTTB), which
+keeps the visual shape including peaks; bars keep the minimum and maximum
+of every bucket so spikes survive.
+"""
+
+from __future__ import annotations
+
+import time
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_MAX_POINTS = 1000
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Indices of the ``threshold`` points LTTB keeps (always first and last)."""
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    every = (n - 2) / (threshold - 2)
+    # edges[k] is the first index of bucket k; the last edge is the final point
+    edges = (np.arange(threshold - 1) * every).astype(np.int64) + 1
+    edges[-1] = n - 1
+    bounds = np.append(edges, n)
+    # Mean of every bucket, used as the third triangle vertex
+    counts = np.diff(bounds)
+    avg_x = np.add.reduceat(x, edges) / counts
+    avg_y = np.add.reduceat(y, edges) / counts
+
+    keep = np.empty(threshold, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        xs, ys = x[start:end], y[start:end]
+        area = np.abs((x[a] - avg_x[i + 1]) * (ys - y[a]) - (x[a] - xs) * (avg_y[i + 1] - y[a]))
+        a = start + int(np.argmax(area))
+        keep[i + 1] = a
+    return keep
+
+
+def minmax_indices(y: np.ndarray, buckets: int) -> np.ndarray:
+    """Indices of the minimum and maximum of each of ``buckets`` equal-width buckets."""
+    n = len(y)
+    if buckets <= 0 or 2 * buckets >= n:
+        return np.arange(n)
+    edges = np.linspace(0, n, buckets + 1).astype(np.int64)
+    bucket = np.repeat(np.arange(buckets), np.diff(edges))
+    # Sorted by bucket, then value: each bucket's first entry is its min, last its max
+    order = np.lexsort((y, bucket))
+    return np.unique(np.concatenate([order[edges[:-1]], order[edges[1:] - 1]]))
+
+
+def downsample(x, y, max_points: int | None = DEFAULT_MAX_POINTS, method: str = "lttb"):
+    """Reduce one trace to at most ``max_points`` points; ``None`` disables it.
+
+    NaN points are dropped first. Returns the kept ``x`` and ``y`` values.
+    """
+    x = x if isinstance(x, pd.Index) else pd.Index(x)
+    y = np.asarray(y, dtype=np.float64)
+    finite = np.flatnonzero(np.isfinite(y))
+    if max_points is None or len(finite) <= max_points:
+        return x, y
+
+    xs = _numeric(x)[finite]
+    ys = y[finite]
+    if method == "lttb":
+        kept = lttb_indices(xs, ys, max_points)
+    elif method == "minmax":
+        kept = minmax_indices(ys, max_points // 2)
+    else:
+        raise ValueError(f"unknown downsampling method: {method}")
+    positions = finite[kept]
+    return x[positions], y[positions]
+
+
+def figure_payload(fig) -> tuple[int, float]:
+    """Size in bytes and serialization time in seconds of a figure's JSON."""
+    started = time.perf_counter()
+    payload = fig.to_json()
+    return len(payload.encode("utf-8")), time.perf_counter() - started
+
+
+def _numeric(x: pd.Index) -> np.ndarray:
+    if isinstance(x, pd.DatetimeIndex):
+        return x.asi8.astype(np.float64)
+    return np.asarray(x, dtype=np.float64)
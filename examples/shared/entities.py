@@ -0,0 +1,183 @@
+"""Link news articles to the tickers they mention.
+
+``EntityLinker`` compiles every way an article can refer to a company into
+one Aho-Corasick automaton: the ticker symbol, its cashtag (``$AAPL``), the
+company name and the aliases of a local symbol table, e.g.
+
+    Symbol,Name,Aliases
+    GOOGL,Alphabet,Google|Alphabet Inc.
+
+``link`` joins a whole batch of article texts and walks the automaton over
+it once, so the cost is linear in the total text length plus the number of
+matches, however many symbols the table holds. Matching is case-sensitive
+and a match must start and end at a word boundary, so ``Apple`` does not
+match inside ``pineapple`` and ``META`` is not found in ``METAL``. Symbols
+shorter than three letters or that are also common words (``ALL``,
+``NOW``, ...) are only matched as cashtags and by name.
+
+``ticker_sentiment`` turns the links and the articles' sentiment scores
+into one row per ticker.
+"""
+
+from __future__ import annotations
+
+import bisect
+import os
+from collections import deque
+from typing import Iterable, Iterator
+
+import numpy as np
+import pandas as pd
+
+from .sentiment import article_text, label_scores
+
+# Shorter symbols (C, GE, PG, ...) are initials far more often than tickers
+MIN_BARE_LENGTH = 3
+# Ticker symbols that are too often ordinary words or acronyms to match without a "$"
+COMMON_WORDS = frozenset(
+    {"ALL", "ARE", "BIG", "CAN", "CAT", "CEO", "ETF", "FED", "FOR", "GDP", "HAS", "IPO", "KEY", "LOW",
+     "MAIN", "NEW", "NOW", "ONE", "OPEN", "OUT", "REAL", "RUN", "SEE", "TWO", "USA", "WELL"}
+)
+# Separates the articles of a batch in the scanned text; never part of a pattern
+_SEPARATOR = "\n"
+
+
+class PatternMatcher:
+    """Aho-Corasick automaton: finds every occurrence of many patterns in one pass over a text."""
+
+    def __init__(self, patterns: Iterable[tuple[str, object]]):
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        # node -> (pattern length, value) of every pattern ending there, suffixes included
+        self._out: list[list[tuple[int, object]]] = [[]]
+        self.patterns = 0
+        for pattern, value in patterns:
+            if pattern:
+                self._add(pattern, value)
+        self._link()
+
+    def _add(self, pattern: str, value) -> None:
+        node = 0
+        for ch in pattern:
+            child = self._goto[node].get(ch)
+            if child is None:
+                child = self._goto[node][ch] = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = child
+        self._out[node].append((len(pattern), value))
+        self.patterns += 1
+
+    def _link(self) -> None:
+        """Failure links in breadth-first order, so a node's fallback is linked before it."""
+        goto, fail, out = self._goto, self._fail, self._out
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in goto[node].items():
+                queue.append(child)
+                fallback = fail[node]
+                while fallback and ch not in goto[fallback]:
+                    fallback = fail[fallback]
+                target = goto[fallback].get(ch, 0)
+                fail[child] = target if target != child else 0
+                out[child] = out[child] + out[fail[child]]
+
+    def finditer(self, text: str) -> Iterator[tuple[int, int, object]]:
+        """``(start, end, value)`` of every occurrence, overlapping ones included, by end position."""
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                for length, value in out[node]:
+                    yield i + 1 - length, i + 1, value
+
+
+def load_symbol_table(path: str | os.PathLike) -> pd.DataFrame:
+    """``Symbol``, ``Name`` and ``Aliases`` (``|``-separated) columns of a symbol CSV."""
+    table = pd.read_csv(path, dtype=str, keep_default_na=False)
+    missing = {"Symbol", "Name"} - set(table.columns)
+    if missing:
+        raise ValueError(f"{path}: symbol table lacks {', '.join(sorted(missing))}")
+    if "Aliases" not in table:
+        table["Aliases"] = ""
+    return table[["Symbol", "Name", "Aliases"]]
+
+
+class EntityLinker:
+    """Maps article texts to the ticker symbols they mention.
+
+    Every symbol of ``symbols`` can be linked; ``tickers`` are the ones the
+    caller reports on, linked by symbol and cashtag even when the table
+    does not list them.
+    """
+
+    def __init__(self, symbols: pd.DataFrame | None = None, tickers: Iterable[str] = ()):
+        self.tickers = tuple(dict.fromkeys(ticker.strip().upper() for ticker in tickers))
+        names: dict[str, str] = {}
+        patterns = []
+        rows = symbols.itertuples(index=False) if symbols is not None else ()
+        for symbol, name, aliases in rows:
+            symbol = symbol.strip().upper()
+            if not symbol:
+                continue
+            names[symbol] = name
+            patterns += [(text.strip(), symbol) for text in (name, *aliases.split("|")) if text.strip()]
+        # Tickers the table does not know are still linked by their symbol
+        for ticker in self.tickers:
+            names.setdefault(ticker, "")
+        for symbol in names:
+            patterns.append((f"${symbol}", symbol))
+            if len(symbol) >= MIN_BARE_LENGTH and symbol not in COMMON_WORDS:
+                patterns.append((symbol, symbol))
+        self.names = names
+        self.matcher = PatternMatcher(dict.fromkeys(patterns))
+
+    def link(self, texts: Iterable[str]) -> list[set[str]]:
+        """The symbols each text mentions, from one scan over all of them."""
+        texts = [text.replace(_SEPARATOR, " ") for text in texts]
+        batch = _SEPARATOR.join(texts)
+        # Offset of the first character of every text in the batch
+        starts = np.cumsum([0] + [len(text) + 1 for text in texts[:-1]]).tolist()
+        linked: list[set[str]] = [set() for _ in texts]
+        for start, end, symbol in self.matcher.finditer(batch):
+            if _boundary(batch, start - 1) and _boundary(batch, end):
+                linked[bisect.bisect_right(starts, start) - 1].add(symbol)
+        return linked
+
+    def link_articles(self, articles: pd.DataFrame) -> pd.DataFrame:
+        """One ``article`` (index label) and ``ticker`` row per mention of a ticker in an article."""
+        texts = article_text(articles["title"], articles["summary"])
+        pairs = [
+            (label, symbol)
+            for label, symbols in zip(articles.index, self.link(texts.tolist()))
+            for symbol in sorted(symbols)
+        ]
+        return pd.DataFrame(pairs, columns=["article", "ticker"])
+
+
+def ticker_sentiment(links: pd.DataFrame, scores: pd.Series, tickers: Iterable[str]) -> pd.DataFrame:
+    """Per ticker: ``articles`` mentioning it, their mean ``score``, its ``sentiment`` label and ``emoji``.
+
+    ``scores`` is indexed like the articles the links point into. Tickers
+    without a mention have zero articles and a NaN score.
+    """
+    tickers = list(dict.fromkeys(tickers))
+    joined = links.assign(score=scores.reindex(links["article"]).to_numpy())
+    grouped = joined.groupby("ticker")["score"].agg(["count", "mean"]).reindex(tickers)
+    counts = grouped["count"].fillna(0).astype(int).to_numpy()
+    means = grouped["mean"].to_numpy(dtype=np.float64)
+    labels, emojis = label_scores(np.nan_to_num(means))
+    return pd.DataFrame(
+        {"articles": counts, "score": means, "sentiment": labels, "emoji": emojis},
+        index=pd.Index(tickers, name="ticker"),
+    )
+
+
+def _boundary(text: str, i: int) -> bool:
+    """Whether position ``i`` (just outside a match) is not part of a word."""
+    return i < 0 or i >= len(text) or not (text[i].isalnum() or text[i] == "_")
@@ -0,0 +1,207 @@
+"""Concurrent RSS ingestion with conditional GET.
+
+All feeds are requested in parallel, each with its own timeout. Every request
+carries the ``ETag`` / ``Last-Modified`` validators of the previous response,
+so an unchanged feed costs a ``304 Not Modified`` and is not parsed again.
+Requests go through the process-wide ``FetchScheduler``: sessions fetching
+the same feed at once share one request, and every host is rate-limited.
+Validators and the last parsed entries are persisted, so this also holds
+across process restarts. With ``max_age``, a feed confirmed that recently is
+served from the stored entries without a request at all.
+
+``fetch`` returns all feeds merged; ``iter_fetch`` yields each feed as soon
+as its response is in, for pages that render news progressively.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator
+
+import pandas as pd
+
+from .paths import cache_dir
+from .scheduler import FetchScheduler, get_scheduler
+
+RSS_FEEDS = {
+    "Seeking Alpha": "https://seekingalpha.com/feed.xml",
+    "MarketWatch": "https://feeds.content.dowjones.io/public/rss/mw_topstories",
+    "Yahoo Finance": "https://finance.yahoo.com/rss/",
+}
+
+NEWS_COLUMNS = ["source", "title", "link", "published", "summary"]
+
+# Entries kept per feed, so a 304 can still serve a full page of articles
+MAX_STORED_ENTRIES = 50
+
+
+def get_feeds() -> dict[str, str]:
+    """Feeds to ingest: ``FINAGENT_RSS_FEEDS`` (a JSON name -> URL object) or ``RSS_FEEDS``."""
+    configured = os.environ.get("FINAGENT_RSS_FEEDS", "").strip()
+    return json.loads(configured) if configured else dict(RSS_FEEDS)
+
+
+@dataclass
+class FeedResult:
+    """Merged articles plus per-feed status of one ingestion run."""
+
+    articles: pd.DataFrame
+    errors: dict[str, str] = field(default_factory=dict)
+    not_modified: list[str] = field(default_factory=list)
+    elapsed: float = 0.0
+
+
+@dataclass
+class FeedUpdate:
+    """The articles of one feed, or why there are none."""
+
+    name: str
+    articles: pd.DataFrame
+    error: str | None = None
+    modified: bool = True
+
+
+class FeedIngester:
+    """Fetches a set of RSS feeds concurrently, reusing unchanged responses."""
+
+    def __init__(
+        self,
+        feeds: dict[str, str] | None = None,
+        timeout: float = 5.0,
+        max_workers: int = 8,
+        state_path: str | os.PathLike | None = None,
+        max_age: float = 0,
+        scheduler: FetchScheduler | None = None,
+    ):
+        self.feeds = dict(feeds or get_feeds())
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self.max_age = max_age
+        self.scheduler = scheduler if scheduler is not None else get_scheduler()
+        self.state_path = Path(state_path) if state_path else cache_dir("feeds") / "state.json"
+        self._lock = threading.Lock()
+        self._state = self._load_state()
+
+    def fetch(self, max_per_feed: int | None = None) -> FeedResult:
+        """Fetch every feed and merge the entries into one DataFrame."""
+        started = time.perf_counter()
+        result = FeedResult(articles=pd.DataFrame(columns=NEWS_COLUMNS))
+        frames = {}
+        for update in self.iter_fetch(max_per_feed):
+            if update.error is not None:
+                result.errors[update.name] = update.error
+                continue
+            if not update.modified:
+                result.not_modified.append(update.name)
+            frames[update.name] = update.articles
+
+        if frames:
+            # Feed order, not arrival order, so the merged frame is stable
+            result.articles = pd.concat([frames[name] for name in self.feeds if name in frames], ignore_index=True)
+        result.elapsed = time.perf_counter() - started
+        return result
+
+    def iter_fetch(self, max_per_feed: int | None = None) -> Iterator[FeedUpdate]:
+        """Yield every feed as soon as it is fetched; feeds still out after ``timeout`` fail."""
+        pool = ThreadPoolExecutor(
+            max_workers=max(1, min(self.max_workers, len(self.feeds))),
+            thread_name_prefix="feeds",
+        )
+        futures = {pool.submit(self._fetch_one, name, url): name for name, url in self.feeds.items()}
+        pending = dict(futures)
+        try:
+            try:
+                for future in as_completed(futures, timeout=self.timeout):
+                    name = pending.pop(future)
+                    try:
+                        entries, modified = future.result()
+                    except Exception as e:
+                        yield FeedUpdate(name, pd.DataFrame(columns=NEWS_COLUMNS), error=str(e))
+                        continue
+                    frame = pd.DataFrame(entries[:max_per_feed], columns=NEWS_COLUMNS[1:])
+                    frame.insert(0, "source", name)
+                    yield FeedUpdate(name, frame, modified=modified)
+            except TimeoutError:
+                for name in pending.values():
+                    yield FeedUpdate(
+                        name, pd.DataFrame(columns=NEWS_COLUMNS), error=f"timed out after {self.timeout:.0f}s"
+                    )
+        finally:
+            # Do not wait for stragglers; their sockets time out on their own
+            pool.shutdown(wait=False, cancel_futures=True)
+            self._save_state()
+
+    def _fetch_one(self, name: str, url: str) -> tuple[list[dict], bool]:
+        """Return the feed's entries and whether they changed since the last fetch."""
+        with self._lock:
+            cached = self._state.get(url, {})
+            if self.max_age and "entries" in cached and time.time() - cached.get("fetched_at", 0) < self.max_age:
+                return cached["entries"], False
+        host = urllib.parse.urlsplit(url).netloc
+        return self.scheduler.call(("feed", url), host, self._request, url)
+
+    def _request(self, url: str) -> tuple[list[dict], bool]:
+        import feedparser
+
+        with self._lock:
+            cached = dict(self._state.get(url, {}))
+        headers = {"User-Agent": feedparser.USER_AGENT}
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("modified"):
+            headers["If-Modified-Since"] = cached["modified"]
+
+        request = urllib.request.Request(url, headers=headers)
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                body = response.read()
+                etag = response.headers.get("ETag")
+                modified = response.headers.get("Last-Modified")
+        except urllib.error.HTTPError as e:
+            if e.code == 304 and "entries" in cached:
+                with self._lock:
+                    self._state.setdefault(url, cached)["fetched_at"] = time.time()
+                return cached["entries"], False
+            raise
+
+        feed = feedparser.parse(body)
+        if feed.bozo and not feed.entries:
+            raise ValueError(f"could not parse feed: {feed.bozo_exception}")
+        entries = [
+            {
+                "title": entry.get("title", "No title"),
+                "link": entry.get("link", ""),
+                "published": entry.get("published", ""),
+                "summary": entry.get("summary", "No summary available"),
+            }
+            for entry in feed.entries[:MAX_STORED_ENTRIES]
+        ]
+        with self._lock:
+            self._state[url] = {"etag": etag, "modified": modified, "entries": entries, "fetched_at": time.time()}
+        return entries, True
+
+    def _load_state(self) -> dict:
+        try:
+            return json.loads(self.state_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def _save_state(self) -> None:
+        with self._lock:
+            payload = json.dumps(self._state)
+        tmp = self.state_path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            tmp.write_text(payload, encoding="utf-8")
+            os.replace(tmp, self.state_path)
+        except OSError:
+            # The cache is an optimisation; failing to persist it is not an error
+            pass
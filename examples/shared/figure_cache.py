@@ -0,0 +1,146 @@
+"""Reuse Plotly figures across Streamlit reruns while their inputs are unchanged.
+
+A widget interaction reruns the whole dashboard script, which would rebuild
+every figure even though most charts' inputs did not change. ``FigureCache``
+keys each figure on a content fingerprint of the arguments it is built from
+and returns the cached figure while that fingerprint matches.
+
+Entries are accounted by the bytes of their trace and layout data (array
+``nbytes`` plus string lengths), which tracks the serialized size without
+serializing the figure a second time, and evicted in least-recently-used
+order once ``max_bytes`` is exceeded. The built figure is what is kept:
+re-creating a figure from its JSON spec costs about half a build because
+Plotly validates it again. Cached figures are shared between
+sessions and must be treated as read-only.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from .instrumentation import HIT, MISS, annotate
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def fingerprint(*parts) -> str:
+    """Content hash of frames, arrays, dataclasses, containers and scalars."""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        _update(digest, part)
+    return digest.hexdigest()
+
+
+class FigureCache:
+    """Thread-safe LRU of built figures, bounded by the size of their data."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[tuple[str, str], tuple[object, int]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, name: str, builder: Callable, *args, **kwargs):
+        """Return ``builder(*args, **kwargs)``, built only when the inputs changed."""
+        key = (name, fingerprint(args, kwargs))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                annotate(HIT, entry[1])
+                return entry[0]
+            self.misses += 1
+
+        # Built outside the lock; two sessions racing on one key both build once
+        fig = builder(*args, **kwargs)
+        size = figure_bytes(fig)
+        annotate(MISS, size)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            if size <= self.max_bytes:
+                self._entries[key] = (fig, size)
+                self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+                self.evictions += 1
+        return fig
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+def figure_bytes(fig) -> int:
+    """Approximate size of a Plotly figure's data, from its properties without copying them."""
+    # ``_props`` are the validated property dicts ``to_plotly_json`` would deep-copy
+    return sum(_nbytes(trace._props) for trace in fig.data) + _nbytes(fig.layout._props)
+
+
+def _nbytes(value) -> int:
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, str):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(_nbytes(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        if value and isinstance(value[0], (int, float)):
+            return 8 * len(value)
+        return sum(_nbytes(item) for item in value)
+    return 8
+
+
+def _update(digest, value) -> None:
+    # Every value is tagged with its type so e.g. 1 and "1" hash differently
+    digest.update(type(value).__name__.encode())
+    if isinstance(value, (pd.DataFrame, pd.Series, pd.Index)):
+        digest.update(repr((value.shape, getattr(value, "name", None))).encode())
+        if isinstance(value, pd.DataFrame):
+            digest.update(repr((list(value.columns), [str(d) for d in value.dtypes])).encode())
+        else:
+            digest.update(str(value.dtype).encode())
+        digest.update(pd.util.hash_pandas_object(value, index=not isinstance(value, pd.Index)).to_numpy().tobytes())
+    elif isinstance(value, np.ndarray):
+        digest.update(repr((value.shape, str(value.dtype))).encode())
+        digest.update(np.ascontiguousarray(value).tobytes())
+    elif dataclasses.is_dataclass(value) and not isinstance(value, type):
+        for field in dataclasses.fields(value):
+            _update(digest, field.name)
+            _update(digest, getattr(value, field.name))
+    elif isinstance(value, dict):
+        digest.update(str(len(value)).encode())
+        for key in sorted(value, key=repr):
+            _update(digest, key)
+            _update(digest, value[key])
+    elif isinstance(value, (list, tuple)):
+        digest.update(str(len(value)).encode())
+        for item in value:
+            _update(digest, item)
+    else:
+        digest.update(repr(value).encode())
@@ -0,0 +1,214 @@
+"""Market indicators refreshed in the background, served stale-while-revalidate.
+
+``IndicatorService`` fetches a handful of indicator symbols on a schedule in
+a daemon thread. Readers call ``snapshot()``, which never touches the
+network: it returns the last good value of every indicator together with the
+bar date it is as of and whether it is ``live``, ``stale`` (the last refresh
+failed or is overdue) or a ``fallback`` constant because no real value has
+ever been seen. Bars are read through a ``BarStore``, so a refresh only
+fetches the bars after the stored ones and other processes reading the same
+symbols share them. A failed refresh keeps the previous real values. The
+last good values are persisted, so a restarted dashboard starts from them
+instead of the constants.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .bar_store import BarStore
+from .paths import cache_dir
+from .prices import PriceSource, get_price_source
+
+LIVE = "live"
+STALE = "stale"
+FALLBACK = "fallback"
+
+# Indicator name -> price symbol
+INDICATORS = {
+    "10Y_Treasury": "^TNX",
+    "5Y_Treasury": "^FVX",
+    "VIX": "^VIX",
+    "DXY": "DX-Y.NYB",
+}
+
+# Shown, flagged as fallback, until a real value has been fetched once
+FALLBACK_VALUES = {
+    "10Y_Treasury": (4.5, 4.4),
+    "5Y_Treasury": (4.2, 4.1),
+    "VIX": (16.5, 15.8),
+    "DXY": (104.2, 103.8),
+}
+
+
+@dataclass(frozen=True)
+class Indicator:
+    """Latest and previous close of one indicator and where they came from."""
+
+    current: float
+    prev: float
+    status: str
+    as_of: pd.Timestamp | None = None  # Date of the latest bar
+    fetched_at: float | None = None  # When it was last confirmed by a refresh
+
+    @property
+    def change(self) -> float:
+        return self.current - self.prev
+
+
+@dataclass(frozen=True)
+class IndicatorSnapshot:
+    values: dict[str, Indicator]
+    refreshed_at: float | None = None
+    errors: dict[str, str] = field(default_factory=dict)
+
+    def __getitem__(self, name: str) -> Indicator:
+        return self.values[name]
+
+    @property
+    def status(self) -> str:
+        """The worst status of any indicator."""
+        statuses = {value.status for value in self.values.values()}
+        for status in (FALLBACK, STALE):
+            if status in statuses:
+                return status
+        return LIVE
+
+
+class IndicatorService:
+    """Keeps indicator values fresh from a background thread."""
+
+    def __init__(
+        self,
+        indicators: dict[str, str] | None = None,
+        source: PriceSource | None = None,
+        interval: float = 300,
+        stale_after: float | None = None,
+        state_path: str | os.PathLike | None = None,
+        store: BarStore | None = None,
+    ):
+        self.indicators = dict(indicators or INDICATORS)
+        self.source = source if source is not None else get_price_source()
+        self.interval = interval
+        # Bars older than half an interval are refreshed, so every scheduled refresh fetches
+        self.store = store if store is not None else BarStore(source=self.source, ttl=interval / 2)
+        # A missed refresh or two is tolerated before live values turn stale
+        self.stale_after = stale_after if stale_after is not None else 2.5 * interval
+        self.state_path = Path(state_path) if state_path else cache_dir("indicators") / "state.json"
+        self._lock = threading.Lock()
+        self._values: dict[str, Indicator] = self._load_state()
+        self._errors: dict[str, str] = {}
+        self._refreshed_at: float | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> "IndicatorService":
+        """Start refreshing in the background (idempotent); returns immediately."""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="indicators", daemon=True)
+                self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def snapshot(self) -> IndicatorSnapshot:
+        """Current values without waiting on the network."""
+        now = time.time()
+        with self._lock:
+            values = dict(self._values)
+            errors = dict(self._errors)
+            refreshed_at = self._refreshed_at
+        out = {}
+        for name in self.indicators:
+            value = values.get(name)
+            if value is None:
+                current, prev = FALLBACK_VALUES.get(name, (np.nan, np.nan))
+                value = Indicator(current, prev, FALLBACK)
+            elif value.status == LIVE and now - value.fetched_at > self.stale_after:
+                value = replace(value, status=STALE)
+            out[name] = value
+        return IndicatorSnapshot(out, refreshed_at, errors)
+
+    def refresh(self) -> None:
+        """Fetch every indicator once; failures keep the previous values, marked stale."""
+        symbols = list(self.indicators.values())
+        try:
+            result = self.store.get(symbols, "5d")
+            histories, errors = result.histories, dict(result.errors)
+        except Exception as e:
+            histories, errors = {}, {symbol: str(e) for symbol in symbols}
+
+        now = time.time()
+        with self._lock:
+            for name, symbol in self.indicators.items():
+                closes = histories[symbol]["Close"].dropna() if symbol in histories else None
+                if closes is not None and len(closes):
+                    # The store keeps serving its bars when their refresh fails; they
+                    # turn stale once the last successful fetch is too old
+                    self._values[name] = Indicator(
+                        current=float(closes.iloc[-1]),
+                        prev=float(closes.iloc[-2] if len(closes) > 1 else closes.iloc[-1]),
+                        status=LIVE,
+                        as_of=closes.index[-1],
+                        fetched_at=self.store.refreshed_at(symbol) or now,
+                    )
+                    continue
+                errors.setdefault(symbol, "No price data returned")
+                if name in self._values:
+                    self._values[name] = replace(self._values[name], status=STALE)
+            self._errors = {name: errors[symbol] for name, symbol in self.indicators.items() if symbol in errors}
+            self._refreshed_at = now
+        self._save_state()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                with self._lock:
+                    self._errors = {"refresh": str(e)}
+            self._stop.wait(self.interval)
+
+    def _load_state(self) -> dict[str, Indicator]:
+        # Persisted values were live once; until refreshed they are stale
+        try:
+            state = json.loads(self.state_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        values = {}
+        for name, item in state.items():
+            as_of = pd.Timestamp(item["as_of"]) if item.get("as_of") else None
+            values[name] = Indicator(item["current"], item["prev"], STALE, as_of, item.get("fetched_at"))
+        return values
+
+    def _save_state(self) -> None:
+        with self._lock:
+            payload = json.dumps(
+                {
+                    name: {
+                        "current": value.current,
+                        "prev": value.prev,
+                        "as_of": value.as_of.isoformat() if value.as_of is not None else None,
+                        "fetched_at": value.fetched_at,
+                    }
+                    for name, value in self._values.items()
+                }
+            )
+        tmp = self.state_path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            tmp.write_text(payload, encoding="utf-8")
+            os.replace(tmp, self.state_path)
+        except OSError:
+            # Persisting only shortens the fallback window after a restart
+            pass
@@ -0,0 +1,378 @@
+"""Per-rerun timing and memory spans for the dashboards.
+
+A dashboard opens a ``Run`` at the top of its script, wraps its stages in
+``span(name)`` (or decorates them with ``instrumented``) and finishes the
+run at the bottom:
+
+    run = start_run("news")
+    with span("fetch_stock_data"):
+        ...
+    run.finish()
+
+Each span records its wall time, how much the process's peak RSS grew while
+it was open, whether it was served from a cache and the bytes it produced
+for the browser. Shared components report the last two from wherever they
+run below a span through ``annotate`` (``FigureCache``, ``BarStore``, ...).
+``mark(name)`` records a milestone of the run, such as the first content on
+the page, as seconds since the run started.
+
+``finish`` appends the run as one line to a rotating JSONL log and rewrites
+a Prometheus text-format file with cumulative per-span totals (for the
+node_exporter textfile collector), both below ``cache_dir("metrics")``.
+Process-wide components add their own lines to that file through
+``register_collector``.
+
+Runs are only opened when ``FINAGENT_INSTRUMENT`` is set (``panel`` also
+shows the timings in the page). Without an open run ``span`` returns a
+shared no-op object and ``annotate`` returns at once, so the disabled cost
+is one context-variable lookup per call.
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .paths import cache_dir
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+ENV = "FINAGENT_INSTRUMENT"
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUPS = 3
+
+HIT = "hit"
+MISS = "miss"
+
+# Callables returning extra Prometheus lines for the metrics file
+_collectors: list = []
+
+_run: ContextVar["Run | None"] = ContextVar("finagent_run", default=None)
+_span: ContextVar["Span | None"] = ContextVar("finagent_span", default=None)
+
+
+def instrumentation_enabled() -> bool:
+    return os.environ.get(ENV, "").strip().lower() in ("1", "true", "yes", "on", "panel")
+
+
+def debug_panel_enabled() -> bool:
+    return os.environ.get(ENV, "").strip().lower() == "panel"
+
+
+def peak_rss() -> int | None:
+    """Peak resident set size of this process in bytes, if the platform reports it."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def payload_size(obj) -> int | None:
+    """Approximate bytes sent to the browser for a figure, frame or text."""
+    if hasattr(obj, "to_json") and hasattr(obj, "data"):  # Plotly figure
+        return len(obj.to_json().encode("utf-8"))
+    # A frame implies pandas is loaded; never import it just to check
+    pandas = sys.modules.get("pandas")
+    if pandas is not None and isinstance(obj, pandas.DataFrame):
+        # Streamlit ships frames as Arrow
+        import pyarrow as pa
+
+        return pa.Table.from_pandas(obj).nbytes
+    if isinstance(obj, str):
+        return len(obj.encode("utf-8"))
+    if isinstance(obj, bytes):
+        return len(obj)
+    return None
+
+
+@dataclass
+class SpanRecord:
+    name: str
+    seconds: float
+    peak_rss_delta: int | None = None
+    cache: str | None = None
+    payload_bytes: int | None = None
+
+
+class Span:
+    """An open span; use through ``span()``."""
+
+    __slots__ = ("run", "name", "cache", "payload_bytes", "_started", "_rss", "_token")
+
+    def __init__(self, run: "Run", name: str, cache: str | None = None):
+        self.run = run
+        self.name = name
+        self.cache = cache
+        self.payload_bytes: int | None = None
+
+    def __enter__(self) -> "Span":
+        self._token = _span.set(self)
+        self._rss = peak_rss()
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        seconds = time.perf_counter() - self._started
+        rss = peak_rss()
+        _span.reset(self._token)
+        delta = rss - self._rss if rss is not None and self._rss is not None else None
+        self.run.spans.append(SpanRecord(self.name, seconds, delta, self.cache, self.payload_bytes))
+        return False
+
+    def annotate(self, cache: str | None = None, payload_bytes: int | None = None) -> None:
+        # A span with several cached lookups is a miss if any of them missed
+        if cache is not None and self.cache != MISS:
+            self.cache = cache
+        if payload_bytes is not None:
+            self.payload_bytes = (self.payload_bytes or 0) + payload_bytes
+
+    def payload(self, obj) -> None:
+        """Count ``obj`` as sent to the browser by this span."""
+        self.annotate(payload_bytes=payload_size(obj))
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        return False
+
+    def annotate(self, cache=None, payload_bytes=None) -> None:
+        pass
+
+    def payload(self, obj) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name: str, cache: str | None = None) -> Span | _NullSpan:
+    """Time a block as ``name`` in the current run.
+
+    ``cache`` is the initial cache status, e.g. ``HIT`` for a call to an
+    ``st.cache_data`` function whose body annotates ``MISS`` when it runs.
+    """
+    run = _run.get()
+    if run is None:
+        return _NULL_SPAN
+    return Span(run, name, cache)
+
+
+def instrumented(name: str | None = None):
+    """Decorator form of ``span``; the span is named after the function by default."""
+
+    def decorate(fn):
+        label = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            run = _run.get()
+            if run is None:
+                return fn(*args, **kwargs)
+            with Span(run, label):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def register_collector(collect) -> None:
+    """Append ``collect()`` (a list of Prometheus text lines) to every metrics file written."""
+    _collectors.append(collect)
+
+
+def mark(name: str) -> None:
+    """Record milestone ``name`` of the current run, if any; later marks of the same name are ignored."""
+    run = _run.get()
+    if run is not None and name not in run.marks:
+        run.marks[name] = time.perf_counter() - run._started
+
+
+def annotate(cache: str | None = None, payload_bytes: int | None = None) -> None:
+    """Report cache status or payload bytes to the innermost open span, if any."""
+    current = _span.get()
+    if current is not None:
+        current.annotate(cache, payload_bytes)
+
+
+class Run:
+    """The spans of one script run of one dashboard."""
+
+    def __init__(self, dashboard: str, directory: Path):
+        self.dashboard = dashboard
+        self.directory = directory
+        self.spans: list[SpanRecord] = []
+        # Milestone name -> seconds since the run started
+        self.marks: dict[str, float] = {}
+        self.started_at = time.time()
+        self.seconds: float | None = None
+        self._started = time.perf_counter()
+        self._rss = peak_rss()
+
+    def finish(self) -> dict:
+        """Close the run and write it to the JSONL log and the Prometheus file."""
+        if _run.get() is self:
+            _run.set(None)
+        self.seconds = time.perf_counter() - self._started
+        rss = peak_rss()
+        record = {
+            "dashboard": self.dashboard,
+            "started_at": self.started_at,
+            "seconds": self.seconds,
+            "peak_rss_delta": rss - self._rss if rss is not None and self._rss is not None else None,
+            "peak_rss": rss,
+            "pid": os.getpid(),
+            "spans": [asdict(s) for s in self.spans],
+            "marks": dict(self.marks),
+        }
+        _sink(self.dashboard, self.directory).write(record)
+        return record
+
+    def frame(self) -> pd.DataFrame:
+        """The spans recorded so far, one row each."""
+        import pandas as pd
+
+        return pd.DataFrame([asdict(s) for s in self.spans], columns=list(SpanRecord.__dataclass_fields__))
+
+
+class _NullRun:
+    dashboard = None
+    spans: list[SpanRecord] = []
+    marks: dict[str, float] = {}
+    seconds = None
+
+    def finish(self) -> dict:
+        return {}
+
+    def frame(self) -> pd.DataFrame:
+        import pandas as pd
+
+        return pd.DataFrame(columns=list(SpanRecord.__dataclass_fields__))
+
+
+def start_run(dashboard: str, enabled: bool | None = None, directory: str | os.PathLike | None = None):
+    """Open a run for this script execution; a no-op run unless instrumentation is enabled."""
+    if not (instrumentation_enabled() if enabled is None else enabled):
+        _run.set(None)
+        return _NullRun()
+    run = Run(dashboard, Path(directory) if directory else cache_dir("metrics"))
+    _run.set(run)
+    return run
+
+
+class _Sink:
+    """Rotating JSONL log plus cumulative Prometheus totals of one dashboard."""
+
+    def __init__(self, dashboard: str, directory: Path):
+        self.dashboard = dashboard
+        self.prom_path = directory / f"{dashboard}.prom"
+        self._handler = RotatingFileHandler(
+            directory / f"{dashboard}.jsonl", maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS, encoding="utf-8"
+        )
+        self._lock = threading.Lock()
+        self._runs = 0
+        self._run_seconds = 0.0
+        # span name -> [calls, seconds, hits, misses, payload bytes, max peak RSS delta]
+        self._totals: dict[str, list] = {}
+        # mark name -> [runs that reached it, seconds]
+        self._marks: dict[str, list] = {}
+
+    def write(self, record: dict) -> None:
+        self._handler.emit(logging.makeLogRecord({"msg": json.dumps(record, default=str)}))
+        with self._lock:
+            self._runs += 1
+            self._run_seconds += record["seconds"]
+            for s in record["spans"]:
+                totals = self._totals.setdefault(s["name"], [0, 0.0, 0, 0, 0, 0])
+                totals[0] += 1
+                totals[1] += s["seconds"]
+                totals[2] += s["cache"] == HIT
+                totals[3] += s["cache"] == MISS
+                totals[4] += s["payload_bytes"] or 0
+                totals[5] = max(totals[5], s["peak_rss_delta"] or 0)
+            for name, seconds in record.get("marks", {}).items():
+                marks = self._marks.setdefault(name, [0, 0.0])
+                marks[0] += 1
+                marks[1] += seconds
+            text = self._prometheus()
+        tmp = self.prom_path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            tmp.write_text(text, encoding="utf-8")
+            os.replace(tmp, self.prom_path)
+        except OSError:
+            pass
+
+    def _prometheus(self) -> str:
+        dashboard = f'dashboard="{self.dashboard}"'
+        lines = [
+            "# HELP finagent_dashboard_reruns_total Dashboard script runs recorded.",
+            "# TYPE finagent_dashboard_reruns_total counter",
+            f"finagent_dashboard_reruns_total{{{dashboard}}} {self._runs}",
+            "# HELP finagent_dashboard_rerun_seconds_total Wall time of recorded script runs.",
+            "# TYPE finagent_dashboard_rerun_seconds_total counter",
+            f"finagent_dashboard_rerun_seconds_total{{{dashboard}}} {self._run_seconds:.6f}",
+        ]
+        for metric, help_text, column, fmt in (
+            ("finagent_dashboard_marks_total", "Script runs that reached the milestone.", 0, "{}"),
+            ("finagent_dashboard_mark_seconds_total", "Time from run start to the milestone.", 1, "{:.6f}"),
+        ):
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} counter")
+            for name, marks in sorted(self._marks.items()):
+                lines.append(f'{metric}{{{dashboard},mark="{_escape(name)}"}} {fmt.format(marks[column])}')
+        metrics = [
+            ("finagent_span_calls_total", "counter", "Times the span was entered.", 0, "{}"),
+            ("finagent_span_seconds_total", "counter", "Wall time spent in the span.", 1, "{:.6f}"),
+            ("finagent_span_cache_hits_total", "counter", "Span runs served from a cache.", 2, "{}"),
+            ("finagent_span_cache_misses_total", "counter", "Span runs that missed their cache.", 3, "{}"),
+            ("finagent_span_payload_bytes_total", "counter", "Bytes produced for the browser.", 4, "{}"),
+            ("finagent_span_peak_rss_delta_bytes_max", "gauge", "Largest peak RSS growth during the span.", 5, "{}"),
+        ]
+        for metric, kind, help_text, column, fmt in metrics:
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} {kind}")
+            for name, totals in sorted(self._totals.items()):
+                value = fmt.format(totals[column])
+                lines.append(f'{metric}{{{dashboard},span="{_escape(name)}"}} {value}')
+        for collect in _collectors:
+            lines.extend(collect())
+        return "\n".join(lines) + "\n"
+
+
+_sinks: dict[tuple[str, Path], _Sink] = {}
+_sinks_lock = threading.Lock()
+
+
+def _sink(dashboard: str, directory: Path) -> _Sink:
+    with _sinks_lock:
+        key = (dashboard, directory)
+        if key not in _sinks:
+            directory.mkdir(parents=True, exist_ok=True)
+            _sinks[key] = _Sink(dashboard, directory)
+        return _sinks[key]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
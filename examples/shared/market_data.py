@@ -0,0 +1,292 @@
+"""Local market-data daemon and its thin client.
+
+One ``MarketDataServer`` per machine owns the bar store and every upstream
+fetch; dashboards and notebooks ask it for bars over a Unix socket instead
+of calling yfinance themselves, so N Streamlit sessions and kernels cost one
+upstream request per ticker and TTL. Incremental refreshes (requests with a
+``start``) are cut from the same store. The daemon's bars live under
+``<cache dir>/market_data/bars``, apart from the stores of its clients.
+
+The protocol is one JSON request line per connection, answered with an Arrow
+IPC stream: one record batch per ticker, in the order listed in the schema
+metadata, which also carries per-ticker errors and time zones. Dates travel
+as naive UTC and get their ticker's zone back in the client, so daemon bars
+and the fallback's upstream bars index alike. The client reads the batches
+straight off the socket into Arrow buffers; the numeric columns become
+pandas columns without a per-value conversion.
+
+    python -m shared.market_data serve --socket ~/.finance-agent/marketdata.sock
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+
+from .bar_store import BarStore
+from .paths import cache_dir
+from .prices import (
+    OHLCV_COLUMNS,
+    PriceLoadResult,
+    PriceSource,
+    YFinanceSource,
+    load_prices,
+    upstream_price_source,
+)
+from .scheduler import get_scheduler
+
+META_KEY = b"finagent"
+SOCKET_ENV = "FINAGENT_MARKET_DATA_SOCKET"
+DEFAULT_SOCKET = Path.home() / ".finance-agent" / "marketdata.sock"
+
+
+def default_socket_path() -> Path:
+    return Path(os.environ.get(SOCKET_ENV) or DEFAULT_SOCKET)
+
+
+class CountingSource:
+    """Wraps an upstream source and counts the tickers requested from it."""
+
+    def __init__(self, source: PriceSource):
+        self.source = source
+        self.requests = 0
+        self._lock = threading.Lock()
+        if hasattr(source, "download"):
+            self.download = self._download
+
+    def history(self, ticker: str, period: str, start: str | None = None) -> pd.DataFrame:
+        with self._lock:
+            self.requests += 1
+        return self.source.history(ticker, period, start=start)
+
+    def _download(self, tickers: list[str], period: str, start: str | None = None):
+        with self._lock:
+            self.requests += len(tickers)
+        return self.source.download(tickers, period, start=start)
+
+
+class MarketDataServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Serves bars from a ``BarStore`` to local clients, one thread per connection."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        socket_path: str | os.PathLike | None = None,
+        source: PriceSource | None = None,
+        store_root: str | os.PathLike | None = None,
+        ttl: float = 300,
+    ):
+        self.socket_path = Path(socket_path) if socket_path else default_socket_path()
+        self.upstream = CountingSource(source if source is not None else upstream_price_source())
+        # Not the clients' own ``cache_dir("bars")``: their stores refresh through this one
+        self.store = BarStore(root=store_root or cache_dir("market_data", "bars"), source=self.upstream, ttl=ttl)
+        self.served = 0
+        self.started_at = time.time()
+        _claim_socket(self.socket_path)
+        super().__init__(str(self.socket_path), _Handler)
+        os.chmod(self.socket_path, 0o600)
+
+    def start(self) -> threading.Thread:
+        """Serve from a background thread (used by benchmarks and tests)."""
+        thread = threading.Thread(target=self.serve_forever, name="market-data", daemon=True)
+        thread.start()
+        return thread
+
+    def server_close(self) -> None:
+        super().server_close()
+        try:
+            self.socket_path.unlink()
+        except OSError:
+            pass
+
+    def handle_request_line(self, request: dict) -> tuple[dict[str, pd.DataFrame], dict]:
+        op = request.get("op", "history")
+        if op == "ping":
+            return {}, {"ok": True}
+        if op == "stats":
+            return {}, self.stats()
+        if op != "history":
+            return {}, {"error": f"unknown op {op!r}"}
+
+        tickers = [str(t) for t in request.get("tickers", [])]
+        period = request.get("period", "6mo")
+        start = request.get("start")
+        # Incremental tails are cut from the store too, so every client's refresh
+        # shares the store's cached and coalesced upstream fetches
+        result = self.store.get(tickers, period)
+        if start:
+            result.histories = {ticker: _since(hist, start) for ticker, hist in result.histories.items()}
+        self.served += 1
+        return result.histories, {"errors": result.errors, "elapsed": result.elapsed}
+
+    def stats(self) -> dict:
+        return {
+            "served": self.served,
+            "upstream_requests": self.upstream.requests,
+            "fetch": get_scheduler().stats(),
+            "uptime": time.time() - self.started_at,
+            "pid": os.getpid(),
+        }
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        try:
+            request = json.loads(self.rfile.readline() or b"{}")
+            histories, meta = self.server.handle_request_line(request)
+        except Exception as e:
+            histories, meta = {}, {"error": str(e)}
+        try:
+            _write_stream(self.wfile, histories, meta)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # Client went away
+
+
+class MarketDataClient:
+    """Thin client for ``MarketDataServer``; one short connection per request."""
+
+    def __init__(self, socket_path: str | os.PathLike | None = None, timeout: float = 60):
+        self.socket_path = Path(socket_path) if socket_path else default_socket_path()
+        self.timeout = timeout
+
+    def history(
+        self, tickers: list[str], period: str, start: str | None = None
+    ) -> PriceLoadResult:
+        started = time.perf_counter()
+        histories, meta = self._request({"op": "history", "tickers": list(tickers), "period": period, "start": start})
+        if "error" in meta:
+            raise RuntimeError(f"market data server: {meta['error']}")
+        result = PriceLoadResult(histories=histories, errors=meta.get("errors", {}))
+        result.elapsed = time.perf_counter() - started
+        return result
+
+    def ping(self) -> bool:
+        try:
+            return bool(self._request({"op": "ping"})[1].get("ok"))
+        except OSError:
+            return False
+
+    def stats(self) -> dict:
+        return self._request({"op": "stats"})[1]
+
+    def _request(self, request: dict) -> tuple[dict[str, pd.DataFrame], dict]:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(self.timeout)
+            sock.connect(str(self.socket_path))
+            sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+            with sock.makefile("rb") as stream:
+                reader = pa.ipc.open_stream(stream)
+                meta = json.loads(reader.schema.metadata[META_KEY])
+                # Read to the end-of-stream marker before the socket is closed
+                batches = list(reader)
+                histories = {}
+                zones = meta.pop("tz", {})
+                for ticker, batch in zip(meta.pop("tickers"), batches):
+                    hist = batch.to_pandas().set_index("Date")
+                    hist.index.name = None
+                    if zones.get(ticker):
+                        hist.index = hist.index.tz_localize("UTC").tz_convert(zones[ticker])
+                    histories[ticker] = hist
+        return histories, meta
+
+
+class DaemonPriceSource:
+    """``PriceSource`` backed by the local daemon, with a direct fallback.
+
+    When the daemon is not running the ``fallback`` source (yfinance by
+    default) is used, so a dashboard keeps working without it.
+    """
+
+    def __init__(self, client: MarketDataClient | None = None, fallback: PriceSource | None = None):
+        self.client = client or MarketDataClient()
+        self.fallback = fallback if fallback is not None else YFinanceSource()
+
+    def history(self, ticker: str, period: str, start: str | None = None) -> pd.DataFrame:
+        histories = self.download([ticker], period, start=start)
+        if ticker not in histories:
+            raise ValueError(f"No price data returned for {ticker}")
+        return histories[ticker]
+
+    def download(
+        self, tickers: list[str], period: str, start: str | None = None
+    ) -> dict[str, pd.DataFrame]:
+        try:
+            return self.client.history(tickers, period, start=start).histories
+        except OSError:
+            # Not running, refusing, or stalled past the client's timeout
+            return load_prices(tickers, period, self.fallback, start=start).histories
+
+
+def _since(hist: pd.DataFrame, start: str) -> pd.DataFrame:
+    """The bars of ``hist`` from ``start`` (a date) on."""
+    start = pd.Timestamp(start)
+    tz = getattr(hist.index, "tz", None)
+    if tz is not None:
+        start = start.tz_localize(tz) if start.tzinfo is None else start.tz_convert(tz)
+    return hist[hist.index >= start]
+
+
+_SCHEMA = pa.schema(
+    [pa.field("Date", pa.timestamp("ns"))] + [pa.field(c, pa.float64()) for c in OHLCV_COLUMNS]
+)
+
+
+def _write_stream(sink, histories: dict[str, pd.DataFrame], meta: dict) -> None:
+    zones = {ticker: str(hist.index.tz) for ticker, hist in histories.items() if hist.index.tz is not None}
+    meta = dict(meta, tickers=list(histories), tz=zones)
+    schema = _SCHEMA.with_metadata({META_KEY: json.dumps(meta)})
+    with pa.ipc.new_stream(sink, schema) as writer:
+        for hist in histories.values():
+            frame = hist.reindex(columns=OHLCV_COLUMNS).astype("float64")
+            frame.insert(0, "Date", hist.index.tz_convert("UTC").tz_localize(None) if hist.index.tz else hist.index)
+            writer.write_batch(pa.RecordBatch.from_pandas(frame, schema=_SCHEMA, preserve_index=False))
+
+
+def _claim_socket(path: Path) -> None:
+    """Remove a socket file left behind by a dead server; refuse if one is alive."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if not path.exists():
+        return
+    if MarketDataClient(path, timeout=2).ping():
+        raise RuntimeError(f"a market data server is already listening on {path}")
+    path.unlink()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local market-data daemon")
+    sub = parser.add_subparsers(dest="command", required=True)
+    serve = sub.add_parser("serve", help="run the server in the foreground")
+    serve.add_argument("--socket", default=None, help=f"socket path (default: ${SOCKET_ENV} or {DEFAULT_SOCKET})")
+    serve.add_argument("--ttl", type=float, default=300, help="seconds before cached bars are refreshed")
+    sub.add_parser("stats", help="print the running server's counters").add_argument("--socket", default=None)
+    args = parser.parse_args()
+
+    if args.command == "stats":
+        print(json.dumps(MarketDataClient(args.socket).stats()))
+        return
+    server = MarketDataServer(args.socket, ttl=args.ttl)
+    # Stopped with SIGTERM by the CLI; exit through ``finally`` to remove the socket
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    print(f"market data server listening on {server.socket_path} (pid {os.getpid()})", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
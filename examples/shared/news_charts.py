@@ -0,0 +1,184 @@
+"""Plotly figures of the news dashboard.
+
+Each builder takes the dashboard's ``MarketAnalytics`` or frames and returns
+a new figure; none of them touches Streamlit. Plotly and the downsampling
+code are imported by the builders themselves, so importing this module is
+free and the dashboard draws its first elements before they load.
+"""
+
+# Per-trace point budget the dashboard's slider starts at
+DEFAULT_MAX_POINTS = 1000
+
+
+# max_points=None sends every bar to the browser
+def build_price_figure(analytics, max_points):
+    import plotly.graph_objects as go
+
+    from .downsample import downsample
+
+    fig = go.Figure()
+
+    for j, ticker in enumerate(analytics.tickers):
+        x, y = downsample(analytics.dates, analytics.closes[:, j], max_points)
+        fig.add_trace(go.Scatter(
+            x=x,
+            y=y,
+            mode='lines',
+            name=ticker,
+            line=dict(width=2),
+            connectgaps=True
+        ))
+
+    fig.update_layout(
+        height=400,
+        xaxis_title="Date",
+        yaxis_title="Price ($)",
+        hovermode='x unified',
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+    )
+    return fig
+
+
+def build_volume_figure(analytics, max_points):
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    from .downsample import downsample
+
+    fig = make_subplots(specs=[[{"secondary_y": True}]])
+
+    for j, ticker in enumerate(analytics.tickers):
+        # Min/max per bucket keeps volume spikes visible
+        x, y = downsample(analytics.dates, analytics.volumes[:, j], max_points, method="minmax")
+        fig.add_trace(
+            go.Bar(x=x, y=y, name=f"{ticker} Volume", opacity=0.7),
+            secondary_y=False,
+        )
+
+    fig.update_layout(
+        height=400,
+        xaxis_title="Date",
+        hovermode='x unified'
+    )
+    fig.update_yaxes(title_text="Volume", secondary_y=False)
+    return fig
+
+
+def build_volatility_figure(volatility_df, max_points):
+    import plotly.graph_objects as go
+
+    from .downsample import downsample
+
+    fig = go.Figure()
+
+    for ticker in volatility_df.columns:
+        x, y = downsample(volatility_df.index, volatility_df[ticker], max_points)  # Annualized
+        fig.add_trace(go.Scatter(
+            x=x,
+            y=y,
+            mode='lines',
+            name=f"{ticker} Volatility",
+            line=dict(width=2),
+            connectgaps=True
+        ))
+
+    fig.update_layout(
+        height=400,
+        xaxis_title="Date",
+        yaxis_title="Annualized Volatility",
+        hovermode='x unified'
+    )
+    return fig
+
+
+def build_correlation_figure(correlation_df):
+    import plotly.express as px
+
+    fig = px.imshow(
+        correlation_df,
+        text_auto='.2f',
+        aspect="auto",
+        color_continuous_scale='RdBu_r',
+        title="Stock Returns Correlation"
+    )
+    fig.update_layout(height=400)
+    return fig
+
+
+def build_sentiment_figure(sentiment_counts):
+    import plotly.express as px
+
+    return px.pie(
+        values=sentiment_counts.values,
+        names=sentiment_counts.index,
+        title="News Sentiment Distribution",
+        color_discrete_map={
+            'Positive': '#28a745',
+            'Negative': '#dc3545',
+            'Neutral': '#ffc107'
+        }
+    )
+
+
+def build_sentiment_history_figure(daily):
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    from .article_store import ALL_NEWS
+
+    fig = make_subplots(specs=[[{"secondary_y": True}]])
+
+    everything = daily[daily['ticker'] == ALL_NEWS]
+    fig.add_trace(
+        go.Bar(x=everything['time'], y=everything['articles'], name="Articles", opacity=0.3,
+               marker_color='#888888'),
+        secondary_y=True,
+    )
+    for ticker, series in daily.groupby('ticker', sort=False):
+        fig.add_trace(
+            go.Scatter(
+                x=series['time'],
+                y=series['score'],
+                mode='lines+markers',
+                name="All news" if ticker == ALL_NEWS else ticker,
+                line=dict(width=2, dash='dot' if ticker == ALL_NEWS else 'solid'),
+                customdata=series['articles'],
+                hovertemplate="%{y:+.2f} (%{customdata} articles)",
+            ),
+            secondary_y=False,
+        )
+
+    fig.update_layout(
+        height=400,
+        xaxis_title="Date (UTC)",
+        hovermode='x unified',
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+    )
+    fig.update_yaxes(title_text="Mean Sentiment", range=[-1, 1], secondary_y=False)
+    fig.update_yaxes(title_text="Articles", showgrid=False, secondary_y=True)
+    return fig
+
+
+def build_event_study_figure(study):
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+
+    colors = {'Positive': '#28a745', 'Negative': '#dc3545'}
+    for label, returns in study.returns.items():
+        fig.add_trace(go.Scatter(
+            x=study.offsets,
+            y=returns,
+            mode='lines+markers',
+            name=f"{label} news ({study.events[label]} days)",
+            line=dict(width=2, color=colors.get(label)),
+        ))
+    fig.add_vline(x=0, line_dash='dash', line_color='#888888')
+
+    fig.update_layout(
+        height=400,
+        xaxis_title="Trading Days from News",
+        yaxis_title="Mean Cumulative Return (%)",
+        hovermode='x unified'
+    )
+    return fig
@@ -0,0 +1,83 @@
+"""Data helpers of the news dashboard.
+
+The loaders run on the dashboard's load pipeline threads; the rest turn what
+has arrived so far into the frames the page draws. pandas and the analytics
+modules are imported by the helpers themselves, so importing this module is
+free and the dashboard draws its first elements before they load.
+"""
+
+from __future__ import annotations
+
+from .instrumentation import instrumented, span
+
+
+@instrumented()
+def fetch_stock_data(store, ticker, period):
+    """Slice one ticker's history from the bar store, fetching only missing bars"""
+    return store.get([ticker], period)
+
+
+def fetch_financial_news(ingester, max_articles=20):
+    """Fetch latest financial news from RSS feeds in parallel, yielding each feed as it arrives"""
+    with span("fetch_financial_news"):
+        for update in ingester.iter_fetch(max_per_feed=max_articles // len(ingester.feeds)):
+            if update.error is None:
+                update.articles['summary'] = update.articles['summary'].str[:200] + "..."
+            yield update
+
+
+def add_prices(panel, histories):
+    """``panel`` with the tickers of ``histories`` added; ``None`` starts an empty one."""
+    from .panel import PricePanel
+
+    return PricePanel.from_histories(histories) if panel is None else panel.add(histories)
+
+
+def align_prices(panel, tickers):
+    """Analytics of the tickers whose history has arrived, in the order they were asked for.
+
+    Volatility and correlation are left out: the dashboard streams those
+    through ``IncrementalMarketStats``, and this runs again on every arrival.
+    """
+    from .analytics import compute_analytics
+
+    panel = add_prices(panel, {})
+    return compute_analytics(panel.select(t for t in dict.fromkeys(tickers) if t in panel), risk=False)
+
+
+def link_tickers(linker, news_df, sentiment_df):
+    """Sentiment of the articles mentioning each ticker the linker was built for."""
+    from .entities import ticker_sentiment
+
+    return ticker_sentiment(linker.link_articles(news_df), sentiment_df['score'], linker.tickers)
+
+
+def store_news(store, engine, linker, news_df):
+    """Add the articles not stored yet to the history; only those are scored and linked."""
+    return store.add(news_df, engine.score, linker.link)
+
+
+def sentiment_history(store, tickers, analytics, window=5):
+    """Stored daily sentiment of the tickers and of all news since the first bar, and its event study."""
+    from .analytics import event_study
+    from .article_store import ALL_NEWS
+
+    start = analytics.dates[0] if len(analytics.dates) else None
+    daily = store.sentiment("D", [*dict.fromkeys(tickers), ALL_NEWS], start=start)
+    return daily, event_study(analytics, daily, window)
+
+
+def combine_news(frames, feeds):
+    """The articles of every feed that has arrived, in feed order."""
+    import pandas as pd
+
+    # Feed order, so the article list does not depend on which feed answered first
+    arrived = [frames[name] for name in feeds if name in frames]
+    return pd.concat(arrived, ignore_index=True) if arrived else pd.DataFrame()
+
+
+def score_news(engine, news_df):
+    """Sentiment of every article next to its title, source and link."""
+    import pandas as pd
+
+    return pd.concat([engine.score_articles(news_df), news_df[['title', 'source', 'link']]], axis=1)
@@ -0,0 +1,147 @@
+"""Compact in-memory price history for a whole ticker universe.
+
+A ``PricePanel`` holds one shared, sorted date index and, per field, one
+(dates x tickers) NumPy block, instead of a DataFrame with its own index
+and every OHLCV column per ticker. Only the fields the analytics read are
+kept (``Close`` and ``Volume`` by default); a ticker without a bar on some
+date is NaN there, as in an outer join of the per-ticker histories.
+
+Blocks are float64 by default. ``dtype=np.float32`` halves the footprint
+at about seven significant digits, which is enough for prices but rounds
+volumes above 2**24 shares; analytics always compute in float64.
+
+Panels are immutable: ``add`` and ``select`` return new panels and share
+blocks with the original where they can. They pickle as a handful of
+arrays, so caching or shipping one costs little more than its ``nbytes``.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+PANEL_FIELDS = ("Close", "Volume")
+
+
+@dataclass(frozen=True)
+class PricePanel:
+    """Per-field (dates x tickers) blocks on one shared date index."""
+
+    dates: pd.DatetimeIndex
+    tickers: tuple[str, ...]
+    blocks: dict[str, np.ndarray]
+
+    @classmethod
+    def empty(cls, fields: Iterable[str] = PANEL_FIELDS, dtype=np.float64) -> "PricePanel":
+        return cls(pd.DatetimeIndex([]), (), {f: np.empty((0, 0), dtype=dtype) for f in fields})
+
+    @classmethod
+    def from_histories(
+        cls,
+        histories: dict[str, pd.DataFrame],
+        fields: Iterable[str] = PANEL_FIELDS,
+        dtype=np.float64,
+    ) -> "PricePanel":
+        """Outer-join ``fields`` of per-ticker OHLCV frames; tickers without a ``Close`` are left out."""
+        fields = tuple(fields)
+        columns = [
+            (ticker, hist.index, {f: hist[f] for f in fields if f in hist})
+            for ticker, hist in histories.items()
+            if hist is not None and not hist.empty and "Close" in hist
+        ]
+        return _assemble(columns, fields, np.dtype(dtype))
+
+    def __contains__(self, ticker: str) -> bool:
+        return ticker in self.tickers
+
+    def __len__(self) -> int:
+        return len(self.tickers)
+
+    @property
+    def fields(self) -> tuple[str, ...]:
+        return tuple(self.blocks)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the date index and the blocks."""
+        return self.dates.nbytes + sum(block.nbytes for block in self.blocks.values())
+
+    def block(self, field: str, dtype=np.float64) -> np.ndarray:
+        """One field for every ticker; no copy when it is stored as ``dtype`` already."""
+        return self.blocks[field].astype(dtype, copy=False)
+
+    def frame(self, field: str) -> pd.DataFrame:
+        return pd.DataFrame(self.blocks[field], index=self.dates, columns=list(self.tickers))
+
+    def history(self, ticker: str) -> pd.DataFrame:
+        """The stored fields of one ticker on the dates it has a close."""
+        j = self.tickers.index(ticker)
+        rows = np.isfinite(self.blocks["Close"][:, j])
+        return pd.DataFrame({f: block[rows, j] for f, block in self.blocks.items()}, index=self.dates[rows])
+
+    def add(self, histories: dict[str, pd.DataFrame]) -> "PricePanel":
+        """This panel with the tickers of ``histories`` added, or replaced where already present."""
+        incoming = PricePanel.from_histories(histories, self.fields, self.blocks["Close"].dtype)
+        if not len(incoming):
+            return self
+        kept = [t for t in self.tickers if t not in incoming]
+        if not kept:
+            return incoming
+        if incoming.dates.equals(self.dates) and len(kept) == len(self.tickers):
+            # Same calendar: append the new columns, no realignment
+            return PricePanel(
+                self.dates,
+                self.tickers + incoming.tickers,
+                {f: np.hstack([self.blocks[f], incoming.blocks[f]]) for f in self.fields},
+            )
+        return _assemble(
+            [*self._columns(kept), *incoming._columns(incoming.tickers)], self.fields, self.blocks["Close"].dtype
+        )
+
+    def select(self, tickers: Iterable[str]) -> "PricePanel":
+        """The given tickers, in that order, on the dates where at least one of them has a close."""
+        tickers = tuple(tickers)
+        if tickers == self.tickers:
+            return self
+        cols = [self.tickers.index(t) for t in tickers]
+        rows = np.isfinite(self.blocks["Close"][:, cols]).any(axis=1)
+        if rows.all():
+            return PricePanel(self.dates, tickers, {f: block[:, cols] for f, block in self.blocks.items()})
+        return PricePanel(
+            self.dates[rows], tickers, {f: block[np.ix_(rows, cols)] for f, block in self.blocks.items()}
+        )
+
+    def _columns(self, tickers):
+        for ticker in tickers:
+            j = self.tickers.index(ticker)
+            yield ticker, self.dates, {f: block[:, j] for f, block in self.blocks.items()}
+
+
+def _assemble(columns, fields, dtype) -> PricePanel:
+    """Scatter ``(ticker, index, {field: values})`` columns onto the union of their indexes."""
+    if not columns:
+        return PricePanel.empty(fields, dtype)
+    indexes = [index for _, index, _ in columns]
+    first = indexes[0]
+    if all(index.equals(first) for index in indexes[1:]) and first.is_monotonic_increasing:
+        # One calendar for every ticker: stack the columns as they are
+        dates, rows = first, None
+    else:
+        dates = first.append(indexes[1:]).unique().sort_values()
+        rows = [dates.get_indexer(index) for index in indexes]
+
+    blocks = {}
+    for f in fields:
+        block = np.full((len(dates), len(columns)), np.nan, dtype=dtype)
+        for j, (_, _, values) in enumerate(columns):
+            if f in values:
+                column = np.asarray(values[f], dtype=dtype)
+                if rows is None:
+                    block[:, j] = column
+                else:
+                    block[rows[j], j] = column
+        blocks[f] = block
+    return PricePanel(pd.DatetimeIndex(dates), tuple(t for t, _, _ in columns), blocks)
@@ -0,0 +1,15 @@
+"""Locations of the on-disk caches shared by the dashboards."""
+
+import os
+from pathlib import Path
+
+# Same directory the finagent CLI uses for its config and venv
+DEFAULT_CACHE_DIR = Path.home() / ".finance-agent" / "cache"
+
+
+def cache_dir(*parts: str) -> Path:
+    """Return (and create) a directory below ``FINAGENT_CACHE_DIR``."""
+    root = Path(os.environ.get("FINAGENT_CACHE_DIR") or DEFAULT_CACHE_DIR)
+    path = root.joinpath(*parts)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
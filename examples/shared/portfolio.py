@@ -0,0 +1,253 @@
+"""Typed, columnar loading of portfolio books.
+
+Positions and cash flows are read from CSV, Parquet or Arrow IPC files into
+a fixed schema. Identifier columns (symbol, type, asset class) are
+categoricals and amounts are parsed straight into ``float64`` by the reader,
+so no per-cell string cleanup is needed afterwards. Column names are matched
+case-insensitively and through aliases, so both the dashboard's own files
+and books shaped like ``data/example_portfolio.csv`` (``ticker``, ``units``,
+``price``, ...) load into the same frame.
+
+``PortfolioLoader`` validates the header once per file version and keeps the
+typed result keyed by mtime; when only the mtime changed, a content hash
+decides whether the file has to be parsed again.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+import pandas as pd
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+
+from .instrumentation import HIT, MISS, annotate
+
+CATEGORICAL = "category"
+DATE = "datetime64[ns]"
+FLOAT = "float64"
+TEXT = "str"
+
+
+class PortfolioSchemaError(ValueError):
+    """A portfolio file is missing columns or holds values of the wrong type."""
+
+
+@dataclass(frozen=True)
+class TableSchema:
+    """Column dtypes of a table, the columns it cannot do without, and aliases."""
+
+    name: str
+    dtypes: dict[str, str]
+    required: tuple[str, ...]
+    aliases: dict[str, str] = field(default_factory=dict)
+    # Fills optional columns that are absent from the file
+    complete: Callable[[pd.DataFrame], pd.DataFrame] | None = None
+
+    def resolve(self, header: list[str]) -> dict[str, str]:
+        """Map source column names to schema columns, ignoring unknown ones."""
+        by_key = {_key(column): column for column in self.dtypes}
+        by_key.update({alias: column for alias, column in self.aliases.items()})
+        mapping = {}
+        for source in header:
+            column = by_key.get(_key(source))
+            if column is not None and column not in mapping.values():
+                mapping[source] = column
+        missing = [column for column in self.required if column not in mapping.values()]
+        if missing:
+            raise PortfolioSchemaError(f"{self.name}: missing required columns {missing}")
+        return mapping
+
+
+def _complete_positions(df: pd.DataFrame) -> pd.DataFrame:
+    if "Close_Price" not in df:
+        df["Close_Price"] = (df["Market_Value"] / df["Quantity"]).where(df["Quantity"] != 0)
+    if "Unrealized_PL" not in df:
+        df["Unrealized_PL"] = df["Market_Value"] - df["Cost_Basis"]
+    for column in ("MTD_PL", "YTD_PL"):
+        if column not in df:
+            df[column] = 0.0
+    if "Description" not in df:
+        df["Description"] = df["Symbol"].astype(TEXT)
+    if "Type" not in df:
+        df["Type"] = df["Asset_Class"] if "Asset_Class" in df else "Unclassified"
+    if "Asset_Class" not in df:
+        df["Asset_Class"] = df["Type"]
+    # Bond terms; positions without them are not analysed as bonds
+    if "Coupon" not in df:
+        df["Coupon"] = float("nan")
+    if "Maturity" not in df:
+        df["Maturity"] = pd.NaT
+    return df
+
+
+POSITIONS = TableSchema(
+    name="positions",
+    dtypes={
+        "Symbol": CATEGORICAL,
+        "Description": TEXT,
+        "Type": CATEGORICAL,
+        "Asset_Class": CATEGORICAL,
+        "Quantity": FLOAT,
+        "Cost_Basis": FLOAT,
+        "Close_Price": FLOAT,
+        "Market_Value": FLOAT,
+        "Unrealized_PL": FLOAT,
+        "MTD_PL": FLOAT,
+        "YTD_PL": FLOAT,
+        "Coupon": FLOAT,  # Annual coupon rate in percent
+        "Maturity": DATE,
+    },
+    required=("Symbol", "Quantity", "Cost_Basis", "Market_Value"),
+    aliases={
+        "ticker": "Symbol",
+        "name": "Description",
+        "units": "Quantity",
+        "price": "Close_Price",
+        "unrealized_p_l": "Unrealized_PL",
+        "mtd_p_l": "MTD_PL",
+        "ytd_p_l": "YTD_PL",
+        "coupon_rate": "Coupon",
+        "maturity_date": "Maturity",
+    },
+    complete=_complete_positions,
+)
+
+CASH_FLOWS = TableSchema(
+    name="cash flows",
+    dtypes={"Description": TEXT, "MTD": FLOAT, "YTD": FLOAT},
+    required=("Description", "MTD", "YTD"),
+)
+# Balance rows of a cash report; every other row is a flow
+STARTING_CASH = "Starting Cash"
+ENDING_CASH = "Ending Cash"
+
+# Coupon and maturity per symbol, for books whose positions do not carry them
+BOND_TERMS = TableSchema(
+    name="bond terms",
+    dtypes={"Symbol": CATEGORICAL, "Coupon": FLOAT, "Maturity": DATE},
+    required=("Symbol", "Coupon", "Maturity"),
+    aliases={"ticker": "Symbol", "coupon_rate": "Coupon", "maturity_date": "Maturity"},
+)
+
+
+def ending_cash(cash_flows: pd.DataFrame) -> float | None:
+    """The book's cash balance: its ``Ending Cash`` row, else the starting balance plus the MTD flows.
+
+    ``None`` when the cash flows state neither balance.
+    """
+    description = cash_flows["Description"]
+    ending = cash_flows.loc[description == ENDING_CASH, "MTD"]
+    if len(ending):
+        return float(ending.iloc[-1])
+    if not (description == STARTING_CASH).any():
+        return None
+    return float(cash_flows["MTD"].sum())
+
+
+def with_bond_terms(positions: pd.DataFrame, terms: pd.DataFrame) -> pd.DataFrame:
+    """A copy of ``positions`` with ``Coupon``/``Maturity`` filled in from ``terms`` by symbol.
+
+    Terms the positions already carry are kept.
+    """
+    terms = terms.drop_duplicates("Symbol", keep="last")
+    known = pd.Index(terms["Symbol"].astype(TEXT))
+    held = positions["Symbol"].astype(TEXT)
+    out = positions.copy()
+    for column in ("Coupon", "Maturity"):
+        out[column] = positions[column].fillna(held.map(pd.Series(terms[column].to_numpy(), index=known)))
+    return out.astype({"Coupon": FLOAT, "Maturity": DATE})
+
+
+def read_table(path: str | os.PathLike, schema: TableSchema) -> pd.DataFrame:
+    """Read ``path`` (by extension: CSV, Parquet or Arrow/Feather) into ``schema``."""
+    path = Path(path)
+    suffix = path.suffix.lower()
+    try:
+        if suffix == ".csv":
+            mapping = schema.resolve(list(pd.read_csv(path, nrows=0).columns))
+            df = pd.read_csv(
+                path,
+                usecols=list(mapping),
+                dtype={source: schema.dtypes[column] for source, column in mapping.items()},
+                engine="pyarrow",
+            )
+        elif suffix in (".parquet", ".pq"):
+            mapping = schema.resolve(pq.read_schema(path).names)
+            df = pd.read_parquet(path, columns=list(mapping))
+        elif suffix in (".arrow", ".feather", ".ipc"):
+            mapping = schema.resolve(feather.read_table(path, columns=[]).column_names)
+            df = feather.read_feather(path, columns=list(mapping))
+        else:
+            raise PortfolioSchemaError(f"{path.name}: unsupported file type {suffix!r}")
+        df = df.rename(columns=mapping)
+        # A no-op for CSV; columnar files may carry e.g. float32 or plain strings
+        df = df.astype({column: schema.dtypes[column] for column in df.columns})
+    except (ValueError, TypeError) as exc:
+        if isinstance(exc, PortfolioSchemaError):
+            raise
+        raise PortfolioSchemaError(f"{path.name}: {exc}") from exc
+
+    if schema.complete is not None:
+        df = schema.complete(df)
+    df = df[list(schema.dtypes)].astype(schema.dtypes)
+    return df.reset_index(drop=True)
+
+
+class PortfolioLoader:
+    """Parsed portfolio tables, re-read only when the file's content changes."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # (path, schema name) -> (mtime_ns, size, content digest, frame)
+        self._memo: dict[tuple[str, str], tuple[int, int, str, pd.DataFrame]] = {}
+
+    def positions(self, path: str | os.PathLike) -> pd.DataFrame:
+        return self.load(path, POSITIONS)
+
+    def cash_flows(self, path: str | os.PathLike) -> pd.DataFrame:
+        return self.load(path, CASH_FLOWS)
+
+    def bond_terms(self, path: str | os.PathLike) -> pd.DataFrame:
+        return self.load(path, BOND_TERMS)
+
+    def load(self, path: str | os.PathLike, schema: TableSchema) -> pd.DataFrame:
+        """The typed table in ``path``; the returned frame is shared and read-only."""
+        path = Path(path).resolve()
+        key = (str(path), schema.name)
+        stat = path.stat()
+        with self._lock:
+            entry = self._memo.get(key)
+            if entry is not None and entry[:2] == (stat.st_mtime_ns, stat.st_size):
+                annotate(HIT)
+                return entry[3]
+
+        digest = file_digest(path)
+        if entry is not None and entry[2] == digest:
+            df = entry[3]  # Touched but unchanged
+            annotate(HIT)
+        else:
+            df = read_table(path, schema)
+            annotate(MISS)
+        with self._lock:
+            self._memo[key] = (stat.st_mtime_ns, stat.st_size, digest, df)
+        return df
+
+
+def _key(name: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", str(name).lower()).strip("_")
+
+
+def file_digest(path: str | os.PathLike) -> str:
+    """Content hash of a file, read in 1 MiB chunks."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
@@ -0,0 +1,137 @@
+"""Plotly figures of the portfolio dashboard, shared with the batch reports.
+
+Each builder takes the typed frames from ``shared.portfolio`` and returns a
+new figure; none of them touches Streamlit. Plotly is imported by the
+builders themselves, so the dashboard draws its header before it loads.
+"""
+
+
+def build_allocation_figure(positions_df):
+    import plotly.express as px
+
+    fig_allocation = px.pie(
+        positions_df,
+        values='Market_Value',
+        names='Symbol',
+        title="Portfolio Allocation by Market Value",
+        color_discrete_sequence=px.colors.qualitative.Set3,
+        height=400
+    )
+    fig_allocation.update_traces(
+        textposition='inside',
+        textinfo='percent+label',
+        hovertemplate='<b>%{label}</b><br>Value: $%{value:,.2f}<br>Percentage: %{percent}<extra></extra>'
+    )
+    fig_allocation.update_layout(
+        showlegend=True,
+        font_size=12,
+        title_font_size=16,
+        margin=dict(t=40, b=0, l=0, r=0)
+    )
+    return fig_allocation
+
+
+def build_performance_figure(positions_df):
+    import pandas as pd
+    import plotly.graph_objects as go
+
+    pl_comparison = pd.DataFrame({
+        'Symbol': positions_df['Symbol'],
+        'MTD P&L': positions_df['MTD_PL'],
+        'YTD P&L': positions_df['YTD_PL'],
+        'Unrealized P&L': positions_df['Unrealized_PL']
+    })
+    
+    fig_performance = go.Figure()
+    
+    fig_performance.add_trace(go.Bar(
+        name='MTD P&L',
+        x=pl_comparison['Symbol'],
+        y=pl_comparison['MTD P&L'],
+        marker_color='lightblue',
+        hovertemplate='<b>%{x}</b><br>MTD P&L: $%{y:,.2f}<extra></extra>'
+    ))
+    
+    fig_performance.add_trace(go.Bar(
+        name='YTD P&L',
+        x=pl_comparison['Symbol'],
+        y=pl_comparison['YTD P&L'],
+        marker_color='darkblue',
+        hovertemplate='<b>%{x}</b><br>YTD P&L: $%{y:,.2f}<extra></extra>'
+    ))
+    
+    fig_performance.update_layout(
+        title="P&L Performance Comparison",
+        xaxis_title="Securities",
+        yaxis_title="P&L ($)",
+        barmode='group',
+        height=400,
+        font_size=12,
+        title_font_size=16,
+        margin=dict(t=40, b=0, l=0, r=0)
+    )
+    return fig_performance
+
+
+def build_types_figure(positions_df):
+    import plotly.express as px
+
+    type_summary = positions_df.groupby('Type', observed=True).agg({
+        'Market_Value': 'sum',
+        'Unrealized_PL': 'sum'
+    }).reset_index()
+    
+    fig_types = px.bar(
+        type_summary,
+        x='Type',
+        y='Market_Value',
+        title="Portfolio Value by Bond Type",
+        color='Unrealized_PL',
+        color_continuous_scale='RdYlGn',
+        height=400,
+        text='Market_Value'
+    )
+    
+    fig_types.update_traces(
+        texttemplate='$%{text:,.0f}',
+        textposition='outside',
+        hovertemplate='<b>%{x}</b><br>Market Value: $%{y:,.2f}<br>Unrealized P&L: $%{color:,.2f}<extra></extra>'
+    )
+    
+    fig_types.update_layout(
+        xaxis_title="Bond Type",
+        yaxis_title="Market Value ($)",
+        font_size=12,
+        title_font_size=16,
+        margin=dict(t=40, b=0, l=0, r=0)
+    )
+    return fig_types
+
+
+def build_cashflow_figure(cash_flow_df):
+    import plotly.graph_objects as go
+
+    # Prepare cash flow data for visualization; the balances are not flows
+    cash_flow_viz = cash_flow_df[~cash_flow_df['Description'].isin(['Starting Cash', 'Ending Cash'])].copy()
+    
+    fig_cashflow = go.Figure()
+    
+    fig_cashflow.add_trace(go.Bar(
+        name='MTD',
+        x=cash_flow_viz['Description'],
+        y=cash_flow_viz['MTD'],
+        marker_color=['red' if x < 0 else 'green' for x in cash_flow_viz['MTD']],
+        hovertemplate='<b>%{x}</b><br>MTD: $%{y:,.2f}<extra></extra>'
+    ))
+    
+    fig_cashflow.update_layout(
+        title="Month-to-Date Cash Flows",
+        xaxis_title="Category",
+        yaxis_title="Amount ($)",
+        height=400,
+        font_size=12,
+        title_font_size=16,
+        margin=dict(t=40, b=0, l=0, r=0),
+        xaxis={'tickangle': 45}
+    )
+    return fig_cashflow
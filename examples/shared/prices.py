@@ -0,0 +1,279 @@
+"""Price loading for many tickers at once.
+
+``load_prices`` fetches OHLCV history for a whole ticker list in one batched
+request when the source supports it, and otherwise through a bounded thread
+pool. Failures are reported per ticker instead of aborting the whole load.
+Ticker metadata (``yf.Ticker.info``) is never requested. Yahoo requests go
+through the process-wide ``FetchScheduler``, so concurrent sessions asking
+for the same history share one request.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Protocol
+
+import numpy as np
+import pandas as pd
+
+from .scheduler import FetchScheduler, get_scheduler
+
+OHLCV_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+# Approximate number of trading days per yfinance period string
+PERIOD_BARS = {
+    "5d": 5,
+    "1mo": 21,
+    "3mo": 63,
+    "6mo": 126,
+    "1y": 252,
+    "2y": 504,
+    "5y": 1260,
+    "10y": 2520,
+}
+
+DEFAULT_MAX_WORKERS = 8
+# Rate and concurrency limits of every Yahoo endpoint are accounted together
+YAHOO_HOST = "finance.yahoo.com"
+
+
+class PriceSource(Protocol):
+    """Anything that can return the OHLCV history of a single ticker.
+
+    When ``start`` is given it takes precedence over ``period`` and the history
+    runs from that date to today.
+    """
+
+    def history(self, ticker: str, period: str, start: str | None = None) -> pd.DataFrame: ...
+
+
+@dataclass
+class PriceLoadResult:
+    """Histories that loaded, plus an error message for each ticker that did not."""
+
+    histories: dict[str, pd.DataFrame] = field(default_factory=dict)
+    errors: dict[str, str] = field(default_factory=dict)
+    elapsed: float = 0.0
+
+
+class YFinanceSource:
+    """Yahoo Finance through yfinance, batching all tickers into one download."""
+
+    def __init__(self, timeout: float = 10, scheduler: FetchScheduler | None = None):
+        self.timeout = timeout
+        self.scheduler = scheduler if scheduler is not None else get_scheduler()
+
+    def history(self, ticker: str, period: str, start: str | None = None) -> pd.DataFrame:
+        key = ("history", ticker, period, start)
+        return self.scheduler.call(key, YAHOO_HOST, self._history, ticker, period, start)
+
+    def download(
+        self, tickers: list[str], period: str, start: str | None = None
+    ) -> dict[str, pd.DataFrame]:
+        key = ("download", tuple(tickers), period, start)
+        return self.scheduler.call(key, YAHOO_HOST, self._download, tickers, period, start)
+
+    def _history(self, ticker: str, period: str, start: str | None) -> pd.DataFrame:
+        import yfinance as yf
+
+        span = {"start": start} if start else {"period": period}
+        hist = yf.Ticker(ticker).history(**span, auto_adjust=True, timeout=self.timeout)
+        return _normalize(hist)
+
+    def _download(self, tickers: list[str], period: str, start: str | None) -> dict[str, pd.DataFrame]:
+        import yfinance as yf
+
+        span = {"start": start} if start else {"period": period}
+        raw = yf.download(
+            tickers,
+            **span,
+            auto_adjust=True,
+            group_by="ticker",
+            threads=True,
+            progress=False,
+            timeout=self.timeout,
+        )
+        if raw is None or raw.empty:
+            return {}
+        return split_download(raw, tickers)
+
+
+class SyntheticPriceSource:
+    """Deterministic random-walk bars for offline runs and benchmarks.
+
+    ``latency`` simulates the per-request network round trip, so loaders can be
+    compared without touching the network. Tickers listed in ``fail`` raise.
+    With ``tz`` the bars are indexed in that zone, like yfinance's.
+    """
+
+    def __init__(
+        self, latency: float = 0.0, fail: tuple[str, ...] = (), end: str | None = None, tz: str | None = None
+    ):
+        self.latency = latency
+        self.fail = set(fail)
+        self.end = pd.Timestamp(end) if end else pd.Timestamp.today().normalize()
+        self.tz = tz
+
+    def history(self, ticker: str, period: str, start: str | None = None) -> pd.DataFrame:
+        if self.latency:
+            time.sleep(self.latency)
+        if ticker in self.fail:
+            raise ValueError(f"synthetic failure for {ticker}")
+        if start:
+            # Same random walk as a long fetch, so incremental tails line up
+            hist = synthetic_history(ticker, PERIOD_BARS["10y"], end=self.end)
+            hist = hist[hist.index >= pd.Timestamp(start)]
+        else:
+            hist = synthetic_history(ticker, PERIOD_BARS.get(period, 126), end=self.end)
+        return hist.tz_localize(self.tz) if self.tz else hist
+
+
+class CsvPriceSource:
+    """Reads ``<TICKER>.csv`` files (Date index plus OHLCV columns) from a directory."""
+
+    def __init__(self, directory: str | os.PathLike):
+        self.directory = Path(directory)
+
+    def history(self, ticker: str, period: str, start: str | None = None) -> pd.DataFrame:
+        path = self.directory / f"{ticker}.csv"
+        if not path.exists():
+            raise FileNotFoundError(f"no local data at {path}")
+        hist = _normalize(pd.read_csv(path, index_col=0, parse_dates=True))
+        if start:
+            return hist[hist.index >= pd.Timestamp(start)]
+        return hist.tail(PERIOD_BARS.get(period, len(hist)))
+
+
+def synthetic_history(ticker: str, bars: int, end: pd.Timestamp | None = None) -> pd.DataFrame:
+    """Generate ``bars`` business-day OHLCV rows, seeded by the ticker symbol."""
+    rng = np.random.default_rng(zlib.crc32(ticker.encode()))
+    end = end if end is not None else pd.Timestamp.today().normalize()
+    # Draw the full walk and keep its tail, so shorter periods are suffixes
+    # of longer ones just like real history
+    total = max(bars, PERIOD_BARS["10y"])
+    index = pd.bdate_range(end=end, periods=total, name="Date")[-bars:]
+    start_price = rng.uniform(20, 500)
+    close = start_price * np.exp(np.cumsum(rng.normal(0.0003, 0.02, total)))[-bars:]
+    open_ = close * (1 + rng.normal(0, 0.005, total)[-bars:])
+    spread = np.abs(rng.normal(0, 0.01, total))[-bars:]
+    return pd.DataFrame(
+        {
+            "Open": open_,
+            "High": np.maximum(open_, close) * (1 + spread),
+            "Low": np.minimum(open_, close) * (1 - spread),
+            "Close": close,
+            "Volume": rng.integers(1_000_000, 50_000_000, total)[-bars:].astype(float),
+        },
+        index=index,
+    )
+
+
+def split_download(raw: pd.DataFrame, tickers: list[str]) -> dict[str, pd.DataFrame]:
+    """Split a multi-ticker ``yf.download`` frame into one frame per ticker."""
+    if not isinstance(raw.columns, pd.MultiIndex):
+        return {tickers[0]: _normalize(raw)} if len(tickers) == 1 else {}
+
+    level = 0 if set(raw.columns.get_level_values(0)) & set(tickers) else 1
+    available = set(raw.columns.get_level_values(level))
+    out = {}
+    for ticker in tickers:
+        if ticker not in available:
+            continue
+        hist = _normalize(raw.xs(ticker, axis=1, level=level))
+        if not hist.empty:
+            out[ticker] = hist
+    return out
+
+
+def get_price_source() -> PriceSource:
+    """Pick the source from ``FINAGENT_PRICE_SOURCE``.
+
+    ``daemon`` reads through the local market-data server and is the default
+    when ``FINAGENT_MARKET_DATA_SOCKET`` is set; otherwise see
+    ``upstream_price_source``.
+    """
+    name = os.environ.get("FINAGENT_PRICE_SOURCE", "").strip()
+    if name == "daemon" or (not name and os.environ.get("FINAGENT_MARKET_DATA_SOCKET")):
+        from .market_data import DaemonPriceSource
+
+        return DaemonPriceSource()
+    return upstream_price_source(name)
+
+
+def upstream_price_source(name: str | None = None) -> PriceSource:
+    """``yfinance`` (default), ``synthetic``, or a directory of per-ticker CSV files.
+
+    ``name`` defaults to ``FINAGENT_PRICE_SOURCE``; the daemon itself uses this
+    so it never routes requests back to itself.
+    """
+    if name is None:
+        name = os.environ.get("FINAGENT_PRICE_SOURCE", "").strip()
+    if name in ("", "yfinance", "daemon"):
+        return YFinanceSource()
+    if name == "synthetic":
+        return SyntheticPriceSource()
+    return CsvPriceSource(name)
+
+
+def load_prices(
+    tickers: list[str],
+    period: str,
+    source: PriceSource | None = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    start: str | None = None,
+) -> PriceLoadResult:
+    """Fetch history for all ``tickers`` concurrently.
+
+    Sources with a ``download(tickers, period, start)`` method get a single batched
+    request; tickers it does not return are retried individually. Everything
+    else goes through a thread pool of at most ``max_workers`` threads.
+    """
+    source = source if source is not None else YFinanceSource()
+    tickers = list(dict.fromkeys(tickers))
+    result = PriceLoadResult()
+    started = time.perf_counter()
+
+    pending = tickers
+    if hasattr(source, "download") and tickers:
+        try:
+            result.histories.update(source.download(tickers, period, start=start))
+        except Exception:
+            # Fall back to per-ticker requests, which report errors individually
+            pass
+        pending = [t for t in tickers if t not in result.histories]
+
+    if pending:
+        workers = max(1, min(max_workers, len(pending)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prices") as pool:
+            futures = {
+                ticker: pool.submit(source.history, ticker, period, start=start)
+                for ticker in pending
+            }
+            for ticker, future in futures.items():
+                try:
+                    hist = future.result()
+                except Exception as e:
+                    result.errors[ticker] = str(e)
+                    continue
+                if hist is None or hist.empty:
+                    result.errors[ticker] = "No price data returned"
+                else:
+                    result.histories[ticker] = hist
+
+    result.histories = {t: result.histories[t] for t in tickers if t in result.histories}
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+def _normalize(hist: pd.DataFrame) -> pd.DataFrame:
+    """Keep the OHLCV columns and drop rows without a close."""
+    columns = [c for c in OHLCV_COLUMNS if c in hist.columns]
+    hist = hist[columns]
+    if "Close" in hist.columns:
+        hist = hist.dropna(subset=["Close"])
+    return hist
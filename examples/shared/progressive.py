@@ -0,0 +1,128 @@
+"""Concurrent loading for pages that draw each result as soon as it arrives.
+
+A Streamlit script can only write to the page from its own thread, so the
+loaders run on a thread pool and hand their results back through a queue;
+the script drains it and fills placeholders in as results come in:
+
+    pipeline = LoadPipeline()
+    for ticker in tickers:
+        pipeline.submit("prices", ticker, store.get, [ticker], period)
+    pipeline.stream("news", ingester.iter_fetch, key=lambda update: update.name)
+    for batch in pipeline.batches():
+        ...  # draw what arrived, then pipeline.first_content()
+
+``batches`` blocks until something arrives, then also takes everything
+else that has arrived meanwhile, so a burst of fast results is drawn once
+rather than once per result. Loaders run in a copy of the script's context,
+so their spans land in the current instrumentation run.
+
+The pipeline times the page from its creation (or ``started``) to the
+first call of ``first_content`` and to the last result, and records both as
+``mark``s of the instrumentation run.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator
+
+from .instrumentation import mark
+
+FIRST_CONTENT = "first_content"
+LOADED = "loaded"
+
+
+@dataclass
+class Arrival:
+    """One loader result: ``value``, or the ``error`` the loader raised."""
+
+    kind: str
+    key: object
+    value: object = None
+    error: BaseException | None = None
+
+
+# Put by a loader when it has nothing more to deliver
+_DONE = object()
+
+
+class LoadPipeline:
+    """Runs loaders concurrently and delivers their results to the script thread in arrival order."""
+
+    def __init__(self, max_workers: int = 8, started: float | None = None):
+        self.started = time.perf_counter() if started is None else started
+        self.first_content_at: float | None = None
+        self.finished_at: float | None = None
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="load")
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._pending = 0
+
+    def submit(self, kind: str, key, fn: Callable, *args, **kwargs) -> None:
+        """Run ``fn(*args, **kwargs)``; its result arrives as one ``Arrival``."""
+
+        def load(put):
+            put(Arrival(kind, key, fn(*args, **kwargs)))
+
+        self._start(kind, key, load)
+
+    def stream(self, kind: str, fn: Callable[..., Iterable], *args, key: Callable = None, **kwargs) -> None:
+        """Iterate ``fn(*args, **kwargs)``; every item arrives on its own, keyed by ``key(item)``."""
+
+        def load(put):
+            for item in fn(*args, **kwargs):
+                put(Arrival(kind, key(item) if key else None, item))
+
+        self._start(kind, None, load)
+
+    def _start(self, kind, key, load) -> None:
+        self._pending += 1
+        context = contextvars.copy_context()
+
+        def run():
+            try:
+                context.run(load, self._queue.put)
+            except Exception as e:
+                self._queue.put(Arrival(kind, key, error=e))
+            finally:
+                self._queue.put(_DONE)
+
+        self._pool.submit(run)
+
+    def batches(self) -> Iterator[list[Arrival]]:
+        """Results as they arrive; whatever arrived together comes as one batch."""
+        while self._pending:
+            batch = []
+            item = self._queue.get()
+            while True:
+                if item is _DONE:
+                    self._pending -= 1
+                else:
+                    batch.append(item)
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                yield batch
+        self._pool.shutdown(wait=False)
+        if self.finished_at is None:
+            self.finished_at = time.perf_counter()
+            mark(LOADED)
+
+    def first_content(self) -> None:
+        """Note that the page shows real content now; only the first call counts."""
+        if self.first_content_at is None:
+            self.first_content_at = time.perf_counter()
+            mark(FIRST_CONTENT)
+
+    @property
+    def time_to_first_content(self) -> float | None:
+        return None if self.first_content_at is None else self.first_content_at - self.started
+
+    @property
+    def load_time(self) -> float | None:
+        return None if self.finished_at is None else self.finished_at - self.started
@@ -0,0 +1,309 @@
+"""Headless batch rendering of the portfolio dashboard to static HTML.
+
+    python -m shared.reports books/ --out reports/ --workers 4 --max-memory-mb 1024
+
+A book is a positions file (CSV, Parquet or Arrow) or a directory holding
+``positions.*`` and optionally ``cash_flow.*``, like the dashboard's
+``data/``; a directory of such books is expanded. Every book is loaded with
+``PortfolioLoader`` and drawn with the dashboard's own figure builders.
+
+Plotly's JavaScript is written once, as ``plotly.min.js`` next to the
+reports, and every report references it, so the output directory is
+self-contained without each file carrying several megabytes of the same
+script; ``--inline-js`` embeds it in every file instead.
+
+Books are spread over a pool of ``--workers`` processes. Each worker caps
+its data segment at ``--max-memory-mb`` where the platform enforces it, so
+an oversized book fails with ``MemoryError`` instead of exhausting the
+machine, and the pool is replaced after ``--books-per-worker`` books per
+worker. The run ends with ``manifest.json``: every book's status, timing
+and peak RSS, and the throughput in reports per minute.
+"""
+
+from __future__ import annotations
+
+import argparse
+import html
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from pathlib import Path
+
+import pandas as pd
+
+from .portfolio import PortfolioLoader
+from .portfolio_charts import (
+    build_allocation_figure,
+    build_cashflow_figure,
+    build_performance_figure,
+    build_types_figure,
+)
+from .portfolio_metrics import book_metrics
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+BOOK_SUFFIXES = (".csv", ".parquet", ".pq", ".arrow", ".feather", ".ipc")
+PLOTLY_JS = "plotly.min.js"
+MANIFEST = "manifest.json"
+# Largest positions listed in a report's table
+TABLE_ROWS = 50
+
+
+@dataclass(frozen=True)
+class Book:
+    name: str
+    positions: str
+    cash_flows: str | None = None
+
+
+def discover_books(paths: list[str | os.PathLike]) -> list[Book]:
+    """Books named by ``paths``: files, book directories, or directories of either."""
+    books = []
+    for path in map(Path, paths):
+        if path.is_file():
+            books.append(Book(path.stem, str(path)))
+        elif _find(path, "positions") is not None:
+            books.append(_directory_book(path))
+        elif path.is_dir():
+            for child in sorted(path.iterdir()):
+                if child.is_dir() and _find(child, "positions") is not None:
+                    books.append(_directory_book(child))
+                elif child.is_file() and child.suffix.lower() in BOOK_SUFFIXES:
+                    books.append(Book(child.stem, str(child)))
+        else:
+            raise FileNotFoundError(f"no portfolio book at {path}")
+
+    # Report file names must be unique
+    seen: dict[str, int] = {}
+    unique = []
+    for book in books:
+        count = seen.get(book.name, 0)
+        seen[book.name] = count + 1
+        unique.append(book if count == 0 else Book(f"{book.name}-{count + 1}", book.positions, book.cash_flows))
+    return unique
+
+
+def render_report(book: Book, positions_df: pd.DataFrame, cash_flow_df: pd.DataFrame | None, plotly_js: str) -> str:
+    """The report page for one book; ``plotly_js`` is a ``<script>`` tag."""
+    import plotly.io as pio
+
+    figures = [
+        build_allocation_figure(positions_df),
+        build_performance_figure(positions_df),
+        build_types_figure(positions_df),
+    ]
+    if cash_flow_df is not None and not cash_flow_df.empty:
+        figures.append(build_cashflow_figure(cash_flow_df))
+    charts = "".join(
+        f'<div class="chart">{pio.to_html(fig, include_plotlyjs=False, full_html=False)}</div>' for fig in figures
+    )
+
+    kpis = book_metrics(positions_df, book.name)
+    cards = "".join(
+        f'<div class="kpi"><span>{label}</span><strong>${value:,.2f}</strong>{delta}</div>'
+        for label, value, delta in (
+            ("Portfolio Value", kpis["market_value"], ""),
+            ("Unrealized P&amp;L", kpis["unrealized_pl"], f'<em>{kpis["total_return_pct"]:+.2f}%</em>'),
+            ("MTD P&amp;L", kpis["mtd_pl"], f'<em>{kpis["mtd_return_pct"]:+.2f}%</em>'),
+            ("YTD P&amp;L", kpis["ytd_pl"], f'<em>{kpis["ytd_return_pct"]:+.2f}%</em>'),
+        )
+    )
+
+    largest = positions_df.nlargest(TABLE_ROWS, "Market_Value")
+    table = largest[["Symbol", "Description", "Type", "Quantity", "Market_Value", "Unrealized_PL", "YTD_PL"]].to_html(
+        index=False, float_format=lambda v: f"{v:,.2f}", classes="positions", border=0
+    )
+    shown = f"{len(positions_df):,} positions"
+    if len(largest) < len(positions_df):
+        shown = f"Largest {len(largest)} of {shown}"
+    title = html.escape(book.name)
+    return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Portfolio report: {title}</title>{plotly_js}
+<style>
+body {{ font-family: -apple-system, "Segoe UI", Roboto, sans-serif; margin: 2rem; color: #1f2937; }}
+.kpis {{ display: flex; gap: 1rem; margin: 1rem 0 2rem; }}
+.kpi {{ flex: 1; padding: 1rem; border-radius: 8px; background: #f3f4f6; }}
+.kpi span {{ display: block; font-size: .85rem; color: #6b7280; }}
+.kpi strong {{ font-size: 1.4rem; }} .kpi em {{ display: block; font-style: normal; color: #4b5563; }}
+.charts {{ display: grid; grid-template-columns: 1fr 1fr; gap: 1rem; }}
+table.positions {{ border-collapse: collapse; width: 100%; font-size: .85rem; }}
+table.positions th, table.positions td {{ padding: .3rem .6rem; border-bottom: 1px solid #e5e7eb; text-align: right; }}
+</style></head>
+<body>
+<h1>📊 Portfolio report: {title}</h1>
+<p>Generated {time.strftime("%Y-%m-%d %H:%M:%S")}</p>
+<div class="kpis">{cards}</div>
+<div class="charts">{charts}</div>
+<h2>📋 Positions</h2><p>{shown}</p>
+{table}
+</body></html>
+"""
+
+
+# One loader per worker process; repeated books are parsed once
+_loader: PortfolioLoader | None = None
+
+
+def render_book(book: Book, out_dir: str, inline_js: bool = False) -> dict:
+    """Load, render and write one book; runs in a worker process and never raises."""
+    global _loader
+    started = time.perf_counter()
+    record = {"book": book.name, "positions_file": book.positions, "status": "ok"}
+    try:
+        if _loader is None:
+            _loader = PortfolioLoader()
+        positions_df = _loader.positions(book.positions)
+        cash_flow_df = _loader.cash_flows(book.cash_flows) if book.cash_flows else None
+        if inline_js:
+            from plotly.offline import get_plotlyjs
+
+            plotly_js = f'<script type="text/javascript">{get_plotlyjs()}</script>'
+        else:
+            plotly_js = f'<script src="{PLOTLY_JS}"></script>'
+        page = render_report(book, positions_df, cash_flow_df, plotly_js)
+        output = Path(out_dir) / f"{book.name}.html"
+        output.write_text(page, encoding="utf-8")
+        record.update(output=output.name, positions=len(positions_df), bytes=len(page.encode("utf-8")))
+    except Exception as e:  # MemoryError included; the batch goes on
+        record.update(status="failed", error=f"{type(e).__name__}: {e}")
+    record["seconds"] = round(time.perf_counter() - started, 4)
+    record["peak_rss_mb"] = _peak_rss_mb()
+    record["pid"] = os.getpid()
+    return record
+
+
+def run_batch(
+    books: list[Book],
+    out_dir: str | os.PathLike,
+    workers: int | None = None,
+    max_memory_mb: int | None = None,
+    books_per_worker: int | None = 50,
+    inline_js: bool = False,
+    progress=None,
+) -> dict:
+    """Render ``books`` into ``out_dir`` on a process pool and write the manifest."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(books) or 1))
+    if not inline_js:
+        from plotly.offline import get_plotlyjs
+
+        (out_dir / PLOTLY_JS).write_text(get_plotlyjs(), encoding="utf-8")
+
+    started = time.perf_counter()
+    records = []
+    # Workers are replaced by starting a fresh pool per wave of books, not with
+    # max_tasks_per_child, which can deadlock on Python 3.11 once workers are replaced
+    wave = workers * books_per_worker if books_per_worker else len(books)
+    for i in range(0, len(books), wave or 1):
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_limit_memory,
+            initargs=(max_memory_mb,),
+        ) as pool:
+            futures = {pool.submit(render_book, book, str(out_dir), inline_js): book for book in books[i : i + wave]}
+            for future in as_completed(futures):
+                try:
+                    record = future.result()
+                except BrokenProcessPool as e:
+                    # A worker was killed from outside, e.g. by the OOM killer
+                    book = futures[future]
+                    record = {
+                        "book": book.name,
+                        "positions_file": book.positions,
+                        "status": "failed",
+                        "error": f"worker died: {e}",
+                    }
+                records.append(record)
+                if progress is not None:
+                    progress(record)
+    elapsed = time.perf_counter() - started
+
+    succeeded = sum(r["status"] == "ok" for r in records)
+    manifest = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "books": len(books),
+        "succeeded": succeeded,
+        "failed": len(records) - succeeded,
+        "workers": workers,
+        "max_memory_mb": max_memory_mb,
+        "wall_seconds": round(elapsed, 3),
+        "reports_per_minute": round(succeeded / elapsed * 60, 1) if elapsed else None,
+        "plotly_js": None if inline_js else PLOTLY_JS,
+        "reports": sorted(records, key=lambda r: r["book"]),
+    }
+    tmp = out_dir / f"{MANIFEST}.tmp"
+    tmp.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    os.replace(tmp, out_dir / MANIFEST)
+    return manifest
+
+
+def _limit_memory(max_memory_mb: int | None) -> None:
+    if max_memory_mb and resource is not None:
+        limit = max_memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_DATA, (limit, limit))
+
+
+def _peak_rss_mb() -> float | None:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024, 1)
+
+
+def _find(directory: Path, stem: str) -> Path | None:
+    if not directory.is_dir():
+        return None
+    for suffix in BOOK_SUFFIXES:
+        candidate = directory / f"{stem}{suffix}"
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def _directory_book(directory: Path) -> Book:
+    cash_flows = _find(directory, "cash_flow")
+    name = directory.resolve().name
+    return Book(name, str(_find(directory, "positions")), str(cash_flows) if cash_flows else None)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Render portfolio books to static HTML reports")
+    parser.add_argument("books", nargs="+", help="positions files, book directories, or directories of books")
+    parser.add_argument("--out", default="reports", help="output directory (default: reports)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--max-memory-mb", type=int, default=None, help="per-worker memory cap")
+    parser.add_argument("--books-per-worker", type=int, default=50, help="books before a worker is replaced")
+    parser.add_argument("--inline-js", action="store_true", help="embed plotly.js in every report")
+    parser.add_argument("--quiet", action="store_true", help="only print the summary")
+    args = parser.parse_args()
+
+    def progress(record):
+        if not args.quiet:
+            detail = f"{record.get('seconds', 0):.2f}s" if record["status"] == "ok" else record["error"]
+            print(f"{record['status']:>6}  {record['book']}  {detail}", flush=True)
+
+    books = discover_books(args.books)
+    manifest = run_batch(
+        books, args.out, args.workers, args.max_memory_mb, args.books_per_worker, args.inline_js, progress
+    )
+    print(
+        f"{manifest['succeeded']}/{manifest['books']} reports in {manifest['wall_seconds']:.1f}s "
+        f"({manifest['reports_per_minute']} reports/min, {manifest['workers']} workers) -> "
+        f"{Path(args.out) / MANIFEST}"
+    )
+    if manifest["failed"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
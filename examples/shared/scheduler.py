@@ -0,0 +1,230 @@
+"""Process-wide scheduling of upstream fetches.
+
+Every Streamlit session of a dashboard runs in the same process; when many
+of them miss their caches at once they would all ask Yahoo Finance and the
+RSS feeds for the same things. ``FetchScheduler.call`` sits in front of each
+upstream request:
+
+- single-flight: a call whose key is already in flight waits for that
+  request and shares its result (or exception) instead of sending its own
+- a token bucket per host bounds the request rate, and a semaphore per host
+  bounds how many requests are open at once
+- transient failures (throttling, 5xx, timeouts, dropped connections) are
+  retried with exponential backoff and full jitter, honouring
+  ``Retry-After``
+
+``get_scheduler()`` returns the scheduler shared by the whole process. Its
+counters (``stats()``) show how many calls were coalesced, how long calls
+queued for a slot and how often upstream pushed back; they are also
+exported with the dashboards' Prometheus metrics.
+"""
+
+from __future__ import annotations
+
+import random
+import socket
+import threading
+import time
+import urllib.error
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Callable
+
+from .instrumentation import register_collector
+
+
+@dataclass(frozen=True)
+class HostLimit:
+    """Requests per second (sustained and burst) and open requests allowed for one host."""
+
+    rate: float
+    burst: int
+    concurrency: int
+
+
+DEFAULT_LIMIT = HostLimit(rate=10.0, burst=20, concurrency=8)
+# Yahoo throttles aggressively (HTTP 429) once a client exceeds a few requests per second
+HOST_LIMITS = {
+    "finance.yahoo.com": HostLimit(rate=4.0, burst=10, concurrency=4),
+}
+
+
+class TokenBucket:
+    """Hands out ``rate`` tokens per second, up to ``burst`` at once, in request order."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take a token, sleeping until it is due; returns the seconds waited."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Reserve the token now, so later callers queue behind this one
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+        return wait
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Whether ``exc`` is worth another attempt: throttling, server errors and network hiccups."""
+    if isinstance(exc, urllib.error.HTTPError):
+        return exc.code == 429 or exc.code >= 500
+    if isinstance(exc, urllib.error.URLError) and isinstance(exc.reason, socket.gaierror):
+        return False  # Unknown host; retrying will not resolve it
+    if isinstance(exc, (TimeoutError, ConnectionError, urllib.error.URLError)):
+        return True
+    # yfinance raises its own YFRateLimitError when Yahoo answers 429
+    return "RateLimit" in type(exc).__name__
+
+
+def retry_after(exc: BaseException) -> float | None:
+    """Seconds the server asked us to wait, from a ``Retry-After`` header."""
+    headers = getattr(exc, "headers", None)
+    value = headers.get("Retry-After") if headers is not None else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None  # An HTTP date; fall back to our own backoff
+
+
+class FetchScheduler:
+    """Coalesces, rate-limits and retries upstream calls; thread-safe."""
+
+    def __init__(
+        self,
+        limits: dict[str, HostLimit] | None = None,
+        default_limit: HostLimit = DEFAULT_LIMIT,
+        retries: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 8.0,
+        retryable: Callable[[BaseException], bool] = is_retryable,
+    ):
+        self.limits = dict(HOST_LIMITS if limits is None else limits)
+        self.default_limit = default_limit
+        self.retries = retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retryable = retryable
+        self._lock = threading.Lock()
+        self._flights: dict[object, Future] = {}
+        self._hosts: dict[str, tuple[TokenBucket, threading.BoundedSemaphore]] = {}
+        self._stats = {
+            "requests": 0,
+            "coalesced": 0,
+            "upstream_calls": 0,
+            "retries": 0,
+            "failures": 0,
+            "queue_wait_seconds": 0.0,
+            "max_queue_wait_seconds": 0.0,
+        }
+
+    def call(self, key, host: str, fn: Callable, *args, **kwargs):
+        """``fn(*args, **kwargs)`` against ``host``, shared with concurrent calls for the same ``key``."""
+        with self._lock:
+            self._stats["requests"] += 1
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = Future()
+            else:
+                self._stats["coalesced"] += 1
+        if not leader:
+            return flight.result()
+
+        try:
+            value = self._run(host, fn, args, kwargs)
+        except BaseException as e:
+            flight.set_exception(e)
+            raise
+        else:
+            flight.set_result(value)
+            return value
+        finally:
+            with self._lock:
+                del self._flights[key]
+
+    def _run(self, host, fn, args, kwargs):
+        bucket, slots = self._host(host)
+        for attempt in range(self.retries + 1):
+            queued = time.perf_counter()
+            with slots:
+                bucket.acquire()
+                self._waited(time.perf_counter() - queued)
+                try:
+                    return fn(*args, **kwargs)
+                except Exception as e:
+                    if attempt == self.retries or not self.retryable(e):
+                        with self._lock:
+                            self._stats["failures"] += 1
+                        raise
+                    asked = retry_after(e)
+            # Full jitter keeps many waiting callers from retrying in lockstep
+            delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+            if asked is not None:
+                delay = max(delay, min(asked, self.max_delay))
+            with self._lock:
+                self._stats["retries"] += 1
+            time.sleep(delay)
+
+    def _host(self, host: str) -> tuple[TokenBucket, threading.BoundedSemaphore]:
+        with self._lock:
+            entry = self._hosts.get(host)
+            if entry is None:
+                limit = self.limits.get(host, self.default_limit)
+                entry = self._hosts[host] = (
+                    TokenBucket(limit.rate, limit.burst),
+                    threading.BoundedSemaphore(limit.concurrency),
+                )
+            return entry
+
+    def _waited(self, seconds: float) -> None:
+        with self._lock:
+            self._stats["upstream_calls"] += 1
+            self._stats["queue_wait_seconds"] += seconds
+            self._stats["max_queue_wait_seconds"] = max(self._stats["max_queue_wait_seconds"], seconds)
+
+    def stats(self) -> dict:
+        """Counters since start, plus the share of requests that joined another one in flight."""
+        with self._lock:
+            stats = dict(self._stats)
+        stats["coalescing_ratio"] = stats["coalesced"] / stats["requests"] if stats["requests"] else 0.0
+        return stats
+
+    def prometheus(self) -> list[str]:
+        stats = self.stats()
+        lines = []
+        for metric, kind, help_text, name in (
+            ("finagent_fetch_requests_total", "counter", "Upstream fetches asked for.", "requests"),
+            ("finagent_fetch_coalesced_total", "counter", "Fetches that joined one in flight.", "coalesced"),
+            ("finagent_fetch_upstream_calls_total", "counter", "Requests sent upstream, retries included.", "upstream_calls"),
+            ("finagent_fetch_retries_total", "counter", "Retries after a transient failure.", "retries"),
+            ("finagent_fetch_failures_total", "counter", "Fetches that failed for good.", "failures"),
+            ("finagent_fetch_queue_wait_seconds_total", "counter", "Time spent waiting for a rate or concurrency slot.", "queue_wait_seconds"),
+            ("finagent_fetch_queue_wait_seconds_max", "gauge", "Longest wait for a slot.", "max_queue_wait_seconds"),
+        ):
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} {kind}")
+            lines.append(f"{metric} {stats[name]:.6f}" if isinstance(stats[name], float) else f"{metric} {stats[name]}")
+        return lines
+
+
+_scheduler: FetchScheduler | None = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> FetchScheduler:
+    """The scheduler shared by every session and thread of this process."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = FetchScheduler()
+            register_collector(_scheduler.prometheus)
+        return _scheduler
@@ -0,0 +1,133 @@
+"""Batched, memoized news sentiment scoring.
+
+Scores are keyed by a hash of the article text, so an article is scored by
+TextBlob once and then served from a bounded in-memory LRU or, optionally,
+from an SQLite cache on disk. Labels are derived from the scores in one
+vectorized pass.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .instrumentation import HIT, MISS, annotate
+from .paths import cache_dir
+
+POSITIVE_THRESHOLD = 0.1
+NEGATIVE_THRESHOLD = -0.1
+
+LABEL_EMOJI = {"Positive": "🟢", "Negative": "🔴", "Neutral": "🟡"}
+
+
+def content_key(text: str) -> str:
+    """Stable hash identifying a piece of text in the score caches."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def article_text(titles: pd.Series, summaries: pd.Series) -> pd.Series:
+    """The text that gets scored for each article: title and summary."""
+    return titles.fillna("").astype(str) + " " + summaries.fillna("").astype(str)
+
+
+def label_scores(scores: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Map polarity scores to sentiment labels and emojis using the ±0.1 thresholds."""
+    labels = np.select(
+        [scores > POSITIVE_THRESHOLD, scores < NEGATIVE_THRESHOLD],
+        ["Positive", "Negative"],
+        default="Neutral",
+    )
+    emojis = np.select(
+        [labels == "Positive", labels == "Negative"],
+        [LABEL_EMOJI["Positive"], LABEL_EMOJI["Negative"]],
+        default=LABEL_EMOJI["Neutral"],
+    )
+    return labels, emojis
+
+
+class SentimentEngine:
+    """Scores batches of texts, computing each distinct text only once."""
+
+    def __init__(self, maxsize: int = 10_000, cache_path: str | os.PathLike | None = None):
+        from textblob.sentiments import PatternAnalyzer
+
+        # One analyzer for all texts instead of a TextBlob per article
+        self._analyzer = PatternAnalyzer()
+        self.maxsize = maxsize
+        self._lru: OrderedDict[str, float] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if cache_path is not None:
+            self._db = sqlite3.connect(Path(cache_path), check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS scores (key TEXT PRIMARY KEY, score REAL)")
+
+    @classmethod
+    def persistent(cls, maxsize: int = 10_000) -> "SentimentEngine":
+        """Engine backed by the shared on-disk score cache."""
+        return cls(maxsize=maxsize, cache_path=cache_dir("sentiment") / "scores.sqlite")
+
+    def score(self, texts: Iterable[str]) -> np.ndarray:
+        """Polarity score in [-1, 1] for every text, in input order."""
+        texts = list(texts)
+        keys = [content_key(text) for text in texts]
+        scores = np.empty(len(texts), dtype=np.float64)
+
+        with self._lock:
+            missing: dict[str, list[int]] = {}
+            for i, key in enumerate(keys):
+                if key in self._lru:
+                    self._lru.move_to_end(key)
+                    scores[i] = self._lru[key]
+                else:
+                    missing.setdefault(key, []).append(i)
+
+            if missing and self._db is not None:
+                for key, score in self._fetch_stored(list(missing)):
+                    scores[missing.pop(key)] = score
+                    self._remember(key, score)
+
+            computed = []
+            for key, positions in missing.items():
+                score = self._analyzer.analyze(texts[positions[0]]).polarity
+                scores[positions] = score
+                self._remember(key, score)
+                computed.append((key, score))
+
+            annotate(MISS if computed else HIT)
+            if computed and self._db is not None:
+                with self._db:
+                    self._db.executemany("INSERT OR REPLACE INTO scores VALUES (?, ?)", computed)
+
+        return scores
+
+    def score_articles(self, articles: pd.DataFrame) -> pd.DataFrame:
+        """``score``, ``sentiment`` and ``emoji`` columns for an articles frame."""
+        scores = self.score(article_text(articles["title"], articles["summary"]))
+        labels, emojis = label_scores(scores)
+        return pd.DataFrame(
+            {"score": scores, "sentiment": labels, "emoji": emojis}, index=articles.index
+        )
+
+    def _fetch_stored(self, keys: list[str]) -> list[tuple[str, float]]:
+        rows = []
+        # Stay well below SQLite's bound-parameter limit
+        for i in range(0, len(keys), 500):
+            chunk = keys[i : i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows += self._db.execute(
+                f"SELECT key, score FROM scores WHERE key IN ({placeholders})", chunk
+            ).fetchall()
+        return rows
+
+    def _remember(self, key: str, score: float) -> None:
+        self._lru[key] = score
+        if len(self._lru) > self.maxsize:
+            self._lru.popitem(last=False)
@@ -0,0 +1,415 @@
+"""Offline table extraction from broker statement PDFs.
+
+    python -m shared.statements ../data/account_statement.pdf --workers 4 --book
+
+Statements such as Interactive Brokers' activity statements are generated
+documents: every table cell is drawn as its own run of text. A page is read
+with pypdf into positioned runs, which are grouped into lines by baseline.
+A line of two or more text cells starts a table and names its columns;
+following lines with a number among their cells are its rows, each cell
+placed in the column whose span holds the cell's (estimated) centre. Lines
+less than an em apart are one header or row whose cells wrap. A line of a
+single text cell is a heading and titles the next table.
+
+Pages are extracted in ranges of ``pages_per_task`` on a process pool,
+and the items of each range are cached as JSON under
+``<cache dir>/statements/<file hash>/``, keyed by page range, so a statement
+is only parsed once whatever process asks for it. Each worker opens the file
+itself and reads only its pages, and the pool is replaced after a few
+ranges per worker, so memory stays bounded on statements of several
+hundred pages. Workers only import pypdf; pandas is loaded by the
+functions that build frames. Tables continued on the next page (with their
+header repeated, or not) are joined when the ranges are merged.
+
+``extract_book`` turns the tables into the dashboard's positions and cash
+flows and writes them as Parquet next to the page cache, where
+``PortfolioLoader`` reads them like any other book.
+"""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import json
+import multiprocessing
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .paths import cache_dir
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Bumped when the extraction changes, so cached page ranges are not reused
+EXTRACTOR_VERSION = 2
+DEFAULT_PAGES_PER_TASK = 8
+# Ranges per worker before the pool is replaced, releasing what pypdf cached
+RANGES_PER_WORKER = 4
+# Runs whose baselines are within this fraction of the font size share a line
+LINE_TOLERANCE = 0.3
+# Lines closer than this many ems belong to one header or row (wrapped cell text)
+BLOCK_GAP = 1.0
+# Average glyph width in ems, to estimate where a run of text ends
+GLYPH_WIDTH = 0.5
+
+_NUMBER = re.compile(r"^[+-]?\(?[$€£]?[+-]?(\d{1,3}(,\d{3})+|\d+)?(\.\d+)?\)?%?$")
+
+# Statement columns -> dashboard schema columns
+POSITION_COLUMNS = {
+    "Symbol": "Symbol",
+    "Quantity": "Quantity",
+    "Cost Basis": "Cost_Basis",
+    "Close Price": "Close_Price",
+    "Value": "Market_Value",
+    "Unrealized P/L": "Unrealized_PL",
+}
+PERFORMANCE_COLUMNS = {"Symbol": "Symbol", "MTD": "MTD_PL", "YTD": "YTD_PL"}
+INSTRUMENT_COLUMNS = {"Symbol": "Symbol", "Description": "Description", "Type": "Type"}
+CASH_COLUMNS = {"Description": "Description", "Month to Date": "MTD", "Year to Date": "YTD"}
+# Word of an "Open ... Positions" title -> asset class of its positions
+ASSET_CLASSES = {"bond": "Fixed Income", "stock": "Equity", "option": "Options", "fund": "Funds", "future": "Futures"}
+
+
+class StatementError(ValueError):
+    """A statement PDF cannot be read or holds no open positions."""
+
+
+@dataclass
+class StatementTable:
+    """One table of a statement, joined across the pages it spans."""
+
+    title: str | None
+    columns: list[str]
+    rows: list[list[str]]
+    pages: tuple[int, int]  # First and last page, 0-based
+    bounds: list[float]  # Left edge of every column but the first
+
+    def frame(self) -> pd.DataFrame:
+        import pandas as pd
+
+        return pd.DataFrame(self.rows, columns=self.columns)
+
+
+def extract_tables(
+    path: str | os.PathLike,
+    workers: int | None = None,
+    pages_per_task: int = DEFAULT_PAGES_PER_TASK,
+    use_cache: bool = True,
+) -> list[StatementTable]:
+    """Every table of the statement at ``path``, in page order."""
+    path = Path(path)
+    cache = _cache_dir(path)
+    page_count = _page_count(path)
+    ranges = [(start, min(start + pages_per_task, page_count)) for start in range(0, page_count, pages_per_task)]
+
+    extracted = {}
+    for page_range in ranges:
+        entry = cache / _range_name(page_range)
+        if use_cache and entry.exists():
+            extracted[page_range] = json.loads(entry.read_text(encoding="utf-8"))
+    missing = [page_range for page_range in ranges if page_range not in extracted]
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(missing) or 1))
+    if workers == 1:
+        results = (_extract_range(str(path), *page_range) for page_range in missing)
+        _store(cache, missing, results, extracted)
+    else:
+        # A fresh pool per wave of ranges rather than max_tasks_per_child, which can deadlock
+        # on Python 3.11 when workers are replaced
+        wave = workers * RANGES_PER_WORKER
+        for i in range(0, len(missing), wave):
+            batch = missing[i : i + wave]
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+                starts, stops = zip(*batch)
+                _store(cache, batch, pool.map(_extract_range, [str(path)] * len(batch), starts, stops), extracted)
+
+    return _merge(page for page_range in ranges for page in extracted[page_range])
+
+
+def statement_book(tables: list[StatementTable]) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Positions and cash flows, in the dashboard's column names, from a statement's tables."""
+    import pandas as pd
+
+    positions = []
+    for table in tables:
+        words = _title_words(table)
+        if "open" in words and "positions" in words:
+            frame = _select(table, POSITION_COLUMNS)
+            asset_class = next((ASSET_CLASSES[w.rstrip("s")] for w in words if w.rstrip("s") in ASSET_CLASSES), None)
+            if asset_class is not None:
+                frame["Asset_Class"] = asset_class
+            positions.append(frame)
+    if not positions:
+        raise StatementError("no open positions table found")
+    positions_df = pd.concat(positions, ignore_index=True)
+
+    # Month and year to date P/L, and the descriptions and types of the instruments
+    for keywords, columns in ((("performance", "date"), PERFORMANCE_COLUMNS), (("instrument",), INSTRUMENT_COLUMNS)):
+        table = _find(tables, *keywords)
+        if table is not None and set(columns) <= set(table.columns):
+            details = _select(table, columns).drop_duplicates("Symbol")
+            positions_df = positions_df.merge(details, on="Symbol", how="left")
+
+    cash = _find(tables, "cash", "report")
+    if cash is not None and set(CASH_COLUMNS) <= set(cash.columns):
+        # Both balances are kept like in the dashboard's own file; the ending one is the book's cash
+        cash_flow_df = _select(cash, CASH_COLUMNS)
+    else:
+        cash_flow_df = pd.DataFrame(columns=list(CASH_COLUMNS.values()))
+    return positions_df, cash_flow_df
+
+
+def extract_book(
+    path: str | os.PathLike,
+    workers: int | None = None,
+    pages_per_task: int = DEFAULT_PAGES_PER_TASK,
+) -> Path:
+    """Directory holding the statement's ``positions.parquet`` and ``cash_flow.parquet``.
+
+    Extracted on the first call for a given file content; later calls only
+    hash the file.
+    """
+    book = _cache_dir(path)
+    if not (book / "positions.parquet").exists():
+        try:
+            tables = extract_tables(path, workers, pages_per_task)
+        except StatementError:
+            raise
+        except Exception as exc:
+            raise StatementError(f"{Path(path).name}: {exc}") from exc
+        positions_df, cash_flow_df = statement_book(tables)
+        # Cash flows first: a book directory counts as complete once positions exist
+        for name, frame in (("cash_flow", cash_flow_df), ("positions", positions_df)):
+            tmp = book / f"{name}.{os.getpid()}.tmp"
+            frame.to_parquet(tmp, index=False)
+            os.replace(tmp, book / f"{name}.parquet")
+    return book
+
+
+def _cache_dir(path: str | os.PathLike) -> Path:
+    from .portfolio import file_digest
+
+    return cache_dir("statements", f"{file_digest(path)}-v{EXTRACTOR_VERSION}")
+
+
+def _range_name(page_range: tuple[int, int]) -> str:
+    return f"pages-{page_range[0]:05d}-{page_range[1]:05d}.json"
+
+
+def _page_count(path: Path) -> int:
+    from pypdf import PdfReader
+
+    with open(path, "rb") as f:
+        return len(PdfReader(f).pages)
+
+
+def _store(cache: Path, ranges, results, extracted: dict) -> None:
+    """Cache every range's pages as it arrives."""
+    for page_range, pages in zip(ranges, results):
+        extracted[page_range] = pages
+        entry = cache / _range_name(page_range)
+        tmp = entry.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(pages), encoding="utf-8")
+        os.replace(tmp, entry)
+
+
+def _extract_range(path: str, start: int, stop: int) -> list[dict]:
+    """Headings, table headers and rows of pages ``start`` to ``stop``; runs in a worker."""
+    from pypdf import PdfReader
+
+    # An open file, so pypdf reads the objects of these pages instead of the whole document
+    with open(path, "rb") as f:
+        reader = PdfReader(f)
+        return [{"page": number, "items": _page_items(reader.pages[number])} for number in range(start, stop)]
+
+
+def _page_items(page) -> list[dict]:
+    runs = []
+
+    def visit(text, cm, tm, font, size):
+        if text.strip():
+            # Text-space origin to page space; the scale gives the rendered font size
+            x = tm[4] * cm[0] + tm[5] * cm[2] + cm[4]
+            y = tm[4] * cm[1] + tm[5] * cm[3] + cm[5]
+            runs.append((y, x, text, abs(size * tm[0] * cm[0]) or size))
+
+    page.extract_text(visitor_text=visit)
+    items = []
+    in_table = False
+    for block in _blocks(_lines(runs)):
+        runs = [run for _, _, line in block for run in line]
+        if any(_is_number(text.strip()) for _, text, _ in runs):
+            if len(runs) > 1 or in_table:
+                # Cells by estimated centre; placed in columns when the pages are merged
+                items.append({"cells": [[_centre(run), run[1].strip()] for run in runs]})
+            continue
+        columns = _columns(block)
+        if len(columns) == 1:
+            items.append({"heading": columns[0][1]})
+            in_table = False
+        else:
+            items.append({"columns": [name for _, name in columns], "bounds": [left for left, _ in columns[1:]]})
+            in_table = True
+    return items
+
+
+def _lines(runs):
+    """Runs grouped into ``(y, font size, runs)`` lines, top to bottom, runs left to right."""
+    lines = []
+    for y, x, text, size in sorted(runs, key=lambda run: (-run[0], run[1])):
+        if lines and abs(lines[-1][0] - y) <= LINE_TOLERANCE * size:
+            lines[-1][2].append((x, text, size))
+        else:
+            lines.append((y, size, [(x, text, size)]))
+    return [(y, size, sorted(line)) for y, size, line in lines]
+
+
+def _blocks(lines):
+    """Lines closer than ``BLOCK_GAP`` ems: a header or a row whose cells wrap over several lines."""
+    blocks = []
+    for line in lines:
+        y, size, _ = line
+        if blocks and blocks[-1][-1][0] - y < BLOCK_GAP * max(size, blocks[-1][-1][1]):
+            blocks[-1].append(line)
+        else:
+            blocks.append([line])
+    return blocks
+
+
+def _columns(block):
+    """``(left edge, name)`` of the block's columns: runs stacked over each other share one."""
+    runs = sorted(((y, x, text.strip(), size) for y, _, line in block for x, text, size in line),
+                  key=lambda run: _centre(run[1:]))
+    clusters = []
+    for run in runs:
+        if clusters and _centre(run[1:]) - _centre(clusters[-1][-1][1:]) <= run[3]:
+            clusters[-1].append(run)
+        else:
+            clusters.append([run])
+    columns = []
+    for cluster in clusters:
+        name = ""
+        for _, _, text, _ in sorted(cluster, key=lambda run: (-run[0], run[1])):
+            # "Mark-to-" over "Market" reads "Mark-to-Market"
+            name = f"{name}{text}" if name.endswith("-") else f"{name} {text}".strip()
+        columns.append((min(x for _, x, _, _ in cluster), name))
+    return sorted(columns)
+
+
+def _centre(run) -> float:
+    x, text, size = run
+    return x + len(text) * size * GLYPH_WIDTH / 2
+
+
+def _merge(pages) -> list[StatementTable]:
+    """Join the pages' items into tables.
+
+    A heading ends the table before it. A table still open at the end of a
+    page takes the rows at the top of the next one, and a page whose first
+    header repeats the previous page's last table continues that table.
+    """
+    tables: list[StatementTable] = []
+    heading = None
+    current = None
+    for page in pages:
+        number = page["page"]
+        first_header = True
+        for item in page["items"]:
+            if "heading" in item:
+                heading = item["heading"]
+                current = None
+            elif "columns" in item:
+                previous = tables[-1] if tables else None
+                if (
+                    first_header
+                    and previous is not None
+                    and previous.pages[1] == number - 1
+                    and previous.columns == item["columns"]
+                ):
+                    current = previous
+                    current.pages = (current.pages[0], number)
+                else:
+                    current = StatementTable(heading, item["columns"], [], (number, number), item["bounds"])
+                    tables.append(current)
+                first_header = False
+            elif current is not None:
+                row = [""] * len(current.columns)
+                for centre, text in item["cells"]:
+                    j = bisect.bisect_right(current.bounds, centre)
+                    row[j] = f"{row[j]} {text}".strip()
+                current.rows.append(row)
+                current.pages = (current.pages[0], number)
+    # Text side by side, like label and value pairs, reads as a header without rows
+    return [table for table in tables if table.rows]
+
+
+def _is_number(text: str) -> bool:
+    return bool(text) and any(ch.isdigit() for ch in text) and bool(_NUMBER.match(text))
+
+
+def _to_float(text: str) -> float:
+    if not _is_number(text):
+        return float("nan")
+    value = float(re.sub(r"[^\d.]", "", text) or "nan")
+    return -value if "-" in text or text.startswith("(") else value
+
+
+def _title_words(table: StatementTable) -> list[str]:
+    return re.findall(r"[a-z]+", (table.title or "").lower())
+
+
+def _find(tables: list[StatementTable], *keywords: str) -> StatementTable | None:
+    for table in tables:
+        words = _title_words(table)
+        if all(any(word.startswith(keyword) for word in words) for keyword in keywords):
+            return table
+    return None
+
+
+def _select(table: StatementTable, columns: dict[str, str]) -> pd.DataFrame:
+    """``columns`` of the table renamed, subtotal rows dropped and numbers parsed."""
+    frame = table.frame()
+    frame = frame[[c for c in columns if c in frame.columns]].rename(columns=columns)
+    first = frame.columns[0]
+    frame = frame[(frame[first] != "") & ~frame[first].str.startswith("Total")].reset_index(drop=True)
+    for column in frame.columns[1:]:
+        values = frame[column]
+        if values.map(_is_number).all():
+            frame[column] = values.map(_to_float).astype("float64")
+    return frame
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Extract the tables of statement PDFs without network access")
+    parser.add_argument("statements", nargs="+", help="statement PDF files")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--pages-per-task", type=int, default=DEFAULT_PAGES_PER_TASK, help="pages per worker task")
+    parser.add_argument("--no-cache", action="store_true", help="extract every page again")
+    parser.add_argument("--book", action="store_true", help="also write positions and cash flows as Parquet")
+    args = parser.parse_args()
+
+    for statement in args.statements:
+        started = time.perf_counter()
+        try:
+            tables = extract_tables(statement, args.workers, args.pages_per_task, use_cache=not args.no_cache)
+            book = extract_book(statement, args.workers, args.pages_per_task) if args.book else None
+        except (OSError, StatementError) as e:
+            print(f"{statement}: {e}", file=sys.stderr)
+            sys.exit(1)
+        print(f"{statement}: {len(tables)} tables in {time.perf_counter() - started:.2f}s")
+        for table in tables:
+            first, last = table.pages
+            pages = f"page {first + 1}" if first == last else f"pages {first + 1}-{last + 1}"
+            print(f"  {table.title or '(untitled)'}: {len(table.rows)} rows x {len(table.columns)} columns, {pages}")
+        if book is not None:
+            print(f"  book: {book}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+"""Streaming volatility and correlation, updated bar by bar.
+
+``StreamingStats`` keeps Welford-style running means and second moments per
+symbol and, optionally, the co-moment matrix for every pair. A new bar costs
+O(N) for the variances and O(N²) for the co-moments, independent of how much
+history has been seen. With a ``window`` the oldest bar is removed as the new
+one arrives (rolling statistics); without one the statistics are expanding.
+Missing observations are skipped per symbol and per pair rather than read as
+a zero return, so tickers on other calendars or with a shorter history get
+the same numbers as ``analytics``' pandas-equivalent recompute.
+
+``IncrementalMarketStats`` feeds aligned close matrices into two such engines
+across Streamlit reruns, consuming only bars it has not seen yet.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import deque
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from .analytics import TRADING_DAYS
+
+
+@dataclass
+class StatsSnapshot:
+    """Point-in-time statistics; NaN until enough bars have been seen."""
+
+    count: int
+    volatility: np.ndarray
+    correlation: np.ndarray | None
+
+
+class StreamingStats:
+    """Running mean/variance per symbol and co-moments per symbol pair.
+
+    NaN marks a missing observation and is skipped, like ``rolling_std`` and
+    ``pairwise_corr`` in ``analytics`` skip it: a symbol's variance covers its
+    own last ``window`` observations, and a pair's co-moment the bars of the
+    last ``window`` where both symbols have one.
+    """
+
+    def __init__(
+        self,
+        n_symbols: int,
+        window: int | None = None,
+        pairs: bool = True,
+        annualization: int = TRADING_DAYS,
+        resync_every: int = 10_000,
+    ):
+        if window is not None and window < 2:
+            raise ValueError("window must be at least 2 bars")
+        self.n_symbols = n_symbols
+        self.window = window
+        self.annualization = annualization
+        self.resync_every = resync_every
+        # Bars pushed (at most ``window``) and observations per symbol
+        self.count = 0
+        self.counts = np.zeros(n_symbols, dtype=np.int64)
+        self.mean = np.zeros(n_symbols)
+        self.m2 = np.zeros(n_symbols)
+        # Per pair (i, j), over the bars where both are valid: the count, the mean
+        # and sum of squares of symbol i, and the co-moment
+        shape = (n_symbols, n_symbols) if pairs else (0, 0)
+        self.pair_counts = np.zeros(shape, dtype=np.int64) if pairs else None
+        self.pair_mean = np.zeros(shape) if pairs else None
+        self.pair_m2 = np.zeros(shape) if pairs else None
+        self.comoment = np.zeros(shape) if pairs else None
+        # Each symbol's last ``window`` observations, and the last ``window`` bars for the pairs
+        self._ring = np.zeros((window, n_symbols)) if window else None
+        self._heads = np.zeros(n_symbols, dtype=np.int64)
+        self._bars = np.full((window, n_symbols), np.nan) if window and pairs else None
+        self._head = 0
+        self._pushes = 0
+
+    def push(self, returns: np.ndarray) -> None:
+        """Add one bar of returns (NaN where a symbol has none); evicts the oldest when rolling."""
+        x = np.asarray(returns, dtype=np.float64)
+        valid = np.isfinite(x)
+        symbols = np.flatnonzero(valid)
+        if self.window:
+            full = symbols[self.counts[symbols] == self.window]
+            self._remove(full, self._ring[self._heads[full], full])
+            self._ring[self._heads[symbols], symbols] = x[symbols]
+            self._heads[symbols] = (self._heads[symbols] + 1) % self.window
+        self._add(symbols, x[symbols])
+
+        if self.comoment is not None:
+            if self.window:
+                if self.count == self.window:
+                    self._remove_pairs(self._bars[self._head])
+                self._bars[self._head] = x
+                self._head = (self._head + 1) % self.window
+            self._add_pairs(x)
+        self.count = min(self.count + 1, self.window or self.count + 1)
+
+        self._pushes += 1
+        if self.window and self._pushes % self.resync_every == 0:
+            # Rolling add/remove slowly accumulates rounding error; rebuild exactly
+            self._resync()
+
+    def snapshot(self) -> StatsSnapshot:
+        needed = self.window or 2
+        with np.errstate(divide="ignore", invalid="ignore"):
+            variance = np.maximum(self.m2, 0) / (self.counts - 1)
+        volatility = np.where(self.counts >= needed, np.sqrt(variance * self.annualization), np.nan)
+        corr = None
+        if self.comoment is not None:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                sym = (self.comoment + self.comoment.T) / 2
+                scale = np.sqrt(np.maximum(self.pair_m2 * self.pair_m2.T, 0))
+                corr = np.clip(sym / scale, -1.0, 1.0)
+            corr[self.pair_counts < 2] = np.nan
+        return StatsSnapshot(self.count, volatility, corr)
+
+    def copy(self) -> "StreamingStats":
+        clone = object.__new__(StreamingStats)
+        clone.__dict__.update(self.__dict__)
+        for name in (
+            "counts", "mean", "m2", "pair_counts", "pair_mean", "pair_m2", "comoment", "_ring", "_heads", "_bars"
+        ):
+            value = getattr(self, name)
+            setattr(clone, name, None if value is None else value.copy())
+        return clone
+
+    def _add(self, symbols: np.ndarray, x: np.ndarray) -> None:
+        self.counts[symbols] += 1
+        before = x - self.mean[symbols]
+        self.mean[symbols] += before / self.counts[symbols]
+        self.m2[symbols] += before * (x - self.mean[symbols])
+
+    def _remove(self, symbols: np.ndarray, y: np.ndarray) -> None:
+        # Exact inverse of _add: M2_old = M2 - (y - mean_new)(y - mean_old)
+        with_y = y - self.mean[symbols]
+        self.counts[symbols] -= 1
+        self.mean[symbols] -= with_y / self.counts[symbols]
+        self.m2[symbols] -= (y - self.mean[symbols]) * with_y
+
+    def _add_pairs(self, x: np.ndarray) -> None:
+        both = np.outer(np.isfinite(x), np.isfinite(x))
+        column = np.nan_to_num(x)[:, None]
+        self.pair_counts += both
+        before = np.where(both, column - self.pair_mean, 0.0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.pair_mean += np.where(both, before / self.pair_counts, 0.0)
+        after = np.where(both, column - self.pair_mean, 0.0)
+        self.pair_m2 += before * after
+        self.comoment += before * after.T
+
+    def _remove_pairs(self, y: np.ndarray) -> None:
+        # Exact inverse of _add_pairs, per pair of symbols both valid in the bar
+        both = np.outer(np.isfinite(y), np.isfinite(y))
+        column = np.nan_to_num(y)[:, None]
+        self.pair_counts -= both
+        with_y = np.where(both, column - self.pair_mean, 0.0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.pair_mean -= np.where(both & (self.pair_counts > 0), with_y / self.pair_counts, 0.0)
+        without_y = np.where(both, column - self.pair_mean, 0.0)
+        self.pair_m2 -= without_y * with_y
+        self.comoment -= without_y * with_y.T
+        # A pair with no bars left starts again from zero
+        empty = self.pair_counts == 0
+        for moment in (self.pair_mean, self.pair_m2, self.comoment):
+            moment[empty] = 0.0
+
+    def _resync(self) -> None:
+        filled = np.arange(self.window)[:, None] < self.counts
+        with np.errstate(invalid="ignore"):
+            self.mean = np.where(self.counts > 0, (self._ring * filled).sum(axis=0) / self.counts, 0.0)
+        self.m2 = (np.where(filled, self._ring - self.mean, 0.0) ** 2).sum(axis=0)
+        if self.comoment is not None:
+            bars = np.roll(self._bars, -self._head, axis=0)[-self.count :]
+            for moment in (self.pair_counts, self.pair_mean, self.pair_m2, self.comoment):
+                moment[...] = 0
+            for row in bars:
+                self._add_pairs(row)
+
+
+class IncrementalMarketStats:
+    """Rolling volatility and correlation for a fixed ticker set, fed across reruns.
+
+    Only bars newer than the last consumed one are pushed. The most recent bar
+    may still change (an intraday daily bar), so it is applied to a copy of
+    the engines when a snapshot is taken and committed once a newer bar exists.
+    """
+
+    def __init__(
+        self,
+        tickers: list[str],
+        vol_window: int = 30,
+        corr_window: int | None = None,
+        max_history: int = 5_000,
+    ):
+        self.tickers = list(tickers)
+        n = len(self.tickers)
+        self.vol = StreamingStats(n, window=vol_window, pairs=False)
+        self.corr = StreamingStats(n, window=corr_window, pairs=True)
+        self._last_close: np.ndarray | None = None
+        self._last_date = None
+        self._vol_history: deque[tuple[pd.Timestamp, np.ndarray]] = deque(maxlen=max_history)
+        # Engines with the provisional last bar applied, and that bar's date
+        self._preview: tuple[StreamingStats, StreamingStats] | None = None
+        self._preview_date = None
+        self._preview_volatility: np.ndarray | None = None
+        self._lock = threading.Lock()
+
+    def update(self, dates: pd.DatetimeIndex, closes: np.ndarray) -> None:
+        """Consume the rows of a date-by-ticker close matrix not seen before."""
+        if len(dates) == 0:
+            return
+        with self._lock:
+            start = 0 if self._last_date is None else int(dates.searchsorted(self._last_date, "right"))
+            for i in range(start, len(dates) - 1):
+                self._commit(dates[i], closes[i])
+            self._preview, self._preview_date = None, None
+            returns = self._returns(closes[-1])
+            if dates[-1] != self._last_date and returns is not None:
+                vol, corr = self.vol.copy(), self.corr.copy()
+                vol.push(returns)
+                corr.push(returns)
+                self._preview, self._preview_date = (vol, corr), dates[-1]
+                self._preview_volatility = self._volatility(vol, returns)
+
+    def volatility_frame(self, start: pd.Timestamp | None = None) -> pd.DataFrame:
+        """Annualized rolling volatility after every consumed bar from ``start``, including the pending one."""
+        with self._lock:
+            rows = list(self._vol_history)
+            if self._preview is not None:
+                rows.append((self._preview_date, self._preview_volatility))
+        if start is not None:
+            rows = [(date, vol) for date, vol in rows if date >= start]
+        if not rows:
+            return pd.DataFrame(columns=self.tickers)
+        index = pd.DatetimeIndex([date for date, _ in rows])
+        return pd.DataFrame(np.vstack([vol for _, vol in rows]), index=index, columns=self.tickers)
+
+    def correlation_frame(self) -> pd.DataFrame:
+        with self._lock:
+            engine = self._preview[1] if self._preview is not None else self.corr
+            corr = engine.snapshot().correlation
+        return pd.DataFrame(corr, index=self.tickers, columns=self.tickers)
+
+    def _commit(self, date, close: np.ndarray) -> None:
+        returns = self._returns(close)
+        if returns is not None:
+            self.vol.push(returns)
+            self.corr.push(returns)
+            self._vol_history.append((date, self._volatility(self.vol, returns)))
+        self._last_close = _carry(close, self._last_close)
+        self._last_date = date
+
+    def _returns(self, close: np.ndarray) -> np.ndarray | None:
+        """Returns against each symbol's last valid close; NaN where it has no bar (yet)."""
+        if self._last_close is None:
+            return None
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.asarray(close, dtype=np.float64) / self._last_close - 1
+
+    @staticmethod
+    def _volatility(engine: StreamingStats, returns: np.ndarray) -> np.ndarray:
+        # No volatility on a symbol's missing bars, as in ``analytics.rolling_std``
+        return np.where(np.isfinite(returns), engine.snapshot().volatility, np.nan)
+
+
+def _carry(close: np.ndarray, previous: np.ndarray | None) -> np.ndarray:
+    """Carry the previous close forward where a symbol has no bar."""
+    close = np.asarray(close, dtype=np.float64)
+    if previous is None:
+        return close
+    return np.where(np.isfinite(close), close, previous)
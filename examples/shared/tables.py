@@ -0,0 +1,46 @@
+"""Server-side paging for large tables.
+
+``st.dataframe`` serializes the whole frame it is given to Arrow and ships it
+to the browser. For books with many thousands of rows only one page is
+handed over; sorting happens here over the full frame first, so page 1 of
+"Market value, descending" really holds the largest positions.
+"""
+
+from __future__ import annotations
+
+import math
+
+import pandas as pd
+
+PAGE_SIZES = (50, 100, 500, 1000)
+# Frames up to this many rows are shown whole and sorted in the browser
+PAGE_THRESHOLD = 1000
+
+
+def page_count(rows: int, page_size: int) -> int:
+    return max(1, math.ceil(rows / page_size))
+
+
+def page_slice(
+    df: pd.DataFrame,
+    page: int,
+    page_size: int,
+    sort_by: str | None = None,
+    descending: bool = False,
+) -> pd.DataFrame:
+    """Rows of the 1-based ``page`` after sorting the whole frame by ``sort_by``.
+
+    Only the sort key is sorted; the page's rows are then taken by position,
+    so the rest of the frame is never copied. Categoricals keep only the
+    categories present on the page.
+    """
+    start = (max(page, 1) - 1) * page_size
+    if sort_by is None:
+        rows = df.iloc[start : start + page_size]
+    else:
+        key = df[sort_by].reset_index(drop=True)
+        order = key.sort_values(ascending=not descending, kind="stable", na_position="last").index
+        rows = df.iloc[order[start : start + page_size]]
+    # Otherwise every category of the full book is serialized with each page
+    categorical = rows.select_dtypes("category").columns
+    return rows.assign(**{c: rows[c].cat.remove_unused_categories() for c in categorical})
@@ -5,50 +5,85 @@ export const newsReaderTools: Record<string, ToolConfig> = {
     schema: {
       title: "News Reader",
       description: `Returns code snippet for retrieving financial news from RSS feeds. Use this code snippet in the notebook to fetch the latest financial news. Only use this tool if the user asks for the latest financial news.
-The code will fetch news from major financial sources including Seeking Alpha, Financial Times, and MarketWatch.`,
+The code will fetch news from major financial sources including Seeking Alpha, Financial Times, and MarketWatch. Feeds are fetched in parallel and re-running the fetch only downloads feeds that changed.`,
       inputSchema: {},
     },
     handler: async () => {
-      const codeSnippet = `import feedparser  # RSS feed parsing library
-import requests
-from datetime import datetime
+      const codeSnippet = `import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import feedparser  # RSS feed parsing library
 import pandas as pd
 
 # RSS feed URLs for financial news
 RSS_FEEDS = {
     "Seeking Alpha": "https://seekingalpha.com/feed.xml",
-    "Financial Times": "https://www.ft.com/rss/home", 
+    "Financial Times": "https://www.ft.com/rss/home",
     "MarketWatch": "https://feeds.content.dowjones.io/public/rss/mw_topstories"
 }
 
-def fetch_news(max_articles_per_source=10):
-    """Fetch latest financial news from RSS feeds"""
+# ETag/Last-Modified and parsed entries per feed URL. Re-running the fetch
+# sends conditional requests, so unchanged feeds answer 304 and are not parsed.
+FEED_CACHE = globals().get("FEED_CACHE", {})
+
+def fetch_feed(feed_url, timeout):
+    """Fetch one feed with a conditional GET; returns its entries and whether they changed"""
+    cached = FEED_CACHE.get(feed_url, {})
+    headers = {"User-Agent": feedparser.USER_AGENT}
+    if cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+    if cached.get("modified"):
+        headers["If-Modified-Since"] = cached["modified"]
+    try:
+        request = urllib.request.Request(feed_url, headers=headers)
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            body = response.read()
+            etag = response.headers.get("ETag")
+            modified = response.headers.get("Last-Modified")
+    except urllib.error.HTTPError as e:
+        if e.code == 304 and "entries" in cached:
+            return cached["entries"], False
+        raise
+
+    feed = feedparser.parse(body)
+    entries = [
+        {
+            'title': entry.get('title', 'No title'),
+            'link': entry.get('link', ''),
+            'published': entry.get('published', ''),
+            'summary': entry.get('summary', 'No summary available')
+        }
+        for entry in feed.entries
+    ]
+    FEED_CACHE[feed_url] = {"etag": etag, "modified": modified, "entries": entries}
+    return entries, True
+
+def fetch_news(max_articles_per_source=10, timeout=10):
+    """Fetch latest financial news from all RSS feeds in parallel"""
     all_articles = []
-    
-    for source_name, feed_url in RSS_FEEDS.items():
+
+    pool = ThreadPoolExecutor(max_workers=len(RSS_FEEDS))
+    futures = {pool.submit(fetch_feed, url, timeout): name for name, url in RSS_FEEDS.items()}
+    done, _ = wait(futures, timeout=timeout)
+    pool.shutdown(wait=False, cancel_futures=True)
+
+    for future, source_name in futures.items():
+        if future not in done:
+            print(f"Error fetching from {source_name}: timed out after {timeout}s")
+            continue
         try:
-            print(f"Fetching news from {source_name}...")
-            
-            # Parse the RSS feed using feedparser
-            feed = feedparser.parse(feed_url)
-            
-            # Extract articles
-            for entry in feed.entries[:max_articles_per_source]:
-                article = {
-                    'source': source_name,
-                    'title': entry.get('title', 'No title'),
-                    'link': entry.get('link', ''),
-                    'published': entry.get('published', ''),
-                    'summary': entry.get('summary', 'No summary available')
-                }
-                all_articles.append(article)
-                
+            entries, changed = future.result()
         except Exception as e:
             print(f"Error fetching from {source_name}: {str(e)}")
-    
+            continue
+        print(f"Fetched news from {source_name}{'' if changed else ' (not modified)'}")
+        for entry in entries[:max_articles_per_source]:
+            all_articles.append({'source': source_name, **entry})
+
     # Convert to DataFrame for easier analysis
-    df = pd.DataFrame(all_articles)
-    
+    df = pd.DataFrame(all_articles, columns=['source', 'title', 'link', 'published', 'summary'])
+
     print(f"\\nFetched {len(df)} articles from {len(RSS_FEEDS)} sources")
     return df
 
@@ -57,18 +92,17 @@ news_df = fetch_news(max_articles_per_source=10)
 
 # Display the latest headlines
 print("\\n=== LATEST FINANCIAL NEWS ===\\n")
-for idx, row in news_df.head(20).iterrows():  # iterrows() method for DataFrame iteration
-    print(f"📰 {row['source']}: {row['title']}")
-    print(f"🔗 {row['link']}")
-    print(f"📅 {row['published']}")
-    print(f"📝 {row['summary'][:150]}...")
+for row in news_df.head(20).itertuples():
+    print(f"📰 {row.source}: {row.title}")
+    print(f"🔗 {row.link}")
+    print(f"📅 {row.published}")
+    print(f"📝 {row.summary[:150]}...")
     print("-" * 80)
 
 # Show news by source
 print("\\n=== NEWS BY SOURCE ===\\n")
-for source in news_df['source'].unique():
-    source_news = news_df[news_df['source'] == source]
-    print(f"{source}: {len(source_news)} articles")
+for source, count in news_df['source'].value_counts().items():
+    print(f"{source}: {count} articles")
 `;
 
       return {
@@ -0,0 +1,99 @@
+import * as childProcess from "node:child_process";
+import * as fs from "node:fs";
+import os from "node:os";
+import * as path from "node:path";
+
+import { describe, it, expect, vi, beforeEach, afterEach } from "vitest";
+
+import * as config from "../config";
+import {
+  ensureMarketDataServer,
+  getMarketDataEnv,
+  installSharedPackage,
+  MARKET_DATA_SOCKET_ENV,
+} from "../marketData";
+import * as lifecycle from "../processLifecycle";
+
+vi.mock("node:fs");
+vi.mock("node:child_process");
+vi.mock("../config");
+vi.mock("../processLifecycle");
+
+const mockFs = vi.mocked(fs);
+const mockChildProcess = vi.mocked(childProcess);
+const mockConfig = vi.mocked(config);
+const mockLifecycle = vi.mocked(lifecycle);
+
+describe("marketData", () => {
+  const fakeConfigDir = "/tmp/finagent-test-config";
+  const libDir = path.join(fakeConfigDir, "python");
+
+  beforeEach(() => {
+    vi.clearAllMocks();
+    vi.spyOn(os, "platform").mockReturnValue("linux");
+    mockConfig.getConfigDir.mockReturnValue(fakeConfigDir);
+    mockConfig.getLogsDir.mockReturnValue(path.join(fakeConfigDir, "logs"));
+    mockConfig.getVenvDir.mockReturnValue(path.join(fakeConfigDir, "venv"));
+    mockFs.existsSync.mockReturnValue(false);
+    mockFs.openSync.mockReturnValue(3);
+    mockChildProcess.spawn.mockReturnValue({
+      pid: 4242,
+      unref: vi.fn(),
+    } as unknown as childProcess.ChildProcess);
+  });
+
+  afterEach(() => {
+    vi.restoreAllMocks();
+  });
+
+  it("getMarketDataEnv points clients at the socket and the shared package", () => {
+    const env = getMarketDataEnv();
+    expect(env[MARKET_DATA_SOCKET_ENV]).toBe(path.join(fakeConfigDir, "marketdata.sock"));
+    expect(env.PYTHONPATH.split(path.delimiter)[0]).toBe(libDir);
+  });
+
+  it("installSharedPackage only rewrites files whose content changed", () => {
+    installSharedPackage();
+    const written = mockFs.writeFileSync.mock.calls.map(([p]) => String(p));
+    expect(written).toContain(path.join(libDir, "shared", "market_data.py"));
+    expect(written).toContain(path.join(libDir, "shared", "__init__.py"));
+
+    // Same content already on disk: nothing is written
+    const contents = new Map(mockFs.writeFileSync.mock.calls.map(([p, c]) => [String(p), c]));
+    mockFs.writeFileSync.mockClear();
+    mockFs.existsSync.mockReturnValue(true);
+    mockFs.readFileSync.mockImplementation((p) => contents.get(String(p)) as string);
+    installSharedPackage();
+    expect(mockFs.writeFileSync).not.toHaveBeenCalled();
+  });
+
+  it("ensureMarketDataServer spawns the daemon once and records its meta", async () => {
+    mockLifecycle.isManagedProcessRunning.mockReturnValue(false);
+    const messages: string[] = [];
+    const env = await ensureMarketDataServer({ onMessage: (l) => messages.push(l) });
+
+    expect(mockChildProcess.spawn).toHaveBeenCalledTimes(1);
+    const [cmd, args, opts] = mockChildProcess.spawn.mock.calls[0];
+    expect(cmd).toBe("uv");
+    expect(args).toContain("shared.market_data");
+    expect(opts).toMatchObject({ cwd: libDir, detached: true });
+    expect(mockLifecycle.writeManagedMeta).toHaveBeenCalledWith("marketdata", {
+      pid: 4242,
+      socket: env[MARKET_DATA_SOCKET_ENV],
+    });
+    expect(messages.some((m) => m.includes("Market data server started"))).toBe(true);
+  });
+
+  it("ensureMarketDataServer reuses a running daemon", async () => {
+    mockLifecycle.isManagedProcessRunning.mockReturnValue(true);
+    const env = await ensureMarketDataServer();
+    expect(mockChildProcess.spawn).not.toHaveBeenCalled();
+    expect(env[MARKET_DATA_SOCKET_ENV]).toBeDefined();
+  });
+
+  it("ensureMarketDataServer is a no-op on Windows", async () => {
+    vi.spyOn(os, "platform").mockReturnValue("win32");
+    expect(await ensureMarketDataServer()).toEqual({});
+    expect(mockChildProcess.spawn).not.toHaveBeenCalled();
+  });
+});
@@ -65,6 +65,15 @@ describe("processLifecycle", () => {
     expect(readManagedMeta("notebook")).toEqual(meta);
   });
 
+  it("keeps the market data daemon's meta in its own file", () => {
+    writeManagedMeta("marketdata", { pid: 42, socket: "/tmp/md.sock" });
+    expect(mockFs.writeFileSync).toHaveBeenCalledWith(
+      path.join(fakeConfigDir, "marketdata.meta.json"),
+      expect.any(String),
+      { encoding: "utf8" },
+    );
+  });
+
   it("cleanupManagedMeta removes the meta file if it exists", () => {
     mockFs.existsSync.mockReturnValue(true);
     cleanupManagedMeta("dashboard");
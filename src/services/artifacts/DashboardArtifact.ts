@@ -12,6 +12,7 @@ import {
   getInvocationCwd,
   readThinkingModeFromConfig,
 } from "../config.js";
+import { ensureMarketDataServer, MARKET_DATA_GUIDANCE } from "../marketData.js";
 import { pickAvailablePort, waitForPortOpen } from "../network.js";
 import {
   cleanupManagedMeta,
@@ -61,6 +62,14 @@ export class DashboardArtifact implements Artifact {
       }
 
       if (!isManagedProcessRunning("dashboard")) {
+        let marketDataEnv: Record<string, string> = {};
+        try {
+          marketDataEnv = (await ensureMarketDataServer({ onMessage })) ?? {};
+        } catch (e) {
+          onMessage(
+            `Warning: Market data server not started, fetching directly: ${e instanceof Error ? e.message : String(e)}`,
+          );
+        }
         const cwd = getInvocationCwd();
         const port = await pickAvailablePort(8501);
         const child = spawn(
@@ -84,6 +93,7 @@ export class DashboardArtifact implements Artifact {
             stdio: ["ignore", "pipe", "pipe"],
             env: {
               ...process.env,
+              ...marketDataEnv,
               BROWSER: "none",
               STREAMLIT_SERVER_HEADLESS: "true",
               STREAMLIT_BROWSER_GATHER_USAGE_STATS: "false",
@@ -180,6 +190,7 @@ export class DashboardArtifact implements Artifact {
   buildGeneratePrompt(userPrompt: string): string {
     const guidance =
       "Use Plotly for charts. Ensure a professional Streamlit layout with header, optional KPI row with trend arrows (green up for positive, red down for negative), a grid of up to four best charts, and a concluding summary. Keep card heights uniform and show two decimal places for trends. " +
+      MARKET_DATA_GUIDANCE +
       "When using yfinance, auto_adjust=True is now the default. This means that 'Open', 'High', 'Low', and 'Close' columns are all automatically adjusted for stock splits and dividends. No need to use e.g. 'Adj Close' anymore. " +
       "When working with PDF, use PDF extractor tool to get the content or tabular data instead of `Read` tool.";
     const prefix = existsSync(this.getFilePath())
@@ -13,6 +13,7 @@ import {
   readThinkingModeFromConfig,
 } from "../config.js";
 import type { GenerationMode } from "../config.js";
+import { ensureMarketDataServer, MARKET_DATA_GUIDANCE } from "../marketData.js";
 import { isManagedProcessRunning, writeManagedMeta } from "../processLifecycle.js";
 export const NOTEBOOK_FILE = "analysis.ipynb";
 
@@ -49,6 +50,14 @@ export class NotebookArtifact implements Artifact {
     }
 
     if (!isManagedProcessRunning("notebook")) {
+      let marketDataEnv: Record<string, string> = {};
+      try {
+        marketDataEnv = (await ensureMarketDataServer({ onMessage })) ?? {};
+      } catch (e) {
+        onMessage(
+          `Warning: Market data server not started, fetching directly: ${e instanceof Error ? e.message : String(e)}`,
+        );
+      }
       onMessage(`Starting Jupyter Notebook on port ${port}, serving files from ${notebookDir} ...`);
       const outFd = openSync(outPath, "a");
       const errFd = openSync(errPath, "a");
@@ -72,6 +81,7 @@ export class NotebookArtifact implements Artifact {
           detached: !isWindows,
           windowsHide: isWindows,
           stdio: ["ignore", outFd, errFd],
+          env: { ...process.env, ...marketDataEnv },
         },
       );
       if (!isWindows) {
@@ -96,6 +106,7 @@ export class NotebookArtifact implements Artifact {
     const notebookPath = this.getFilePath();
     const guidance =
       "Make sure to tell a story and add supporting visual pleasing graphs using plotly. " +
+      MARKET_DATA_GUIDANCE +
       "When using yfinance, auto_adjust=True is now the default. This means that 'Open', 'High', 'Low', and 'Close' columns are all automatically adjusted for stock splits and dividends. No need to use e.g. 'Adj Close' anymore. " +
       "When working with PDF, use PDF extractor tool to get the content or tabular data instead of `Read` tool.";
     const prefix = existsSync(notebookPath)
@@ -10,6 +10,7 @@ vi.mock("../../network");
 vi.mock("../../processLifecycle");
 vi.mock("../../browser");
 vi.mock("../../venv");
+vi.mock("../../marketData");
 
 describe("DashboardArtifact.fix", () => {
   let artifact: DashboardArtifact;
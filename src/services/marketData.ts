@@ -0,0 +1,113 @@
+import { spawn } from "node:child_process";
+import { existsSync, mkdirSync, openSync, readFileSync, writeFileSync } from "node:fs";
+import os from "node:os";
+import path from "node:path";
+
+import sharedInit from "../../examples/shared/__init__.py";
+import barStore from "../../examples/shared/bar_store.py";
+import instrumentation from "../../examples/shared/instrumentation.py";
+import marketData from "../../examples/shared/market_data.py";
+import paths from "../../examples/shared/paths.py";
+import prices from "../../examples/shared/prices.py";
+import scheduler from "../../examples/shared/scheduler.py";
+
+import { ensureConfigDir, getConfigDir, getLogsDir, getVenvDir } from "./config.js";
+import { isManagedProcessRunning, writeManagedMeta } from "./processLifecycle.js";
+
+// The `shared` package the daemon runs from; also importable by generated notebooks and dashboards
+const SHARED_PACKAGE: Record<string, string> = {
+  "__init__.py": sharedInit,
+  "bar_store.py": barStore,
+  "instrumentation.py": instrumentation,
+  "market_data.py": marketData,
+  "paths.py": paths,
+  "prices.py": prices,
+  "scheduler.py": scheduler,
+};
+
+export const MARKET_DATA_SOCKET_ENV = "FINAGENT_MARKET_DATA_SOCKET";
+
+export const MARKET_DATA_GUIDANCE =
+  "For price history, prefer the local market data server over calling yfinance directly: `from shared.market_data import MarketDataClient` and `MarketDataClient().history(tickers, period).histories` returns a dict of ticker to OHLCV DataFrame (per-ticker failures are in `.errors`). Fall back to yfinance only if the import or the call fails. ";
+
+export function getPythonLibDir(): string {
+  return path.join(getConfigDir(), "python");
+}
+
+export function getMarketDataSocketPath(): string {
+  return path.join(getConfigDir(), "marketdata.sock");
+}
+
+/**
+ * Write the bundled Python package below the config dir, skipping unchanged files
+ */
+export function installSharedPackage(): string {
+  const libDir = getPythonLibDir();
+  const packageDir = path.join(libDir, "shared");
+  mkdirSync(packageDir, { recursive: true });
+  for (const [fileName, source] of Object.entries(SHARED_PACKAGE)) {
+    const filePath = path.join(packageDir, fileName);
+    if (existsSync(filePath) && readFileSync(filePath, { encoding: "utf8" }) === source) continue;
+    writeFileSync(filePath, source, { encoding: "utf8" });
+  }
+  return libDir;
+}
+
+/**
+ * Environment for Jupyter/Streamlit so their code reads bars through the daemon
+ */
+export function getMarketDataEnv(): Record<string, string> {
+  const pythonPath = [getPythonLibDir(), process.env.PYTHONPATH].filter(Boolean).join(path.delimiter);
+  return {
+    [MARKET_DATA_SOCKET_ENV]: getMarketDataSocketPath(),
+    PYTHONPATH: pythonPath,
+  };
+}
+
+/**
+ * Start the local market-data daemon unless it is already running.
+ *
+ * The daemon owns the bar cache and all upstream price requests; clients that
+ * cannot reach it fall back to fetching directly. Returns the environment
+ * variables to pass to processes that should use it (empty where Unix
+ * sockets are unavailable).
+ */
+export async function ensureMarketDataServer(opts?: {
+  onMessage?: (line: string) => void;
+}): Promise<Record<string, string>> {
+  const onMessage = opts?.onMessage ?? (() => {});
+  if (os.platform() === "win32") return {};
+
+  ensureConfigDir();
+  const libDir = installSharedPackage();
+  const env = getMarketDataEnv();
+  if (isManagedProcessRunning("marketdata")) return env;
+
+  const socketPath = getMarketDataSocketPath();
+  const logsDir = getLogsDir();
+  const outFd = openSync(path.join(logsDir, "marketdata.out.log"), "a");
+  const errFd = openSync(path.join(logsDir, "marketdata.err.log"), "a");
+  const child = spawn(
+    "uv",
+    [
+      "run",
+      "--python",
+      getVenvDir(),
+      "python",
+      "-m",
+      "shared.market_data",
+      "serve",
+      `--socket=${socketPath}`,
+    ],
+    {
+      cwd: libDir,
+      detached: true,
+      stdio: ["ignore", outFd, errFd],
+      env: { ...process.env, ...env },
+    },
+  );
+  child.unref();
+  writeManagedMeta("marketdata", { pid: child.pid, socket: socketPath });
+  onMessage(`Market data server started on ${socketPath} (PID: ${child.pid})`);
+  return env;
+}
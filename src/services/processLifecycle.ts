@@ -15,12 +15,21 @@ export type ManagedMeta = {
   [key: string]: any;
 };
 
-function getMetaFilePathForMode(mode: GenerationMode): string {
+// Processes started by the CLI: the notebook/dashboard servers and the market-data daemon
+export type ManagedProcessKind = GenerationMode | "marketdata";
+
+const META_FILES: Record<ManagedProcessKind, string> = {
+  notebook: "jupyter.meta.json",
+  dashboard: "dashboard.meta.json",
+  marketdata: "marketdata.meta.json",
+};
+
+function getMetaFilePathForMode(mode: ManagedProcessKind): string {
   const configDir = getConfigDir();
-  return path.join(configDir, mode === "notebook" ? "jupyter.meta.json" : "dashboard.meta.json");
+  return path.join(configDir, META_FILES[mode]);
 }
 
-export function readManagedMeta(mode: GenerationMode): ManagedMeta | null {
+export function readManagedMeta(mode: ManagedProcessKind): ManagedMeta | null {
   try {
     const metaFile = getMetaFilePathForMode(mode);
     if (!existsSync(metaFile)) return null;
@@ -32,12 +41,12 @@ export function readManagedMeta(mode: GenerationMode): ManagedMeta | null {
   }
 }
 
-export function writeManagedMeta(mode: GenerationMode, meta: ManagedMeta): void {
+export function writeManagedMeta(mode: ManagedProcessKind, meta: ManagedMeta): void {
   const metaFile = getMetaFilePathForMode(mode);
   writeFileSync(metaFile, JSON.stringify(meta, null, 2), { encoding: "utf8" });
 }
 
-export function cleanupManagedMeta(mode: GenerationMode): void {
+export function cleanupManagedMeta(mode: ManagedProcessKind): void {
   const metaFile = getMetaFilePathForMode(mode);
   try {
     if (existsSync(metaFile)) unlinkSync(metaFile);
@@ -46,7 +55,7 @@ export function cleanupManagedMeta(mode: GenerationMode): void {
   }
 }
 
-export function isManagedProcessRunning(mode: GenerationMode): boolean {
+export function isManagedProcessRunning(mode: ManagedProcessKind): boolean {
   const meta = readManagedMeta(mode);
   const pid = meta?.pid;
   if (!pid || pid <= 0) return false;
@@ -60,7 +69,7 @@ export function isManagedProcessRunning(mode: GenerationMode): boolean {
 }
 
 export async function stopManagedProcess(
-  mode: GenerationMode,
+  mode: ManagedProcessKind,
   opts?: { onMessage?: (line: string) => void },
 ): Promise<void> {
   const onMessage = opts?.onMessage ?? (() => {});
@@ -102,7 +111,7 @@ export async function stopManagedProcess(
 export async function stopAllManagedProcesses(opts?: {
   onMessage?: (line: string) => void;
 }): Promise<void> {
-  const modes: GenerationMode[] = ["notebook", "dashboard"];
+  const modes: ManagedProcessKind[] = ["notebook", "dashboard", "marketdata"];
   for (const mode of modes) {
     try {
       await stopManagedProcess(mode, opts);
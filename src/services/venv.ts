@@ -15,6 +15,7 @@ const DEFAULT_PACKAGES: string[] = [
   "streamlit",
   "watchdog",
   "feedparser",
+  "pyarrow",
 ];
 
 export function getDefaultPackages(): string[] {
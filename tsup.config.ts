@@ -30,4 +30,6 @@ export default defineConfig({
   outDir: "dist",
   clean: true,
   splitting: false,
+  // Python modules the CLI materializes at runtime (see services/marketData.ts)
+  loader: { ".py": "text" },
 });
@@ -1,6 +1,16 @@
 import { defineConfig } from "vitest/config";
 
 export default defineConfig({
+  plugins: [
+    {
+      // Mirrors the ".py": "text" loader in tsup.config.ts
+      name: "python-as-text",
+      transform(code, id) {
+        if (id.endsWith(".py")) return { code: `export default ${JSON.stringify(code)};`, map: null };
+        return null;
+      },
+    },
+  ],
   test: {
     environment: "jsdom",
     setupFiles: ["./src/test/setup.ts"],